@@ -0,0 +1,37 @@
+"""add_project_status_priority
+
+Revision ID: 5b0d9e3f61a8
+Revises: c4e1f7a92b3d
+Create Date: 2026-10-19 14:03:52.207716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0d9e3f61a8'
+down_revision: Union[str, None] = 'c4e1f7a92b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('status_priority', sa.SmallInteger(), server_default='2', nullable=False))
+    # Backfill from status; must match app.models.enums.STATUS_PRIORITY
+    op.execute(
+        "UPDATE projects SET status_priority = CASE status "
+        "WHEN 'IN_PROGRESS' THEN 4 "
+        "WHEN 'UNDER_REVIEW' THEN 3 "
+        "WHEN 'DRAFT' THEN 2 "
+        "WHEN 'COMPLETED' THEN 1 "
+        "ELSE 2 END"
+    )
+    op.create_index('ix_projects_listing', 'projects', ['status_priority', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_listing', table_name='projects')
+    op.drop_column('projects', 'status_priority')
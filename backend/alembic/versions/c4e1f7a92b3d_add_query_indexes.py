@@ -0,0 +1,40 @@
+"""add_query_indexes
+
+Revision ID: c4e1f7a92b3d
+Revises: ad263bfd7101
+Create Date: 2026-10-19 10:12:31.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1f7a92b3d'
+down_revision: Union[str, None] = 'ad263bfd7101'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexes flagged by scripts/query_plan_audit.py
+INDEXES = [
+    ('ix_files_project_id', 'files', ['project_id']),
+    ('ix_files_uploaded_by', 'files', ['uploaded_by']),
+    ('ix_project_members_user_id', 'project_members', ['user_id']),
+    ('ix_projects_created_by', 'projects', ['created_by']),
+    ('ix_projects_status_created_at', 'projects', ['status', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    # Build concurrently on Postgres so existing tables stay writable
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
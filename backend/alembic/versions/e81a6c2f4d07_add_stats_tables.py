@@ -0,0 +1,78 @@
+"""add_stats_tables
+
+Revision ID: e81a6c2f4d07
+Revises: 5b0d9e3f61a8
+Create Date: 2026-10-19 16:21:08.413520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81a6c2f4d07'
+down_revision: Union[str, None] = '5b0d9e3f61a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stat_counters',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('project_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('file_count', sa.Integer(), nullable=False),
+    sa.Column('storage_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('member_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    op.create_index(op.f('ix_project_stats_storage_bytes'), 'project_stats', ['storage_bytes'], unique=False)
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('project_count', sa.Integer(), nullable=False),
+    sa.Column('file_count', sa.Integer(), nullable=False),
+    sa.Column('storage_bytes', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill; counter names must match app.services.stats_service
+    op.execute(
+        "INSERT INTO stat_counters (name, value) "
+        "SELECT 'projects.' || LOWER(CAST(status AS VARCHAR)), COUNT(*) FROM projects GROUP BY status"
+    )
+    op.execute(
+        "INSERT INTO stat_counters (name, value) "
+        "SELECT 'files.count', COUNT(*) FROM files "
+        "UNION ALL SELECT 'files.bytes', COALESCE(SUM(size), 0) FROM files "
+        "UNION ALL SELECT 'members.count', COUNT(*) FROM project_members"
+    )
+    op.execute(
+        "INSERT INTO project_stats (project_id, file_count, storage_bytes, member_count) "
+        "SELECT p.id, "
+        "(SELECT COUNT(*) FROM files f WHERE f.project_id = p.id), "
+        "(SELECT COALESCE(SUM(f.size), 0) FROM files f WHERE f.project_id = p.id), "
+        "(SELECT COUNT(*) FROM project_members m WHERE m.project_id = p.id) "
+        "FROM projects p"
+    )
+    op.execute(
+        "INSERT INTO user_stats (user_id, project_count, file_count, storage_bytes) "
+        "SELECT u.id, "
+        "(SELECT COUNT(*) FROM project_members m WHERE m.user_id = u.id), "
+        "(SELECT COUNT(*) FROM files f WHERE f.uploaded_by = u.id), "
+        "(SELECT COALESCE(SUM(f.size), 0) FROM files f WHERE f.uploaded_by = u.id) "
+        "FROM users u"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
+    op.drop_index(op.f('ix_project_stats_storage_bytes'), table_name='project_stats')
+    op.drop_table('project_stats')
+    op.drop_table('stat_counters')
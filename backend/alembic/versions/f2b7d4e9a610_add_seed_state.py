@@ -0,0 +1,31 @@
+"""add_seed_state
+
+Revision ID: f2b7d4e9a610
+Revises: e81a6c2f4d07
+Create Date: 2026-10-19 18:02:44.901356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d4e9a610'
+down_revision: Union[str, None] = 'e81a6c2f4d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('seed_state',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('applied_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seed_state')
@@ -1,22 +1,22 @@
 from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
+from app.core.db_routing import bind_user
 from app.core.security import decode_token
-from app.core.permissions import is_admin, can_access_project, can_write_files
+from app.core.permissions import is_admin, ProjectAccessResolver, AsyncProjectAccessResolver
+from app.core.rate_limit import RateLimitExceeded, client_ip, get_rate_limiter
 from app.models import User, Project
 from app.services.user_service import UserService
+from app.services.aio import AsyncUserService
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[Session, Depends(get_db)]
-) -> User:
-    """Get current authenticated user from JWT token"""
-    token = credentials.credentials
+def _token_user_id(token: str) -> int:
+    """Validate a bearer token and return its user id"""
     payload = decode_token(token)
 
     if payload is None:
@@ -35,7 +35,7 @@ def get_current_user(
         )
 
     try:
-        user_id = int(user_id_str)
+        return int(user_id_str)
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,9 +43,8 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_service = UserService(db)
-    user = user_service.get_by_id(user_id)
 
+def _require_active(user: User | None) -> User:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,6 +61,20 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[Session, Depends(get_db)]
+) -> User:
+    """
+    Get current authenticated user from JWT token.
+    The user comes from the principal cache and is detached from `db`.
+    """
+    user_id = _token_user_id(credentials.credentials)
+    bind_user(db.info, user_id)
+    user_service = UserService(db)
+    return _require_active(user_service.get_principal(user_id))
+
+
 # Type aliases for dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
 DbSession = Annotated[Session, Depends(get_db)]
@@ -80,52 +93,151 @@ def require_admin(current_user: CurrentUser) -> User:
 AdminUser = Annotated[User, Depends(require_admin)]
 
 
+def get_access_resolver(current_user: CurrentUser, db: DbSession) -> ProjectAccessResolver:
+    """Per-request project access resolver; FastAPI caches it for the request"""
+    return ProjectAccessResolver(current_user, db)
+
+
+AccessResolver = Annotated[ProjectAccessResolver, Depends(get_access_resolver)]
+
+
 def get_project_with_access(
     project_id: int,
-    current_user: CurrentUser,
-    db: DbSession
+    resolver: AccessResolver
 ) -> Project:
     """Get project and verify user has access"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    access = resolver.resolve(project_id)
 
-    if not project:
+    if not access.project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
 
-    if not can_access_project(current_user, project_id, db):
+    if not access.can_read:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied for this project"
         )
 
-    return project
+    return access.project
 
 
 def get_project_with_write_access(
     project_id: int,
-    current_user: CurrentUser,
-    db: DbSession
+    resolver: AccessResolver
 ) -> Project:
     """Get project and verify user has write access"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    access = resolver.resolve(project_id)
 
-    if not project:
+    if not access.project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
 
-    if not can_write_files(current_user, project_id, db):
+    if not access.can_write:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Write access denied for this project"
         )
 
-    return project
+    return access.project
 
 
 # Project access dependencies
 ProjectWithAccess = Annotated[Project, Depends(get_project_with_access)]
-ProjectWithWriteAccess = Annotated[Project, Depends(get_project_with_write_access)]
\ No newline at end of file
+ProjectWithWriteAccess = Annotated[Project, Depends(get_project_with_write_access)]
+
+
+# Async stack dependencies: these never touch the threadpool
+
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
+
+
+async def get_current_user_async(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: AsyncDbSession
+) -> User:
+    """get_current_user for async routes"""
+    user_id = _token_user_id(credentials.credentials)
+    bind_user(db.info, user_id)
+    user_service = AsyncUserService(db)
+    return _require_active(await user_service.get_principal(user_id))
+
+
+AsyncCurrentUser = Annotated[User, Depends(get_current_user_async)]
+
+
+async def get_project_with_access_async(
+    project_id: int,
+    current_user: AsyncCurrentUser,
+    db: AsyncDbSession
+) -> Project:
+    """get_project_with_access for async routes"""
+    access = await AsyncProjectAccessResolver(current_user, db).resolve(project_id)
+
+    if not access.project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    if not access.can_read:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied for this project"
+        )
+
+    return access.project
+
+
+async def get_project_with_write_access_async(
+    project_id: int,
+    current_user: AsyncCurrentUser,
+    db: AsyncDbSession
+) -> Project:
+    """get_project_with_write_access for async routes"""
+    access = await AsyncProjectAccessResolver(current_user, db).resolve(project_id)
+
+    if not access.project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    if not access.can_write:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Write access denied for this project"
+        )
+
+    return access.project
+
+
+AsyncProjectWithAccess = Annotated[Project, Depends(get_project_with_access_async)]
+AsyncProjectWithWriteAccess = Annotated[Project, Depends(get_project_with_write_access_async)]
+
+
+def _enforce_rate_limit(endpoint_class: str, request: Request, user_id: int | None = None):
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return
+    try:
+        limiter.check(endpoint_class, client_ip(request.client, request.headers), user_id)
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": e.retry_after_header},
+        )
+
+
+def rate_limit_auth(request: Request):
+    """Rate limit login and registration per client IP and globally"""
+    _enforce_rate_limit("auth", request)
+
+
+def rate_limit_chat(request: Request, current_user: CurrentUser):
+    """Rate limit LLM requests per client IP, per user and globally"""
+    _enforce_rate_limit("chat", request, current_user.id)
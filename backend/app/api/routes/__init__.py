@@ -1,10 +1,15 @@
-from fastapi import APIRouter
-from app.api.routes import auth, users, projects, files, chat
+from app.api.routes import auth, users, projects, files, chat, diagnostics, aio
 
-api_router = APIRouter(prefix="/api")
+API_PREFIX = "/api"
 
-api_router.include_router(auth.router)
-api_router.include_router(users.router)
-api_router.include_router(projects.router)
-api_router.include_router(files.router)
-api_router.include_router(chat.router)
+# Included into the app one by one: include_router rebuilds every route it
+# copies, so nesting these under an /api router first would build each twice
+api_routers = [
+    auth.router,
+    users.router,
+    projects.router,
+    files.router,
+    chat.router,
+    diagnostics.router,
+    aio.router,
+]
@@ -0,0 +1,156 @@
+"""
+Async variants of the read-heavy project and file endpoints.
+
+These routes mirror their counterparts under /api/projects but run on the
+async engine, so they are served on the event loop instead of Starlette's
+threadpool. Responses are identical; clients can switch by prefix.
+"""
+from fastapi import APIRouter, HTTPException, Response, status
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncDbSession,
+    AsyncProjectWithAccess,
+    AsyncProjectWithWriteAccess
+)
+from app.api.routes.files import _file_to_response
+from app.models import Project
+from app.schemas.project import ProjectResponse, ProjectDetailResponse, ProjectMemberResponse
+from app.schemas.file import FileResponse, FileListResponse, FileContentResponse, FileCreateRequest
+from app.services.aio import AsyncProjectService, AsyncFileService
+from app.services.project_service import encode_cursor
+
+router = APIRouter(prefix="/aio", tags=["Async"])
+
+
+def _project_fields(project: Project) -> dict:
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "status": project.status,
+        "word_count": project.word_count,
+        "created_by": project.created_by,
+        "creator_name": project.creator.full_name if project.creator else "Unknown",
+        "base_folder_path": project.base_folder_path,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at
+    }
+
+
+@router.get("/projects", response_model=list[ProjectResponse])
+async def list_projects(
+    response: Response,
+    current_user: AsyncCurrentUser,
+    db: AsyncDbSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None
+):
+    """List projects (async variant of GET /projects)"""
+    project_service = AsyncProjectService(db)
+    try:
+        projects = await project_service.get_user_projects(current_user, skip, limit, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    if projects and len(projects) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(projects[-1])
+    return [ProjectResponse(**_project_fields(p)) for p in projects]
+
+
+@router.get("/projects/{project_id}", response_model=ProjectDetailResponse)
+async def get_project(project: AsyncProjectWithAccess, db: AsyncDbSession):
+    """Get project details with team members (async variant)"""
+    project_service = AsyncProjectService(db)
+    members = await project_service.get_project_members(project.id)
+    file_count = await project_service.get_file_count(project.id)
+
+    return ProjectDetailResponse(
+        **_project_fields(project),
+        members=[ProjectMemberResponse(**m) for m in members],
+        file_count=file_count
+    )
+
+
+@router.get("/projects/{project_id}/files", response_model=FileListResponse)
+async def list_project_files(project: AsyncProjectWithAccess, db: AsyncDbSession):
+    """List all files in a project (async variant)"""
+    file_service = AsyncFileService(db)
+    files = await file_service.get_project_files(project.id)
+
+    return FileListResponse(
+        files=[_file_to_response(f) for f in files],
+        total=len(files)
+    )
+
+
+@router.post(
+    "/projects/{project_id}/files/create",
+    response_model=FileResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_file(
+    request: FileCreateRequest,
+    project: AsyncProjectWithWriteAccess,
+    current_user: AsyncCurrentUser,
+    db: AsyncDbSession
+):
+    """Create a new markdown file (async variant)"""
+    file_service = AsyncFileService(db)
+    file = await file_service.create_file(
+        project_id=project.id,
+        filename=request.filename,
+        content=request.content,
+        created_by=current_user.id
+    )
+
+    return _file_to_response(file)
+
+
+@router.get("/projects/{project_id}/files/{file_id}", response_model=FileResponse)
+async def get_file_info(project: AsyncProjectWithAccess, file_id: int, db: AsyncDbSession):
+    """Get file metadata (async variant)"""
+    file_service = AsyncFileService(db)
+    file_record = await file_service.get_by_id(file_id)
+
+    if not file_record or file_record.project_id != project.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+
+    return _file_to_response(file_record)
+
+
+@router.get("/projects/{project_id}/files/{file_id}/content", response_model=FileContentResponse)
+async def get_file_content(project: AsyncProjectWithAccess, file_id: int, db: AsyncDbSession):
+    """Get file content as text (async variant)"""
+    file_service = AsyncFileService(db)
+
+    try:
+        content, file_record = await file_service.get_file_content_as_text(file_id)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is not a text file"
+        )
+
+    if file_record.project_id != project.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+
+    return FileContentResponse(
+        filename=file_record.filename,
+        content=content,
+        content_type=file_record.content_type
+    )
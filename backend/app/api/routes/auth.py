@@ -1,12 +1,14 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.database import get_db
 from app.schemas import Token, LoginRequest, RegisterRequest, UserResponse
 from app.services.user_service import UserService
 from app.core.security import create_access_token
+from app.core.hashing import HashingOverloaded, get_password_hasher
 from app.config import get_settings
-from app.api.deps import CurrentUser
+from app.api.deps import CurrentUser, rate_limit_auth
 from app.models import RoleName
 from app.schemas.user import UserCreate
 
@@ -14,11 +16,23 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 settings = get_settings()
 
 
-@router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+def _hashing_overloaded() -> HTTPException:
+    """503 response used when the password hashing queue is full"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit_auth)])
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """Authenticate user and return JWT token"""
     user_service = UserService(db)
-    user = user_service.authenticate(login_data.email, login_data.password)
+    try:
+        user = await user_service.authenticate_async(login_data.email, login_data.password)
+    except HashingOverloaded:
+        raise _hashing_overloaded()
 
     if not user:
         raise HTTPException(
@@ -42,13 +56,18 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     return Token(access_token=access_token)
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(register_data: RegisterRequest, db: Session = Depends(get_db)):
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit_auth)]
+)
+async def register(register_data: RegisterRequest, db: Session = Depends(get_db)):
     """Register a new user (default role: writer)"""
     user_service = UserService(db)
 
     # Check if email already exists
-    existing = user_service.get_by_email(register_data.email)
+    existing = await run_in_threadpool(user_service.get_by_email, register_data.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -63,7 +82,15 @@ def register(register_data: RegisterRequest, db: Session = Depends(get_db)):
         role_name=RoleName.WRITER
     )
 
-    user = user_service.create(user_create)
+    # Return the pooled connection while bcrypt runs
+    await run_in_threadpool(db.rollback)
+
+    try:
+        hashed_password = await get_password_hasher().hash(register_data.password)
+    except HashingOverloaded:
+        raise _hashing_overloaded()
+
+    user = await run_in_threadpool(user_service.create, user_create, hashed_password)
     return user
 
 
@@ -1,15 +1,25 @@
+import asyncio
 import json
+import time
+from contextlib import suppress
 from datetime import datetime
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.llm import get_llm
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from app.database import SessionLocal
+from app.models import User
+from app.config import get_settings
+from app.services.llm import BaseLLM, get_llm
 from app.services.file_service import FileService
+from app.services.user_service import UserService
 from app.schemas.chat import ChatRequest, ChatResponse, ModelInfo
-from app.api.deps import CurrentUser, DbSession
+from app.api.deps import CurrentUser, DbSession, AccessResolver, rate_limit_chat
 from app.core.security import decode_token
-from app.services.user_service import UserService
-from app.core.permissions import can_access_project
+from app.core.permissions import ProjectAccessResolver
+from app.core.rate_limit import RateLimitExceeded, client_ip, get_rate_limiter
+from app.core.profiling import PROFILE_QUERY, run_profiled, token_requester, traced
+from app.core.metrics import (
+    LLM_ACTIVE_STREAMS, LLM_FIRST_TOKEN_SECONDS, LLM_RESPONSE_SECONDS, LLM_TOKENS, LLM_TOKENS_PER_SECOND
+)
 
 router = APIRouter(prefix="/chat", tags=["AI Chat"])
 
@@ -22,10 +32,11 @@ def get_model_info(current_user: CurrentUser):
     return ModelInfo(**info)
 
 
-@router.post("", response_model=ChatResponse)
+@router.post("", response_model=ChatResponse, dependencies=[Depends(rate_limit_chat)])
 async def chat(
     request: ChatRequest,
     current_user: CurrentUser,
+    resolver: AccessResolver,
     db: DbSession
 ):
     """
@@ -38,7 +49,7 @@ async def chat(
     context = ""
     if request.file_id and request.project_id:
         # Verify project access
-        if not can_access_project(current_user, request.project_id, db):
+        if not resolver.can_access(request.project_id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied to project"
@@ -47,11 +58,14 @@ async def chat(
         file_service = FileService(db)
         try:
             content, file_record = file_service.get_file_content_as_text(request.file_id)
-            context = f"File: {file_record.filename}\n\n{content}"
+            # Only use files that belong to the checked project
+            if file_record.project_id == request.project_id:
+                context = f"File: {file_record.filename}\n\n{content}"
         except (FileNotFoundError, UnicodeDecodeError):
             pass
 
-    response = await llm.generate(request.message, context)
+    with LLM_RESPONSE_SECONDS.labels("generate").time():
+        response = await llm.generate(request.message, context)
 
     return ChatResponse(
         message=response,
@@ -62,17 +76,29 @@ async def chat(
 @router.websocket("/ws")
 async def chat_websocket(
     websocket: WebSocket,
-    token: str,
-    db: Session = Depends(get_db)
+    token: str
 ):
     """
     WebSocket endpoint for streaming chat responses.
 
-    Client sends: {"message": "...", "project_id": 1, "file_id": 1}
+    The socket does not hold a database session. The user is resolved once
+    at connect, and each message opens its own short-lived session for the
+    permission check and file lookup, so idle sockets never pin a pooled
+    connection.
+
+    Responses are streamed from a background task while the socket keeps
+    reading, so a cancel frame or a new message interrupts the running
+    generation and closes the upstream stream.
+
+    Client sends:
+        {"message": "...", "project_id": 1, "file_id": 1}
+        {"type": "cancel"}
     Server sends:
         {"type": "start", "model": "..."}
         {"type": "token", "content": "..."}
         {"type": "end", "full_response": "..."}
+        {"type": "cancelled"}
+        {"type": "error", "code": "timeout", "message": "...", "partial_response": "..."}
     """
     # Validate token
     payload = decode_token(token)
@@ -85,14 +111,22 @@ async def chat_websocket(
         await websocket.close(code=4001, reason="Invalid token payload")
         return
 
-    user_service = UserService(db)
-    user = user_service.get_by_id(user_id)
+    user = await run_in_threadpool(_load_websocket_user, user_id)
     if not user or not user.is_active:
         await websocket.close(code=4001, reason="User not found or inactive")
         return
 
     await websocket.accept()
     llm = get_llm()
+    limiter = get_rate_limiter()
+    ip = client_ip(websocket.client, websocket.headers)
+    generation: asyncio.Task | None = None
+
+    # A profiling token on the URL profiles every message of the socket,
+    # when profiling is enabled as for the HTTP middleware
+    profile_token = websocket.query_params.get(PROFILE_QUERY)
+    if not get_settings().profiling_enabled:
+        profile_token = None
 
     try:
         while True:
@@ -100,43 +134,129 @@ async def chat_websocket(
             data = await websocket.receive_text()
             message_data = json.loads(data)
 
-            prompt = message_data.get("message", "")
-            project_id = message_data.get("project_id")
-            file_id = message_data.get("file_id")
-
-            # Get file context if provided
-            context = ""
-            if file_id and project_id:
-                if can_access_project(user, project_id, db):
-                    file_service = FileService(db)
-                    try:
-                        content, file_record = file_service.get_file_content_as_text(file_id)
-                        context = f"File: {file_record.filename}\n\n{content}"
-                    except (FileNotFoundError, UnicodeDecodeError):
-                        pass
-
-            # Send start message
-            await websocket.send_json({
-                "type": "start",
-                "model": llm.get_model_info()["model"],
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            # A cancel frame or a new message interrupts the running generation
+            if generation is not None and not generation.done():
+                await _cancel_generation(generation)
+                await websocket.send_json({
+                    "type": "cancelled",
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+            generation = None
+
+            if message_data.get("type") == "cancel":
+                continue
+
+            if limiter is not None:
+                try:
+                    # The redis backend makes a blocking round trip
+                    await run_in_threadpool(limiter.check, "chat", ip, user.id)
+                except RateLimitExceeded as e:
+                    await websocket.send_json({
+                        "type": "error",
+                        "code": "rate_limited",
+                        "message": "Too many messages, please slow down",
+                        "retry_after": round(e.retry_after, 1)
+                    })
+                    continue
 
-            # Stream response
-            full_response = ""
-            async for token in llm.stream(prompt, context):
-                full_response += token
+            response = _stream_response(websocket, llm, user, message_data)
+            # Checked per message: the token expires, and its admin may be demoted or deactivated
+            profiled_by = await run_in_threadpool(token_requester, profile_token) if profile_token else None
+            if profiled_by is not None:
+                response = run_profiled("WS /api/chat/ws message", profiled_by, response)
+            generation = asyncio.create_task(response)
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        await websocket.send_json({
+            "type": "error",
+            "message": str(e)
+        })
+        await websocket.close()
+    finally:
+        if generation is not None and not generation.done():
+            await _cancel_generation(generation)
+
+
+async def _stream_response(websocket: WebSocket, llm: BaseLLM, user: User, message_data: dict):
+    """
+    Stream one response to the socket.
+
+    The first token must arrive within `chat_first_token_timeout` seconds,
+    each following token within `chat_idle_token_timeout` seconds, and the
+    whole response within `chat_max_stream_seconds`. A stalled stream is
+    closed and reported as a timeout error with the partial response.
+    """
+    settings = get_settings()
+    prompt = message_data.get("message", "")
+    project_id = message_data.get("project_id")
+    file_id = message_data.get("file_id")
+
+    try:
+        # Get file context if provided
+        context = ""
+        if file_id and project_id:
+            context = await run_in_threadpool(_load_file_context, user, project_id, file_id)
+
+        # Send start message
+        await websocket.send_json({
+            "type": "start",
+            "model": llm.get_model_info()["model"],
+            "timestamp": datetime.utcnow().isoformat()
+        })
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.chat_max_stream_seconds
+        token_timeout = settings.chat_first_token_timeout
+        chunks = []
+
+        # Closing the generator in `finally` aborts the provider request,
+        # whether the stream ends, stalls or this task is cancelled
+        stream = llm.stream(prompt, context)
+        started = time.perf_counter()
+        first_token_at = None
+        LLM_ACTIVE_STREAMS.inc()
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout_at(min(loop.time() + token_timeout, deadline)):
+                        token = await anext(stream)
+                except StopAsyncIteration:
+                    break
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    LLM_FIRST_TOKEN_SECONDS.observe(first_token_at - started)
+                chunks.append(token)
                 await websocket.send_json({
                     "type": "token",
                     "content": token
                 })
-
-            # Send end message
+                token_timeout = settings.chat_idle_token_timeout
+        except TimeoutError:
             await websocket.send_json({
-                "type": "end",
-                "full_response": full_response,
-                "timestamp": datetime.utcnow().isoformat()
+                "type": "error",
+                "code": "timeout",
+                "message": "The response stream stalled and was stopped",
+                "partial_response": "".join(chunks)
             })
+            return
+        finally:
+            LLM_ACTIVE_STREAMS.dec()
+            LLM_TOKENS.inc(len(chunks))
+            await stream.aclose()
+
+        finished = time.perf_counter()
+        LLM_RESPONSE_SECONDS.labels("stream").observe(finished - started)
+        if len(chunks) > 1 and finished > first_token_at:
+            LLM_TOKENS_PER_SECOND.observe((len(chunks) - 1) / (finished - first_token_at))
+
+        # Send end message
+        await websocket.send_json({
+            "type": "end",
+            "full_response": "".join(chunks),
+            "timestamp": datetime.utcnow().isoformat()
+        })
 
     except WebSocketDisconnect:
         pass
@@ -145,4 +265,42 @@ async def chat_websocket(
             "type": "error",
             "message": str(e)
         })
-        await websocket.close()
+
+
+async def _cancel_generation(generation: asyncio.Task):
+    """Cancel a streaming task and wait until its upstream stream is closed"""
+    generation.cancel()
+    with suppress(asyncio.CancelledError):
+        await generation
+
+
+def _load_websocket_user(user_id: str) -> User | None:
+    """
+    Load the socket's user with its role in a short-lived session.
+    The returned instance is detached, so permission checks on it
+    never lazy-load through a closed session.
+    """
+    try:
+        user_id = int(user_id)
+    except (ValueError, TypeError):
+        return None
+
+    with SessionLocal() as db:
+        return UserService(db).get_principal(user_id)
+
+
+@traced
+def _load_file_context(user: User, project_id: int, file_id: int) -> str:
+    """Build file context for a chat message, using a short-lived session"""
+    with SessionLocal() as db:
+        if not ProjectAccessResolver(user, db).can_access(project_id):
+            return ""
+
+        file_service = FileService(db)
+        try:
+            content, file_record = file_service.get_file_content_as_text(file_id)
+        except (FileNotFoundError, UnicodeDecodeError):
+            return ""
+        if file_record.project_id != project_id:
+            return ""
+        return f"File: {file_record.filename}\n\n{content}"
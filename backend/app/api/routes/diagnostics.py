@@ -0,0 +1,106 @@
+import os
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
+from app.api.deps import AdminUser, DbSession
+from app.config import get_settings
+from app.core import profiling
+from app.core.db_pool import pool_stats
+from app.core.security import token_cache
+from app.database import (
+    engine, reader_engine, replica_engines, writer_lock,
+    get_async_engine, get_async_reader_engine, get_async_replica_engines
+)
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/auth-cache")
+def get_auth_cache_stats(current_user: AdminUser):
+    """Get verified-JWT cache size and hit rate (Admin only)"""
+    return token_cache.stats()
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(current_user: AdminUser, db: DbSession):
+    """
+    Get connection pool occupancy, checkout waits and invalidations per
+    engine, with the connection budget across uvicorn workers and, in
+    embedded SQLite mode, writer lock waits (Admin only)
+    """
+    pools = {"sync": pool_stats(engine)}
+    for i, replica in enumerate(replica_engines):
+        pools[f"sync_replica_{i}"] = pool_stats(replica)
+    if reader_engine is not None:
+        pools["sync_reader"] = pool_stats(reader_engine)
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        pools["async"] = pool_stats(async_engine.sync_engine)
+    for i, replica in enumerate(get_async_replica_engines()):
+        pools[f"async_replica_{i}"] = pool_stats(replica.sync_engine)
+    async_reader = get_async_reader_engine()
+    if async_reader is not None:
+        pools["async_reader"] = pool_stats(async_reader.sync_engine)
+
+    per_worker = sum(p["pool_size"] + p["max_overflow"] for p in pools.values())
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    server_max_connections = None
+    if engine.dialect.name == "postgresql":
+        server_max_connections = int(db.execute(
+            text("SHOW max_connections").execution_options(use_primary=True)
+        ).scalar())
+
+    return {
+        "pools": pools,
+        "max_connections_per_worker": per_worker,
+        "workers": workers,
+        "max_connections_all_workers": per_worker * workers,
+        "server_max_connections": server_max_connections,
+        "sqlite_writer_lock": writer_lock.stats() if writer_lock is not None else None,
+    }
+
+
+@router.post("/profiles/token")
+def create_profile_token(
+    current_user: AdminUser,
+    ttl_seconds: int | None = Query(None, ge=1, le=86400)
+):
+    """
+    Issue a profiling token (Admin only). Requests sending it in the
+    X-Profile-Token header or the `profile` query parameter (also on the
+    chat WebSocket URL, profiling each message) are sampled and stored
+    while the issuing admin stays an active admin; HTTP responses name the
+    profile in X-Profile-Id.
+    """
+    settings = get_settings()
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profiling is disabled")
+    token, expires = profiling.issue_token(current_user.id, ttl_seconds or settings.profile_token_ttl_seconds)
+    return {"token": token, "expires_at": expires, "header": "X-Profile-Token", "query": profiling.PROFILE_QUERY}
+
+
+@router.get("/profiles")
+def list_profiles(current_user: AdminUser):
+    """List stored profiles, newest first (Admin only)"""
+    return profiling.get_profile_store().recent()
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    current_user: AdminUser,
+    format: Literal["tree", "collapsed", "raw"] = "tree"
+):
+    """
+    Get a stored profile (Admin only) as a call tree, as folded stacks for
+    flamegraph.pl or speedscope ("collapsed"), or as stored ("raw")
+    """
+    profile = profiling.get_profile_store().get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(profiling.collapsed(profile["stacks"]))
+    if format == "tree":
+        profile["tree"] = profiling.call_tree(profile.pop("stacks"))
+    return profile
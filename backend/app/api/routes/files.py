@@ -10,6 +10,7 @@ from app.api.deps import (
 from app.schemas.file import FileResponse, FileListResponse, FileContentResponse, FileCreateRequest
 from app.services.file_service import FileService
 from app.services.storage import get_storage
+from app.services.stats_service import StatsDelta
 from app.core.permissions import can_access_project, can_write_files
 from app.models import File
 
@@ -231,12 +232,15 @@ async def update_file(
     file_service.storage.save(content, file_record.storage_path)
 
     # Update file metadata
+    stats = StatsDelta()
+    stats.file_resized(file_record.project_id, file_record.uploaded_by, len(content) - file_record.size)
     file_record.version = version
     file_record.size = len(content)
     file_record.updated_at = datetime.utcnow()
 
+    stats.apply(db)
     db.commit()
-    db.refresh(file_record)
+    file_record = file_service.get_by_id(file_id)
 
     return _file_to_response(file_record)
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from app.api.deps import (
     CurrentUser,
     DbSession,
@@ -12,9 +12,12 @@ from app.schemas.project import (
     ProjectDetailResponse,
     ProjectMemberCreate,
     ProjectMemberResponse,
-    TeamAssignment
+    TeamAssignment,
+    BulkMembershipAssignment,
+    MembershipChangesResponse
 )
-from app.services.project_service import ProjectService
+from app.services.project_service import ProjectService, encode_cursor
+from app.services.stats_service import StatsService
 from app.core.permissions import is_admin
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
@@ -22,18 +25,33 @@ router = APIRouter(prefix="/projects", tags=["Projects"])
 
 @router.get("", response_model=list[ProjectResponse])
 def list_projects(
+    response: Response,
     current_user: CurrentUser,
     db: DbSession,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: str | None = None
 ):
     """
     List projects.
     - Admin: sees all projects
     - Writer/Statistician: sees only assigned projects
+
+    Full pages carry an X-Next-Cursor header; pass it back as `cursor` to
+    fetch the next page without OFFSET. `skip` still works but gets slower
+    on deep pages.
     """
     project_service = ProjectService(db)
-    projects = project_service.get_user_projects(current_user, skip, limit)
+    try:
+        projects = project_service.get_user_projects(current_user, skip, limit, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    if projects and len(projects) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(projects[-1])
 
     # Add creator_name to response
     result = []
@@ -62,6 +80,30 @@ def get_project_statistics(current_user: AdminUser, db: DbSession):
     return project_service.get_statistics()
 
 
+@router.get("/statistics/storage")
+def get_storage_statistics(current_user: AdminUser, db: DbSession, limit: int = 20):
+    """Projects using the most storage (Admin only)"""
+    return StatsService(db).get_storage_by_project(limit)
+
+
+@router.get("/statistics/members")
+def get_member_statistics(current_user: AdminUser, db: DbSession, skip: int = 0, limit: int = 100):
+    """Per-user membership and upload totals (Admin only)"""
+    return StatsService(db).get_member_totals(skip, limit)
+
+
+@router.post("/statistics/reconcile")
+def reconcile_statistics(current_user: AdminUser, db: DbSession):
+    """Recompute the statistics tables now and report corrected rows (Admin only)"""
+    drift = StatsService(db).reconcile()
+    if drift is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Reconciliation already running"
+        )
+    return drift
+
+
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 def create_project(
     project_data: ProjectCreate,
@@ -158,6 +200,28 @@ def delete_project(project_id: int, current_user: AdminUser, db: DbSession):
 
 # Team Management Endpoints
 
+@router.post("/memberships", response_model=MembershipChangesResponse)
+def assign_memberships(
+    assignment: BulkMembershipAssignment,
+    current_user: AdminUser,
+    db: DbSession
+):
+    """Add members to many projects in one call, updating existing roles (Admin only)"""
+    project_service = ProjectService(db)
+
+    missing = project_service.missing_references(
+        assignment.project_ids, [m.user_id for m in assignment.members]
+    )
+    if missing["projects"] or missing["users"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Not found: projects {missing['projects']}, users {missing['users']}"
+        )
+
+    changes = project_service.assign_members(assignment.project_ids, assignment.members)
+    return changes.summary()
+
+
 @router.post("/{project_id}/team", response_model=list[ProjectMemberResponse])
 def assign_team(
     project_id: int,
@@ -168,13 +232,18 @@ def assign_team(
     """Assign team members to a project (Admin only)"""
     project_service = ProjectService(db)
 
-    # Verify project exists
-    project = project_service.get_by_id(project_id)
-    if not project:
+    # Verify project and users exist
+    missing = project_service.missing_references([project_id], [m.user_id for m in team.members])
+    if missing["projects"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
+    if missing["users"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Users not found: {missing['users']}"
+        )
 
     project_service.assign_team(project_id, team.members)
     members = project_service.get_project_members(project_id)
@@ -192,26 +261,26 @@ def add_project_member(
     """Add a team member to a project (Admin only)"""
     project_service = ProjectService(db)
 
-    # Verify project exists
-    project = project_service.get_by_id(project_id)
-    if not project:
+    # Verify project and user exist
+    missing = project_service.missing_references([project_id], [member_data.user_id])
+    if missing["projects"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
+    if missing["users"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
 
     member = project_service.add_member(project_id, member_data)
-    members = project_service.get_project_members(project_id)
-
-    # Find the just-added member
-    for m in members:
-        if m["user_id"] == member_data.user_id:
-            return ProjectMemberResponse(**m)
-
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Failed to add member"
-    )
+    if member is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to add member"
+        )
+    return ProjectMemberResponse(**member)
 
 
 @router.delete("/{project_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -4,10 +4,130 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     database_url: str
+    # Async driver URL for the /api/aio routes; derived from database_url when unset
+    async_database_url: str | None = None
     secret_key: str
+
+    # Connection pool, per engine and per worker: each worker may open up to
+    # db_pool_size + db_max_overflow connections. db_pool_recycle is in
+    # seconds (-1 disables); db_statement_timeout_ms applies to Postgres, 0 disables.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_statement_timeout_ms: int = 0
+
+    # Comma-separated read replica URLs; GET requests read from one of them
+    database_replica_urls: str = ""
+    # Seconds a user's requests keep reading from the primary after they commit a write
+    replica_read_after_write_seconds: float = 5.0
+
+    # SQLite connection pragmas. A file database without replicas runs in
+    # embedded single-node mode (WAL, one writer at a time); run one worker.
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456
+    sqlite_cache_size_kb: int = 65536
+
     access_token_expire_minutes: int = 30
     storage_path: str = "./storage"
 
+    # Debug mode adds Server-Timing headers with per-request query count and DB time
+    debug: bool = False
+    # Log a possible N+1 when one statement runs this often in a request; 0 disables
+    query_repeat_warning: int = 10
+
+    # Prometheus /metrics endpoint and request metrics; per worker process.
+    # The event loop lag sampler fires every metrics_loop_lag_interval seconds; 0 disables.
+    metrics_enabled: bool = True
+    metrics_loop_lag_interval: float = 1.0
+
+    # On-demand profiling: requests carrying a token from POST /api/diagnostics/profiles/token
+    # are sampled every profile_interval_ms; the newest profile_max_stored are kept in profile_dir
+    profiling_enabled: bool = True
+    profile_interval_ms: float = 5.0
+    profile_dir: str = "./profiles"
+    profile_max_stored: int = 50
+    profile_token_ttl_seconds: int = 900
+
+    # Readiness probes (/health/ready), each failing past its budget. Results are cached
+    # per worker for health_cache_seconds, the LLM heartbeat for health_llm_cache_seconds.
+    # An LLM outage only marks the worker degraded unless health_llm_required is set.
+    health_cache_seconds: float = 5.0
+    health_db_budget_ms: int = 1000
+    health_storage_budget_ms: int = 1000
+    health_storage_min_free_mb: int = 1024
+    health_llm_budget_ms: int = 3000
+    health_llm_cache_seconds: float = 60.0
+    health_llm_required: bool = False
+
+    # Seconds between reconciliations of the dashboard statistics tables; 0 disables
+    stats_reconcile_interval: float = 3600.0
+
+    # Password hashing: bcrypt cost and a dedicated "thread" or "process" executor
+    bcrypt_rounds: int = 12
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+
+    # Verified-JWT LRU cache entries; 0 disables caching
+    jwt_cache_size: int = 4096
+
+    # Authenticated-user cache; 0 disables caching
+    principal_cache_ttl: float = 30.0
+    principal_cache_size: int = 10000
+
+    # Project membership index: seconds before a user's memberships are reloaded,
+    # bounding staleness when an invalidation is missed, and users kept; 0 disables caching
+    acl_cache_ttl: float = 60.0
+    acl_cache_size: int = 10000
+
+    # Cross-worker cache invalidation: "local" (single process) or "postgres" (LISTEN/NOTIFY)
+    invalidation_backend: str = "local"
+
+    # Rate limiting: token buckets given as "capacity/seconds"; an empty string disables a bucket.
+    # Backend is "memory" (per worker) or "redis" (shared, needs the redis package).
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    # Comma-separated proxy addresses or CIDR ranges whose X-Forwarded-For / X-Real-IP
+    # headers name the client; empty trusts none and limits by the peer address
+    rate_limit_trusted_proxies: str = ""
+    rate_limit_auth_ip: str = "20/60"
+    rate_limit_auth_global: str = "50/1"
+    rate_limit_chat_ip: str = "120/60"
+    rate_limit_chat_user: str = "30/60"
+    rate_limit_chat_global: str = "100/1"
+
+    # Chat streaming timeouts (seconds)
+    chat_first_token_timeout: float = 30.0
+    chat_idle_token_timeout: float = 15.0
+    chat_max_stream_seconds: float = 300.0
+
+    # LLM provider: "fake" or "claude"
+    llm_provider: str = "fake"
+    anthropic_api_key: str | None = None
+    llm_base_url: str = "https://api.anthropic.com"
+    llm_model: str = "claude-3-5-sonnet-latest"
+    llm_max_tokens: int = 1024
+    llm_connect_timeout: float = 5.0
+    llm_read_timeout: float = 60.0
+    llm_max_connections: int = 100
+    llm_max_retries: int = 3
+    llm_retry_base_delay: float = 0.5
+    llm_retry_max_delay: float = 8.0
+
+    # FakeLLM simulated timing: "random", "zero", "fixed", "rate" or "trace"
+    fake_llm_latency: str = "random"
+    fake_llm_seed: int | None = None
+    fake_llm_ttft: float = 0.0
+    fake_llm_token_delay: float = 0.05
+    fake_llm_tokens_per_second: float = 20.0
+    fake_llm_trace_path: str | None = None
+    # Synthetic response length in words; 0 uses the canned demo responses
+    fake_llm_response_tokens: int = 0
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,169 @@
+import threading
+import time
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.core.invalidation import get_invalidation_bus
+from app.models import ProjectMember
+from app.models.enums import ProjectRole
+
+INVALIDATION_TOPIC = "acl"
+
+
+class ProjectACL:
+    """
+    In-memory index of project memberships: user id -> {project id: role}.
+
+    A user's memberships are loaded from the database on first use and then
+    kept up to date incrementally by the membership write paths, so checks
+    on hot paths are dictionary lookups. Other workers learn about changes
+    through the invalidation bus and reload the affected users lazily.
+
+    Entries are reloaded `ttl` seconds after they were loaded. This backstops
+    invalidations that never arrive, e.g. with the "local" bus and several
+    workers; incremental updates do not extend the deadline. A ttl of 0
+    disables caching. At most `max_size` users are kept; the oldest load is
+    evicted first.
+
+    Each user's role map is replaced, never mutated, so readers need no lock.
+    A per-user version guards against a slow load overwriting a newer change.
+    Versions only matter to loads in flight, so when they outgrow `max_size`
+    they are dropped along with a new epoch, which discards those loads.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        # user id -> (expires at, {project id: role})
+        self._by_user: dict[int, tuple[float, dict[int, ProjectRole]]] = {}
+        self._versions: dict[int, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _cached(self, user_id: int) -> dict[int, ProjectRole] | None:
+        entry = self._by_user.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def roles(self, user_id: int, db: Session) -> dict[int, ProjectRole]:
+        """All project roles of a user, loading them on first use"""
+        roles = self._cached(user_id)
+        if roles is not None:
+            return roles
+
+        epoch, version = self._epoch, self._versions.get(user_id, 0)
+        rows = db.execute(self._roles_query(user_id)).all()
+        return self._store(user_id, epoch, version, rows)
+
+    async def roles_async(self, user_id: int, db: AsyncSession) -> dict[int, ProjectRole]:
+        """Async variant of roles() for AsyncSession callers"""
+        roles = self._cached(user_id)
+        if roles is not None:
+            return roles
+
+        epoch, version = self._epoch, self._versions.get(user_id, 0)
+        rows = (await db.execute(self._roles_query(user_id))).all()
+        return self._store(user_id, epoch, version, rows)
+
+    @staticmethod
+    def _roles_query(user_id: int):
+        # Read from the primary: a lagging replica would be cached until the next invalidation
+        return (
+            select(ProjectMember.project_id, ProjectMember.role)
+            .where(ProjectMember.user_id == user_id)
+            .execution_options(use_primary=True)
+        )
+
+    def _store(self, user_id: int, epoch: int, version: int, rows) -> dict[int, ProjectRole]:
+        roles = {project_id: role for project_id, role in rows}
+        if self.ttl <= 0 or self.max_size <= 0:
+            return roles
+        with self._lock:
+            if self._epoch == epoch and self._versions.get(user_id, 0) == version:
+                # Re-insert so a reloaded user moves to the back of the eviction order
+                self._by_user.pop(user_id, None)
+                if len(self._by_user) >= self.max_size:
+                    del self._by_user[next(iter(self._by_user))]
+                self._by_user[user_id] = (time.monotonic() + self.ttl, roles)
+        return roles
+
+    def role(self, user_id: int, project_id: int, db: Session) -> ProjectRole | None:
+        """A user's role in a project, or None if not a member"""
+        return self.roles(user_id, db).get(project_id)
+
+    def _bump(self, user_id: int):
+        """Advance a user's version; call with the lock held"""
+        if user_id not in self._versions and len(self._versions) >= self.max_size:
+            self._epoch += 1
+            self._versions.clear()
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def _apply(self, user_id: int, project_id: int, role: ProjectRole | None):
+        with self._lock:
+            self._bump(user_id)
+            current = self._by_user.get(user_id)
+            if current is None:
+                return
+            expires_at, roles = current
+            updated = dict(roles)
+            if role is None:
+                updated.pop(project_id, None)
+            else:
+                updated[project_id] = role
+            self._by_user[user_id] = (expires_at, updated)
+
+    def set_role(self, user_id: int, project_id: int, role: ProjectRole):
+        """Record a committed membership here and invalidate it in other workers"""
+        self._apply(user_id, project_id, role)
+        get_invalidation_bus().publish(INVALIDATION_TOPIC, str(user_id), local=False)
+
+    def remove(self, user_id: int, project_id: int):
+        """Record a committed membership removal here and invalidate it in other workers"""
+        self._apply(user_id, project_id, None)
+        get_invalidation_bus().publish(INVALIDATION_TOPIC, str(user_id), local=False)
+
+    def apply_changes(self, changes: list[tuple[int, int, ProjectRole | None]]):
+        """
+        Record committed (user id, project id, role or None) membership
+        changes here, invalidating each affected user once in other workers
+        """
+        for user_id, project_id, role in changes:
+            self._apply(user_id, project_id, role)
+        bus = get_invalidation_bus()
+        for user_id in dict.fromkeys(user_id for user_id, _, _ in changes):
+            bus.publish(INVALIDATION_TOPIC, str(user_id), local=False)
+
+    def invalidate(self, key: str | None):
+        """Forget one user (by id), or everyone when key is None"""
+        with self._lock:
+            if key is None:
+                self._epoch += 1
+                self._by_user.clear()
+                self._versions.clear()
+            else:
+                user_id = int(key)
+                self._bump(user_id)
+                self._by_user.pop(user_id, None)
+
+
+# ACL singleton
+_acl_instance: ProjectACL | None = None
+
+
+def get_project_acl() -> ProjectACL:
+    """Get the project ACL index, subscribing it to invalidations on first use"""
+    global _acl_instance
+
+    if _acl_instance is None:
+        settings = get_settings()
+        _acl_instance = ProjectACL(ttl=settings.acl_cache_ttl, max_size=settings.acl_cache_size)
+        get_invalidation_bus().subscribe(INVALIDATION_TOPIC, _acl_instance.invalidate)
+
+    return _acl_instance
+
+
+def invalidate_user_acl(user_id: int):
+    """Forget a user's memberships in this and every other worker"""
+    get_invalidation_bus().publish(INVALIDATION_TOPIC, str(user_id))
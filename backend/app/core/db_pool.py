@@ -0,0 +1,160 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import Settings
+
+
+class PoolMetrics:
+    """Counters for one connection pool, updated from pool events"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.checkout_timeouts = 0
+        self.in_use = 0
+        self.in_use_max = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self.checkouts += 1
+            self.checkout_wait_total += seconds
+            if seconds > self.checkout_wait_max:
+                self.checkout_wait_max = seconds
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def checked_out(self):
+        with self._lock:
+            self.in_use += 1
+            if self.in_use > self.in_use_max:
+                self.in_use_max = self.in_use
+
+    def checked_in(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            mean = self.checkout_wait_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "checkout_wait_mean_ms": round(mean * 1000, 3),
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+                "checkout_timeouts": self.checkout_timeouts,
+                "in_use": self.in_use,
+                "in_use_max": self.in_use_max,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+            }
+
+
+class _TimedCheckoutMixin:
+    """
+    Times every checkout: waiting for a free connection when the pool is
+    exhausted, opening new ones and the pre-ping all count as wait time.
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that records checkout wait times"""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times"""
+
+
+def engine_options(settings: Settings, url: str, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for the configured pool and statement timeout"""
+    backend = make_url(url).get_backend_name()
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+    if settings.db_statement_timeout_ms and backend == "postgresql":
+        timeout = str(settings.db_statement_timeout_ms)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+
+    return options
+
+
+def instrument_engine(engine: Engine):
+    """Attach event hooks feeding the pool's PoolMetrics"""
+    metrics = engine.pool.metrics
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checked_out()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checked_in()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("soft_invalidations")
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Current pool occupancy plus the accumulated PoolMetrics"""
+    pool = engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.stats())
+    return stats
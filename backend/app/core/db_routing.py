@@ -0,0 +1,154 @@
+import inspect
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Requests with these methods read from a replica
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+# Execution option that keeps a single statement on the primary
+USE_PRIMARY = "use_primary"
+
+
+class RoutingSession(Session):
+    """
+    Session that can send reads to a read replica.
+
+    Sessions use the primary unless `info["read_only"]` is set. Then
+    SELECTs go to one replica, picked once per session so a request reads
+    a single snapshot. Writes (flushes, INSERT/UPDATE/DELETE, SELECT ...
+    FOR UPDATE) always go to the primary and pin the rest of the session
+    there, so a request reads its own writes. Statements executed with
+    `execution_options(use_primary=True)` also skip the replica.
+
+    With `replica_lag=False` the "replicas" see every commit as soon as it
+    is made (embedded SQLite reads through a second engine on the same
+    file), so every session reads from them until it writes, and goes back
+    to them once the write is committed or rolled back.
+    """
+
+    def __init__(self, *args, replicas=(), replica_lag=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+        self.replica_lag = replica_lag
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        info = self.info
+        if self._flushing or (clause is not None and _is_write(clause)):
+            info["wrote"] = True
+        elif self.replicas and not info.get("wrote") and (
+            not self.replica_lag
+            or (info.get("read_only") and not info.get("pin_primary") and not _wants_primary(clause))
+        ):
+            replica = info.get("replica")
+            if replica is None:
+                replica = info["replica"] = random.choice(self.replicas)
+            return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def _is_write(clause) -> bool:
+    return clause.is_dml or getattr(clause, "_for_update_arg", None) is not None
+
+
+def _wants_primary(clause) -> bool:
+    options = getattr(clause, "get_execution_options", None)
+    return options is not None and options().get(USE_PRIMARY, False)
+
+
+class RecentWriters:
+    """
+    Users who committed a write in the last `window` seconds. Their
+    following requests read from the primary, so a client that writes and
+    then reads sees its write despite replica lag. Tracked per process.
+    """
+
+    def __init__(self, window: float, max_entries: int = 10000):
+        self.window = window
+        self.max_entries = max_entries
+        self._until: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= self.max_entries:
+                self._until = {k: v for k, v in self._until.items() if v > now}
+            self._until[user_id] = now + self.window
+
+    def is_recent(self, user_id: int) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+_recent_writers: RecentWriters | None = None
+
+
+def get_recent_writers() -> RecentWriters:
+    """Get the process-wide recent writers registry"""
+    global _recent_writers
+
+    if _recent_writers is None:
+        from app.config import get_settings
+
+        _recent_writers = RecentWriters(get_settings().replica_read_after_write_seconds)
+
+    return _recent_writers
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session):
+    user_id = session.info.get("user_id")
+    if user_id is not None and session.info.get("wrote"):
+        get_recent_writers().mark(user_id)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _end_write(session, *args):
+    # Without lag there is nothing to read-your-writes around
+    if not session.replica_lag:
+        session.info.pop("wrote", None)
+
+
+def bind_user(info: dict, user_id: int):
+    """
+    Attribute the session to `user_id`: its commits mark the user as a
+    recent writer, and a recent writer's session stays on the primary.
+    Takes `session.info` so it works for sync and async sessions alike.
+    """
+    info["user_id"] = user_id
+    if get_recent_writers().is_recent(user_id):
+        info["pin_primary"] = True
+
+
+def replica_reads(method):
+    """
+    Mark a service method as safe to serve from a replica, whatever the
+    request method. Reads still go to the primary once the session wrote.
+    """
+    @contextmanager
+    def read_only(db):
+        previous = db.info.get("read_only", False)
+        db.info["read_only"] = True
+        try:
+            yield
+        finally:
+            db.info["read_only"] = previous
+
+    if inspect.iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            with read_only(self.db):
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with read_only(self.db):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from app.config import get_settings
+from app.core.security import get_password_hash, verify_password, verify_and_update_password
+
+
+class HashingOverloaded(Exception):
+    """Raised when too many password hashes are already queued"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded executor.
+
+    Hashing no longer competes with sync endpoints for the shared Starlette
+    threadpool, and once `max_pending` operations are queued or running new
+    ones are rejected with HashingOverloaded instead of piling up.
+    """
+
+    def __init__(self, executor: Executor, max_pending: int):
+        self.executor = executor
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "PasswordHasher":
+        settings = get_settings()
+        if settings.password_hash_executor == "process":
+            executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                thread_name_prefix="password-hash"
+            )
+        return cls(executor, settings.password_hash_max_pending)
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingOverloaded("Password hashing queue is full")
+            self._pending += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await future
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Verify a password; also return a new hash if the stored one uses outdated parameters"""
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Hasher singleton
+_hasher_instance: PasswordHasher | None = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get the password hasher, creating its executor on first use"""
+    global _hasher_instance
+
+    if _hasher_instance is None:
+        _hasher_instance = PasswordHasher.from_settings()
+
+    return _hasher_instance
+
+
+def shutdown_password_hasher():
+    """Shut down the password hasher's executor, if one was created"""
+    global _hasher_instance
+
+    if _hasher_instance is not None:
+        _hasher_instance.shutdown()
+        _hasher_instance = None
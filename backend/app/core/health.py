@@ -0,0 +1,150 @@
+import asyncio
+import os
+import shutil
+import time
+import uuid
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+
+# Probe files are written under this storage prefix and removed straight away
+PROBE_PREFIX = ".health"
+
+
+class Probe:
+    """
+    One dependency check with a time budget and a cached result.
+
+    Callers within `ttl` seconds of the last run get its result, and
+    concurrent callers share one run, so frequent probing costs one check
+    per `ttl` per worker. A check that overruns its budget is reported as
+    failed but left to finish rather than restarted, so a hung dependency
+    never piles up probe threads or connections.
+    """
+
+    def __init__(self, name: str, check, budget: float, ttl: float, critical: bool = True):
+        self.name = name
+        self.check = check
+        self.budget = budget
+        self.ttl = ttl
+        self.critical = critical
+        self._result: dict | None = None
+        self._checked_at = 0.0
+        self._running: asyncio.Future | None = None
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.ttl
+
+    async def result(self) -> dict:
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            if self._fresh():
+                return self._result
+            if self._running is None or self._running.done():
+                self._running = asyncio.ensure_future(self.check())
+                # Retrieve late failures of runs that overran the budget
+                self._running.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+            start = time.perf_counter()
+            try:
+                detail = await asyncio.wait_for(asyncio.shield(self._running), self.budget)
+                result = {"status": "ok", **(detail or {})}
+            except asyncio.TimeoutError:
+                result = {"status": "fail", "error": f"No answer within {self.budget * 1000:.0f} ms"}
+            except Exception as e:
+                result = {"status": "fail", "error": f"{type(e).__name__}: {str(e)[:200]}"}
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            result["critical"] = self.critical
+
+            self._result, self._checked_at = result, time.monotonic()
+            return result
+
+
+def _database() -> None:
+    """Round trip to the database, through a pool requests use"""
+    from app.database import engine, reader_engine
+
+    # In embedded mode the primary begins IMMEDIATE under the writer lock, so
+    # probing it would queue behind writes; the reader pool checks the same file
+    with (reader_engine or engine).connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def _storage(min_free_mb: int) -> dict:
+    """Write, read back and delete a small file, then check free space"""
+    from app.services.storage import get_storage
+
+    storage = get_storage()
+    path = f"{PROBE_PREFIX}/{os.getpid()}-{uuid.uuid4().hex}"
+    payload = uuid.uuid4().bytes
+    storage.save(payload, path)
+    try:
+        if storage.read(path) != payload:
+            raise OSError("Read back different content than was written")
+    finally:
+        storage.delete(path)
+
+    base_path = getattr(storage, "base_path", None)
+    if base_path is None:
+        return {}
+    usage = shutil.disk_usage(base_path)
+    detail = {"free_mb": usage.free // 2 ** 20, "free_pct": round(usage.free / usage.total * 100, 1)}
+    if detail["free_mb"] < min_free_mb:
+        detail.update(status="fail", error=f"Less than {min_free_mb} MB free")
+    return detail
+
+
+async def _llm() -> dict:
+    from app.services.llm import get_llm
+
+    llm = get_llm()
+    await llm.heartbeat()
+    return {"model": llm.get_model_info()["model"]}
+
+
+class Readiness:
+    """The readiness probes of this worker"""
+
+    def __init__(self, probes: list[Probe]):
+        self.probes = probes
+
+    async def check(self) -> tuple[bool, dict]:
+        """Whether the worker can serve traffic, and the per-dependency report"""
+        results = await asyncio.gather(*(probe.result() for probe in self.probes))
+        checks = {probe.name: result for probe, result in zip(self.probes, results)}
+        ready = all(r["status"] == "ok" for r in results if r["critical"])
+        healthy = all(r["status"] == "ok" for r in results)
+        return ready, {"status": "ok" if healthy else "degraded" if ready else "fail", "checks": checks}
+
+
+_readiness: Readiness | None = None
+
+
+def get_readiness() -> Readiness:
+    """Get the readiness probes, built from settings on first use"""
+    global _readiness
+
+    if _readiness is None:
+        settings = get_settings()
+        ttl = settings.health_cache_seconds
+        _readiness = Readiness([
+            Probe("database", lambda: run_in_threadpool(_database), settings.health_db_budget_ms / 1000, ttl),
+            Probe(
+                "storage",
+                lambda: run_in_threadpool(_storage, settings.health_storage_min_free_mb),
+                settings.health_storage_budget_ms / 1000,
+                ttl,
+            ),
+            # The LLM only backs chat; by default an outage degrades the worker but keeps it in rotation
+            Probe(
+                "llm",
+                _llm,
+                settings.health_llm_budget_ms / 1000,
+                max(ttl, settings.health_llm_cache_seconds),
+                critical=settings.health_llm_required,
+            ),
+        ])
+
+    return _readiness
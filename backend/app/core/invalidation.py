@@ -0,0 +1,169 @@
+import json
+import logging
+import select
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Callback receives the invalidated key, or None when everything must be flushed
+InvalidationCallback = Callable[[str | None], None]
+
+
+class InvalidationBus:
+    """
+    Publish/subscribe channel for cache invalidation.
+
+    In-process caches subscribe to a topic and drop entries when a key is
+    published. This base implementation only reaches the current process,
+    which is enough for a single worker and doubles as the local stand-in
+    for tests and development.
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self._subscribers: dict[str, list[InvalidationCallback]] = defaultdict(list)
+
+    def subscribe(self, topic: str, callback: InvalidationCallback):
+        """Register a callback for a topic"""
+        self._subscribers[topic].append(callback)
+
+    def publish(self, topic: str, key: str | None, local: bool = True):
+        """
+        Invalidate a key in every other worker, and locally unless `local`
+        is False (for callers that already updated their own cache).
+        """
+        if local:
+            self._dispatch(topic, key)
+        self._broadcast(topic, key)
+
+    def _dispatch(self, topic: str, key: str | None):
+        for callback in self._subscribers.get(topic, []):
+            try:
+                callback(key)
+            except Exception:
+                logger.exception("Invalidation callback failed for topic %s", topic)
+
+    def _flush_all(self):
+        """Flush every subscriber; used after messages may have been missed"""
+        for topic in list(self._subscribers):
+            self._dispatch(topic, None)
+
+    def _broadcast(self, topic: str, key: str | None):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """
+    Invalidation bus over Postgres LISTEN/NOTIFY.
+
+    A daemon thread holds one dedicated connection listening on CHANNEL.
+    Messages published by this worker are skipped on receipt since they
+    were already applied locally. If the listener connection drops, every
+    cache is flushed on reconnect because notifications may have been lost.
+    """
+
+    CHANNEL = "cache_invalidation"
+
+    def __init__(self, dsn: str):
+        super().__init__()
+        self.dsn = dsn
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    def _broadcast(self, topic: str, key: str | None):
+        from sqlalchemy import text
+        from app.database import engine
+
+        payload = json.dumps({"origin": self.worker_id, "topic": topic, "key": key})
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT pg_notify(:channel, :payload)"),
+                                   {"channel": self.CHANNEL, "payload": payload})
+                connection.commit()
+        except Exception:
+            logger.exception("Failed to broadcast invalidation for topic %s", topic)
+
+    def _handle(self, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.worker_id:
+            return
+        self._dispatch(message.get("topic", ""), message.get("key"))
+
+    def _listen(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        backoff = 1.0
+        connected_before = False
+        while self._running:
+            try:
+                connection = psycopg2.connect(self.dsn)
+                connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.CHANNEL}")
+                if connected_before:
+                    self._flush_all()
+                connected_before = True
+                backoff = 1.0
+
+                while self._running:
+                    if select.select([connection], [], [], 5.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._handle(connection.notifies.pop(0).payload)
+                connection.close()
+            except Exception:
+                logger.exception("Invalidation listener lost its connection, reconnecting")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._listen, name="invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+
+# Bus singleton
+_bus_instance: InvalidationBus | None = None
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """
+    Factory function to get the invalidation bus.
+    Uses Postgres LISTEN/NOTIFY when `invalidation_backend` is "postgres",
+    otherwise the in-process bus.
+    """
+    global _bus_instance
+
+    if _bus_instance is None:
+        settings = get_settings()
+        if settings.invalidation_backend == "postgres":
+            from sqlalchemy.engine import make_url
+
+            dsn = make_url(settings.database_url).set(drivername="postgresql")
+            _bus_instance = PostgresInvalidationBus(dsn.render_as_string(hide_password=False))
+        else:
+            _bus_instance = InvalidationBus()
+        _bus_instance.start()
+
+    return _bus_instance
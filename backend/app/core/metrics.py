@@ -0,0 +1,395 @@
+import asyncio
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+# Latency buckets in seconds, shared by the request, query, storage and LLM histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# FastAPI appends the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class _Shards:
+    """
+    Per-thread arrays of numbers, summed when collected.
+
+    Each thread only ever writes its own array, so updates on hot paths
+    are plain list increments with no lock and no lost updates. Arrays of
+    threads that have exited are folded into one on collection, so idle
+    threadpool workers coming and going do not grow the list.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._live: list[tuple[threading.Thread, list]] = []
+        self._retired = [0] * size
+        self._lock = threading.Lock()
+
+    def mine(self) -> list:
+        values = getattr(self._local, "values", None)
+        if values is None:
+            values = self._local.values = [0] * self.size
+            with self._lock:
+                self._live.append((threading.current_thread(), values))
+        return values
+
+    def total(self) -> list:
+        with self._lock:
+            live = []
+            for thread, values in self._live:
+                if thread.is_alive():
+                    live.append((thread, values))
+                else:
+                    self._retired = [a + b for a, b in zip(self._retired, values)]
+            self._live = live
+            totals = list(self._retired)
+            for _, values in live:
+                totals = [a + b for a, b in zip(totals, values)]
+        return totals
+
+
+class _Metric:
+    """A metric family: one child per combination of label values"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._child(())
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._child(key)
+        return child
+
+    def _child(self, key: tuple):
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[tuple[str, dict, float]]:
+        for key, child in list(self._children.items()):
+            yield from child.samples(self.name, dict(zip(self.labelnames, key)))
+
+
+class _CounterChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1):
+        self._shards.mine()[0] += amount
+
+    def samples(self, name: str, labels: dict):
+        yield f"{name}_total", labels, self._shards.total()[0]
+
+
+class Counter(_Metric):
+    """Monotonic counter; exposed as <name>_total"""
+
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1):
+        self._shards.mine()[0] += amount
+
+    def dec(self, amount: float = 1):
+        self._shards.mine()[0] -= amount
+
+    @contextmanager
+    def track(self):
+        """Count the block as in progress while it runs"""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+    def samples(self, name: str, labels: dict):
+        yield name, labels, self._shards.total()[0]
+
+
+class Gauge(_Metric):
+    """Up/down gauge built from per-thread deltas, so inc and dec may run on different threads"""
+
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default.dec(amount)
+
+    def track(self):
+        return self._default.track()
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf, then the sum
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value: float):
+        values = self._shards.mine()
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name: str, labels: dict):
+        totals = self._shards.total()
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), totals):
+            cumulative += count
+            yield f"{name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+        yield f"{name}_sum", labels, totals[-1]
+        yield f"{name}_count", labels, cumulative
+
+
+class Histogram(_Metric):
+    """Histogram with cumulative le buckets, a _sum and a _count"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+
+class CallbackGauges:
+    """
+    Gauges or counters read at scrape time from a callback returning
+    (labels, value) pairs, for state that already lives elsewhere
+    (pool occupancy, PoolMetrics counters, loop lag)
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Iterable[tuple[dict, float]]],
+                 type: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.type = type
+
+    def samples(self):
+        suffix = "_total" if self.type == "counter" else ""
+        for labels, value in self.callback():
+            yield self.name + suffix, labels, value
+
+
+class Registry:
+    """Metric families of this worker process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, callback, type: str = "gauge") -> CallbackGauges:
+        return self.register(CallbackGauges(name, documentation, callback, type))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            family = metric.name + ("_total" if metric.type == "counter" else "")
+            lines.append(f"# HELP {family} {metric.documentation}")
+            lines.append(f"# TYPE {family} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+REGISTRY = Registry()
+
+# HTTP
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests being served")
+
+# Database
+DB_QUERY_SECONDS = REGISTRY.histogram("db_query_duration_seconds", "Database statement execution time")
+
+# Storage
+STORAGE_OPERATION_SECONDS = REGISTRY.histogram(
+    "storage_operation_duration_seconds", "File storage operation latency", ["operation"]
+)
+STORAGE_BYTES = REGISTRY.counter("storage_bytes", "Bytes read from and written to file storage", ["direction"])
+
+# LLM
+LLM_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "llm_time_to_first_token_seconds", "Time from starting a chat stream to its first token"
+)
+LLM_TOKENS_PER_SECOND = REGISTRY.histogram(
+    "llm_stream_tokens_per_second", "Token rate of completed chat streams after the first token",
+    buckets=(1, 5, 10, 20, 50, 100, 200, 500, 1000)
+)
+LLM_RESPONSE_SECONDS = REGISTRY.histogram("llm_response_duration_seconds", "Full LLM response time", ["mode"])
+LLM_TOKENS = REGISTRY.counter("llm_stream_tokens", "Tokens streamed to chat clients")
+LLM_ACTIVE_STREAMS = REGISTRY.gauge("llm_active_streams", "Chat responses being streamed")
+
+# Event loop
+EVENT_LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "event_loop_lag_seconds", "Delay of a periodic event loop timer past its deadline"
+)
+_last_loop_lag = 0.0
+REGISTRY.callback("event_loop_lag_last_seconds", "Most recent event loop lag sample",
+                  lambda: [({}, _last_loop_lag)])
+
+
+def _pool_samples(read: Callable):
+    """Callback yielding read(engine) for every engine of this worker"""
+    def collect():
+        from app.database import engine, reader_engine, replica_engines, get_async_engine
+
+        engines = [("primary", engine)] + [(f"replica_{i}", e) for i, e in enumerate(replica_engines)]
+        if reader_engine is not None:
+            engines.append(("reader", reader_engine))
+        async_engine = get_async_engine()
+        if async_engine is not None:
+            engines.append(("async", async_engine.sync_engine))
+        for name, target in engines:
+            yield {"engine": name}, read(target)
+    return collect
+
+
+REGISTRY.callback("db_pool_checked_out", "Connections checked out of the pool",
+                  _pool_samples(lambda e: e.pool.checkedout()))
+REGISTRY.callback("db_pool_size", "Configured pool size", _pool_samples(lambda e: e.pool.size()))
+REGISTRY.callback("db_pool_overflow", "Overflow connections open beyond the pool size",
+                  _pool_samples(lambda e: max(0, e.pool.overflow())))
+REGISTRY.callback("db_pool_checkouts", "Connection checkouts",
+                  _pool_samples(lambda e: e.pool.metrics.checkouts), type="counter")
+REGISTRY.callback("db_pool_checkout_wait_seconds", "Time spent waiting for pool checkouts",
+                  _pool_samples(lambda e: e.pool.metrics.checkout_wait_total), type="counter")
+REGISTRY.callback("db_pool_checkout_timeouts", "Checkouts that timed out waiting for a connection",
+                  _pool_samples(lambda e: e.pool.metrics.checkout_timeouts), type="counter")
+REGISTRY.callback("db_pool_invalidations", "Connections invalidated after errors",
+                  _pool_samples(lambda e: e.pool.metrics.invalidations), type="counter")
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, so label values stay bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency and in-flight count of HTTP requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route_template(scope), status).observe(
+                time.perf_counter() - start
+            )
+
+
+async def monitor_event_loop(interval: float):
+    """Sample how late a timer of `interval` seconds fires, forever"""
+    global _last_loop_lag
+
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        _last_loop_lag = max(0.0, loop.time() - start - interval)
+        EVENT_LOOP_LAG_SECONDS.observe(_last_loop_lag)
@@ -1,7 +1,10 @@
 from functools import wraps
 from typing import Callable, List
 from fastapi import HTTPException, status
+from sqlalchemy.orm import joinedload
 from app.models import User, Project, ProjectMember, RoleName
+from app.models.enums import ProjectRole
+from app.core.acl import get_project_acl
 
 
 def has_permission(user: User, permission: str) -> bool:
@@ -35,8 +38,7 @@ def can_access_project(user: User, project_id: int, db) -> bool:
         return True
 
     # Check if user is a member of the project
-    membership = get_user_project_role(user, project_id, db)
-    return membership is not None
+    return get_project_acl().role(user.id, project_id, db) is not None
 
 
 def can_write_files(user: User, project_id: int, db) -> bool:
@@ -45,14 +47,100 @@ def can_write_files(user: User, project_id: int, db) -> bool:
     if is_admin(user):
         return True
 
-    # Check project membership
-    membership = get_user_project_role(user, project_id, db)
-    if not membership:
-        return False
-
     # Only writers can create/update files
-    from app.models.enums import ProjectRole
-    return membership.role == ProjectRole.WRITER
+    return get_project_acl().role(user.id, project_id, db) == ProjectRole.WRITER
+
+
+class ProjectAccess:
+    """A project together with the caller's role in it"""
+
+    def __init__(self, project: Project | None, role: ProjectRole | None, admin: bool):
+        self.project = project
+        self.role = role
+        self.admin = admin
+
+    @property
+    def can_read(self) -> bool:
+        return self.project is not None and (self.admin or self.role is not None)
+
+    @property
+    def can_write(self) -> bool:
+        if self.project is None:
+            return False
+        return self.admin or self.role == ProjectRole.WRITER
+
+
+class ProjectAccessResolver:
+    """
+    Resolves project access for one user.
+
+    The project (with its creator) is fetched in a single query and the
+    user's role comes from the in-memory ACL index. Results are memoized on
+    the instance, so a request that checks the same project several times
+    pays one round trip. Create one resolver per request (or per WebSocket
+    message).
+    """
+
+    def __init__(self, user: User, db):
+        self.user = user
+        self.db = db
+        self.admin = is_admin(user)
+        self._resolved: dict[int, ProjectAccess] = {}
+
+    def resolve(self, project_id: int) -> ProjectAccess:
+        access = self._resolved.get(project_id)
+        if access is not None:
+            return access
+
+        project = (
+            self.db.query(Project)
+            .options(joinedload(Project.creator))
+            .filter(Project.id == project_id)
+            .first()
+        )
+        role = None
+        if project is not None and not self.admin:
+            role = get_project_acl().role(self.user.id, project_id, self.db)
+
+        access = ProjectAccess(project, role, self.admin)
+        self._resolved[project_id] = access
+        return access
+
+    def can_access(self, project_id: int) -> bool:
+        return self.resolve(project_id).can_read
+
+    def can_write(self, project_id: int) -> bool:
+        return self.resolve(project_id).can_write
+
+
+class AsyncProjectAccessResolver:
+    """ProjectAccessResolver for an AsyncSession"""
+
+    def __init__(self, user: User, db):
+        self.user = user
+        self.db = db
+        self.admin = is_admin(user)
+        self._resolved: dict[int, ProjectAccess] = {}
+
+    async def resolve(self, project_id: int) -> ProjectAccess:
+        access = self._resolved.get(project_id)
+        if access is not None:
+            return access
+
+        project = await self.db.get(Project, project_id, options=[joinedload(Project.creator)])
+        role = None
+        if project is not None and not self.admin:
+            role = (await get_project_acl().roles_async(self.user.id, self.db)).get(project_id)
+
+        access = ProjectAccess(project, role, self.admin)
+        self._resolved[project_id] = access
+        return access
+
+    async def can_access(self, project_id: int) -> bool:
+        return (await self.resolve(project_id)).can_read
+
+    async def can_write(self, project_id: int) -> bool:
+        return (await self.resolve(project_id)).can_write
 
 
 class PermissionChecker:
@@ -0,0 +1,74 @@
+import time
+from app.config import get_settings
+from app.core.invalidation import get_invalidation_bus
+from app.models import User
+
+INVALIDATION_TOPIC = "principal"
+
+
+class PrincipalCache:
+    """
+    In-process cache of authenticated users, keyed by user id.
+
+    Entries are detached User instances with their role (and so their
+    permissions) already loaded, so they can be shared across requests
+    without touching any session. Entries expire after `ttl` seconds and
+    are dropped early whenever the user is updated or deleted.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: dict[int, tuple[float, User]] = {}
+
+    def get(self, user_id: int) -> User | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        return user
+
+    def set(self, user: User):
+        if self.ttl <= 0:
+            return
+        if len(self._entries) >= self.max_size:
+            # Evict the oldest insertion; dicts keep insertion order
+            try:
+                self._entries.pop(next(iter(self._entries)))
+            except (StopIteration, KeyError, RuntimeError):
+                pass
+        self._entries[user.id] = (time.monotonic() + self.ttl, user)
+
+    def invalidate(self, key: str | None):
+        """Drop one user (by id), or everything when key is None"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(int(key), None)
+
+
+# Cache singleton
+_cache_instance: PrincipalCache | None = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the principal cache, subscribing it to invalidations on first use"""
+    global _cache_instance
+
+    if _cache_instance is None:
+        settings = get_settings()
+        _cache_instance = PrincipalCache(
+            ttl=settings.principal_cache_ttl,
+            max_size=settings.principal_cache_size
+        )
+        get_invalidation_bus().subscribe(INVALIDATION_TOPIC, _cache_instance.invalidate)
+
+    return _cache_instance
+
+
+def invalidate_principal(user_id: int):
+    """Drop a cached user in this and every other worker"""
+    get_invalidation_bus().publish(INVALIDATION_TOPIC, str(user_id))
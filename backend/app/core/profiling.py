@@ -0,0 +1,370 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from urllib.parse import parse_qs
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+
+# A request is profiled when it carries a token from POST /api/diagnostics/profiles/token
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_QUERY = "profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+MAX_STACK_DEPTH = 128
+
+_active: ContextVar["ProfileSession | None"] = ContextVar("profile_session", default=None)
+
+
+def _sign(message: str) -> str:
+    key = get_settings().secret_key.encode()
+    return hmac.new(key, f"profile:{message}".encode(), hashlib.sha256).hexdigest()
+
+
+def issue_token(user_id: int, ttl_seconds: int) -> tuple[str, int]:
+    """A profiling token for `user_id` and its expiry (unix time)"""
+    expires = int(time.time()) + ttl_seconds
+    message = f"{user_id}.{expires}"
+    return f"{message}.{_sign(message)}", expires
+
+
+def verify_token(token: str) -> int | None:
+    """The user id a valid, unexpired token was issued to, else None"""
+    try:
+        user_id, expires, signature = token.split(".")
+        if int(expires) < time.time():
+            return None
+        if not hmac.compare_digest(signature, _sign(f"{user_id}.{expires}")):
+            return None
+        return int(user_id)
+    except ValueError:
+        return None
+
+
+def token_requester(token: str) -> int | None:
+    """
+    The user id behind a profiling token while that user is still an active
+    admin, else None. Blocking: resolves the user through the principal cache.
+    """
+    from app.core.permissions import is_admin
+    from app.database import SessionLocal
+    from app.services.user_service import UserService
+
+    user_id = verify_token(token)
+    if user_id is None:
+        return None
+    with SessionLocal() as db:
+        user = UserService(db).get_principal(user_id)
+    if user is None or not user.is_active or not is_admin(user):
+        return None
+    return user_id
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _stack(frame, root: str) -> str:
+    """Folded stack (outermost first, ';'-separated) of a frame"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.append(root)
+    return ";".join(reversed(names))
+
+
+def _task_stack(task: asyncio.Task) -> str | None:
+    """Folded stack of a suspended task, following what each coroutine awaits"""
+    names = ["await"]
+    awaited = task.get_coro()
+    while awaited is not None and len(names) <= MAX_STACK_DEPTH:
+        frame = getattr(awaited, "cr_frame", None) or getattr(awaited, "gi_frame", None) \
+            or getattr(awaited, "ag_frame", None)
+        if frame is None:
+            break
+        names.append(_frame_name(frame))
+        awaited = getattr(awaited, "cr_await", None) or getattr(awaited, "gi_yieldfrom", None) \
+            or getattr(awaited, "ag_await", None)
+    return ";".join(names) if len(names) > 1 else None
+
+
+class ProfileSession:
+    """
+    Wall-clock sampling profile of one unit of work: an HTTP request or a
+    chat WebSocket message.
+
+    A sampler thread wakes every `interval` seconds and records the stack
+    of the work's asyncio task, on the event loop thread when the task is
+    running ("loop") or its suspended coroutine chain when it is waiting
+    ("await"). Threadpool threads running code for the work register
+    themselves through `traced` and are sampled too ("thread"); while one
+    is busy, the task waiting on it is not sampled twice.
+    """
+
+    def __init__(self, label: str, requested_by: int, interval: float):
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.requested_by = requested_by
+        self.interval = interval
+        self.stacks: dict[str, int] = {}
+        self.threads: set[int] = set()
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._loop_thread = threading.get_ident()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.id[:8]}", daemon=True)
+        self.started_at = datetime.utcnow()
+        self.duration = 0.0
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._sampler.start()
+
+    async def stop(self):
+        """Stop sampling; the sampler thread is joined off the event loop"""
+        self.duration = time.perf_counter() - self._start
+        self._stopped.set()
+        await asyncio.to_thread(self._sampler.join)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.threads):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self._record(_stack(frame, "thread"))
+            if self._task is None or self._task.done():
+                continue
+            if asyncio.current_task(self._loop) is self._task:
+                self._record(_stack(frames.get(self._loop_thread), "loop"))
+            elif not self.threads:
+                stack = _task_stack(self._task)
+                if stack is not None:
+                    self._record(stack)
+
+    def _record(self, stack: str):
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    @contextmanager
+    def attached(self):
+        """Sample the current thread while the block runs"""
+        thread_id = threading.get_ident()
+        self.threads.add(thread_id)
+        try:
+            yield
+        finally:
+            self.threads.discard(thread_id)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "requested_by": self.requested_by,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 2),
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": sum(self.stacks.values()),
+            "stacks": self.stacks,
+        }
+
+
+def call_tree(stacks: dict[str, int]) -> dict:
+    """Nest folded stacks into {name, samples, children} nodes, heaviest first"""
+    root = {"name": "all", "samples": 0, "children": {}}
+    for stack, count in stacks.items():
+        node = root
+        node["samples"] += count
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"name": name, "samples": 0, "children": {}})
+            node["samples"] += count
+
+    def finish(node: dict) -> dict:
+        children = sorted(node["children"].values(), key=lambda child: child["samples"], reverse=True)
+        return {"name": node["name"], "samples": node["samples"], "children": [finish(c) for c in children]}
+
+    return finish(root)
+
+
+def collapsed(stacks: dict[str, int]) -> str:
+    """Folded stacks, one "frame;frame;frame count" line each, for flamegraph.pl or speedscope"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+class ProfileStore:
+    """
+    Recent profiles as JSON files in one directory, so any worker can serve
+    a profile recorded by another. The oldest are removed beyond `max_profiles`.
+    """
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, profile: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile['id']}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(profile))
+        tmp.replace(path)
+
+        files = self._oldest_first()
+        for old in files[:max(0, len(files) - self.max_profiles)]:
+            old.unlink(missing_ok=True)
+
+    def _oldest_first(self) -> list[Path]:
+        def mtime(path: Path) -> float:
+            # Another worker may prune a file between listing and stat
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+
+        return sorted(self.directory.glob("*.json"), key=mtime)
+
+    def get(self, profile_id: str) -> dict | None:
+        # Ids are uuid hex; anything else could escape the directory
+        if len(profile_id) != 32 or not all(c in "0123456789abcdef" for c in profile_id):
+            return None
+        try:
+            return json.loads((self.directory / f"{profile_id}.json").read_text())
+        except FileNotFoundError:
+            return None
+
+    def recent(self) -> list[dict]:
+        """Summaries of stored profiles, newest first"""
+        if not self.directory.exists():
+            return []
+        summaries = []
+        for path in reversed(self._oldest_first()):
+            try:
+                profile = json.loads(path.read_text())
+            except (FileNotFoundError, ValueError):
+                continue
+            profile.pop("stacks", None)
+            summaries.append(profile)
+        return summaries
+
+
+_store: ProfileStore | None = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Get the profile store for the configured directory"""
+    global _store
+
+    if _store is None:
+        settings = get_settings()
+        _store = ProfileStore(settings.profile_dir, settings.profile_max_stored)
+
+    return _store
+
+
+def _new_session(label: str, requested_by: int) -> ProfileSession:
+    return ProfileSession(label, requested_by, get_settings().profile_interval_ms / 1000)
+
+
+def traced(fn):
+    """
+    Let `fn`, run on a worker thread, be sampled when it runs for profiled
+    work. Unprofiled calls only pay for one context variable lookup.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = _active.get()
+        if session is None:
+            return fn(*args, **kwargs)
+        with session.attached():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def trace_sync_endpoints(routes):
+    """
+    Wrap sync endpoints with `traced`, so profiles of routes that FastAPI
+    runs on the threadpool include the endpoint's own thread
+    """
+    for route in routes:
+        if isinstance(route, APIRoute) and not asyncio.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = traced(route.dependant.call)
+
+
+async def run_profiled(label: str, requested_by: int, awaitable):
+    """Await `awaitable` in the current task under a profile, then store the profile"""
+    session = _new_session(label, requested_by)
+    token = _active.set(session)
+    session.start()
+    try:
+        return await awaitable
+    finally:
+        _active.reset(token)
+        # Shielded: a cancelled generation (the socket closed) still stores its profile
+        await asyncio.shield(_finish(session))
+
+
+async def _finish(session: ProfileSession):
+    """Stop the session and store its profile"""
+    await session.stop()
+    await run_in_threadpool(get_profile_store().save, session.to_dict())
+
+
+def _request_token(scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1")
+    query = scope.get("query_string", b"")
+    if PROFILE_QUERY.encode() + b"=" in query:
+        values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY)
+        return values[0] if values else None
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles HTTP requests that carry a valid profiling token in the
+    X-Profile-Token header or the `profile` query parameter. The response
+    gets an X-Profile-Id header naming the stored profile. Requests
+    without a token only pay for the header scan.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        token = _request_token(scope) if scope["type"] == "http" else None
+        requested_by = await run_in_threadpool(token_requester, token) if token else None
+        if requested_by is None:
+            await self.app(scope, receive, send)
+            return
+
+        session = _new_session(f"{scope['method']} {scope['path']}", requested_by)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER, session.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        context = _active.set(session)
+        session.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _active.reset(context)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                session.label = f"{scope['method']} {route} ({scope['path']})"
+            await asyncio.shield(_finish(session))
@@ -0,0 +1,120 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import get_settings
+from app.core.metrics import DB_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Query count and total database time for one unit of work"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least `threshold` times, the usual sign of an N+1"""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries, {self.duration * 1000:.1f} ms"]
+        for statement, count in self.statements.most_common():
+            lines.append(f"  {count}x {' '.join(statement.split())[:200]}")
+        return "\n".join(lines)
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# Collectors that see every query in the process, used by count_queries()
+_global_collectors: list[QueryStats] = []
+
+
+@contextmanager
+def track_queries():
+    """Attribute queries run in the current context (and its threads) to a new QueryStats"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def count_queries():
+    """Count every query in the process, whatever context runs it; meant for tests"""
+    stats = QueryStats()
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+
+def instrument_queries(engine: Engine):
+    """Feed the engine's queries into the active QueryStats and the query latency histogram"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.observe(duration)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        for collector in _global_collectors:
+            collector.record(statement, duration)
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks queries per HTTP request. In debug mode the totals are returned
+    in a Server-Timing header; statements repeated `query_repeat_warning`
+    times or more within one request are logged as possible N+1s.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        settings = get_settings()
+        self.debug = settings.debug
+        self.repeat_warning = settings.query_repeat_warning
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start" and self.debug:
+                    headers = list(message.get("headers", []))
+                    value = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+                    headers.append((b"server-timing", value.encode()))
+                    headers.append((b"timing-allow-origin", b"*"))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if self.repeat_warning:
+                    for statement, count in stats.repeated(self.repeat_warning):
+                        logger.warning(
+                            "Possible N+1 in %s %s: statement ran %d times: %s",
+                            scope["method"], scope["path"], count, " ".join(statement.split())[:200]
+                        )
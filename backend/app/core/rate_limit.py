@@ -0,0 +1,238 @@
+import ipaddress
+import math
+import threading
+import time
+from functools import lru_cache
+from app.config import get_settings
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request exceeds one of its token buckets"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class BucketRule:
+    """
+    A token bucket holding up to `capacity` tokens, refilled at
+    capacity / period tokens per second. Parsed from "capacity/period",
+    e.g. "10/60" allows a burst of 10 and 10 requests per minute.
+    """
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.refill_rate = capacity / period
+
+    @classmethod
+    def parse(cls, spec: str) -> "BucketRule | None":
+        if not spec:
+            return None
+        capacity, period = spec.split("/")
+        return cls(float(capacity), float(period))
+
+
+class MemoryBucketStore:
+    """In-process token buckets; limits apply per worker"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, buckets: list[tuple[str, BucketRule]]) -> float:
+        """
+        Take one token from every bucket if each has one; return 0 if taken,
+        else seconds until all have one, taking nothing
+        """
+        now = time.monotonic()
+        with self._lock:
+            states = [(self._refilled(key, rule, now), rule) for key, rule in buckets]
+            wait = max(
+                ((1 - bucket[0]) / rule.refill_rate for bucket, rule in states if bucket[0] < 1), default=0.0
+            )
+            if wait == 0:
+                for bucket, _ in states:
+                    bucket[0] -= 1
+            return wait
+
+    def _refilled(self, key: str, rule: BucketRule, now: float) -> list[float]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                # Drop the oldest tenth of the keys; dicts keep insertion order
+                for stale in list(self._buckets)[:self.max_keys // 10]:
+                    del self._buckets[stale]
+            bucket = self._buckets[key] = [rule.capacity, now]
+        else:
+            bucket[0] = min(rule.capacity, bucket[0] + (now - bucket[1]) * rule.refill_rate)
+            bucket[1] = now
+        return bucket
+
+
+class RedisBucketStore:
+    """Token buckets in Redis, shared by every worker. Requires the `redis` package."""
+
+    # KEYS are the buckets, ARGV their capacity and refill rate in pairs
+    SCRIPT = """
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local tokens = {}
+    local wait = 0
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[2 * i - 1])
+        local rate = tonumber(ARGV[2 * i])
+        local state = redis.call('HMGET', key, 'tokens', 'ts')
+        local t = tonumber(state[1]) or capacity
+        local ts = tonumber(state[2]) or now
+        t = math.min(capacity, t + (now - ts) * rate)
+        if t < 1 then
+            wait = math.max(wait, (1 - t) / rate)
+        end
+        tokens[i] = t
+    end
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[2 * i - 1])
+        local rate = tonumber(ARGV[2 * i])
+        local t = tokens[i]
+        if wait == 0 then
+            t = t - 1
+        end
+        redis.call('HSET', key, 'tokens', t, 'ts', now)
+        redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+    end
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis rate limit backend requires the 'redis' package") from e
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def take(self, buckets: list[tuple[str, BucketRule]]) -> float:
+        """As MemoryBucketStore.take, atomically in one round trip"""
+        keys, args = [], []
+        for key, rule in buckets:
+            # The hash tag keeps one endpoint class's buckets in one cluster slot
+            endpoint_class, rest = key.split(":", 1)
+            keys.append(f"ratelimit:{{{endpoint_class}}}:{rest}")
+            args += [rule.capacity, rule.refill_rate]
+        return float(self._script(keys=keys, args=args))
+
+
+class RateLimiter:
+    """
+    Checks requests against token buckets per client IP, per user and per
+    endpoint class (a global bucket shared by all callers of that class).
+    """
+
+    def __init__(self, store, rules: dict[str, dict[str, BucketRule | None]]):
+        self.store = store
+        self.rules = rules
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        settings = get_settings()
+        if settings.rate_limit_backend == "redis":
+            store = RedisBucketStore(settings.rate_limit_redis_url)
+        else:
+            store = MemoryBucketStore()
+
+        rules = {
+            "auth": {
+                "ip": BucketRule.parse(settings.rate_limit_auth_ip),
+                "global": BucketRule.parse(settings.rate_limit_auth_global),
+            },
+            "chat": {
+                "ip": BucketRule.parse(settings.rate_limit_chat_ip),
+                "user": BucketRule.parse(settings.rate_limit_chat_user),
+                "global": BucketRule.parse(settings.rate_limit_chat_global),
+            },
+        }
+        return cls(store, rules)
+
+    def check(self, endpoint_class: str, ip: str | None, user_id: int | None = None):
+        """
+        Take a token from every applicable bucket, or from none of them and
+        raise RateLimitExceeded if any is empty. A request refused by its own
+        IP or user bucket must not drain the global bucket other callers share.
+        """
+        rules = self.rules.get(endpoint_class, {})
+        buckets = []
+
+        rule = rules.get("ip")
+        if rule and ip:
+            buckets.append((f"{endpoint_class}:ip:{ip}", rule))
+
+        rule = rules.get("user")
+        if rule and user_id is not None:
+            buckets.append((f"{endpoint_class}:user:{user_id}", rule))
+
+        rule = rules.get("global")
+        if rule:
+            buckets.append((f"{endpoint_class}:global", rule))
+
+        if not buckets:
+            return
+        wait = self.store.take(buckets)
+        if wait > 0:
+            raise RateLimitExceeded(wait)
+
+
+# Limiter singleton
+_limiter_instance: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Get the rate limiter, or None when rate limiting is disabled"""
+    global _limiter_instance
+
+    if not get_settings().rate_limit_enabled:
+        return None
+
+    if _limiter_instance is None:
+        _limiter_instance = RateLimiter.from_settings()
+
+    return _limiter_instance
+
+
+@lru_cache(maxsize=8)
+def _networks(spec: str) -> tuple:
+    return tuple(ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip())
+
+
+def _trusted(address: str, networks: tuple) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(scope_client, headers) -> str | None:
+    """
+    Client address. Forwarding headers are only read when the peer is a
+    trusted proxy; X-Forwarded-For is then walked from the right, past
+    trusted proxies, since entries left of those were sent by the client
+    and can be anything. X-Real-IP is used when there is no X-Forwarded-For.
+    """
+    peer = scope_client.host if scope_client else None
+    networks = _networks(get_settings().rate_limit_trusted_proxies)
+    if peer is None or not networks or not _trusted(peer, networks):
+        return peer
+
+    forwarded = headers.get("x-forwarded-for")
+    if forwarded:
+        for address in reversed([part.strip() for part in forwarded.split(",")]):
+            if address and not _trusted(address, networks):
+                return address
+        return peer
+    return headers.get("x-real-ip") or peer
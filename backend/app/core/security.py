@@ -1,27 +1,51 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.config import get_settings
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+# passlib (with its bcrypt backend) and jose are imported on first use, so
+# importing the app and starting a worker does not pay for them
+_pwd_context = None
+
+
+def get_pwd_context():
+    """The passlib context, created on first use"""
+    global _pwd_context
+
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+    return _pwd_context
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password, returning a new hash when the stored one needs upgrading"""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -32,10 +56,82 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+class TokenCache:
+    """
+    Bounded LRU cache of verified JWT claims, keyed by the token's SHA-256
+    digest. Entries expire at the token's own `exp`, so a cached token is
+    never accepted for longer than a freshly verified one would be.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return claims
+
+    def set(self, digest: bytes, claims: dict):
+        expires_at = claims.get("exp")
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = (expires_at, claims)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+token_cache = TokenCache(settings.jwt_cache_size)
+
+
 def decode_token(token: str) -> Optional[dict]:
-    """Decode and validate JWT token"""
+    """
+    Decode and validate JWT token.
+    Verified claims are served from `token_cache` until the token expires;
+    the returned dict is a copy and may be modified by the caller.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(digest)
+    if claims is not None:
+        return dict(claims)
+
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    token_cache.set(digest, payload)
+    return dict(payload)
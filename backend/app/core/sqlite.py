@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Execution option naming how a transaction begins: DEFERRED (default) or IMMEDIATE
+BEGIN_MODE = "sqlite_begin"
+
+_HELD = "sqlite_writer_lock"
+
+
+def is_embedded(url: str) -> bool:
+    """True for a file-backed SQLite URL, which runs in embedded single-node mode"""
+    parsed = make_url(url)
+    database = parsed.database or ""
+    return (
+        parsed.get_backend_name() == "sqlite"
+        and database not in ("", ":memory:")
+        and "mode=memory" not in database
+        and parsed.query.get("mode") != "memory"
+    )
+
+
+class WriterLock:
+    """
+    Serialises write transactions of one process.
+
+    SQLite has a single writer. Without this, concurrent BEGIN IMMEDIATEs
+    wait in SQLite's busy handler, which polls with growing sleeps and
+    gives up with "database is locked" after busy_timeout. Threads of this
+    process queue on a lock instead and are handed the database as soon as
+    the previous writer's connection goes back to the pool. busy_timeout
+    still covers writers in other processes (migrations, scripts).
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.acquisitions = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(timeout=self.timeout)
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            if not acquired:
+                self.timeouts += 1
+                return False
+            self.acquisitions += 1
+            self.wait_total += waited
+            if waited > self.wait_max:
+                self.wait_max = waited
+        return True
+
+    def release(self):
+        self._lock.release()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            mean = self.wait_total / self.acquisitions if self.acquisitions else 0.0
+            return {
+                "acquisitions": self.acquisitions,
+                "wait_mean_ms": round(mean * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "timeouts": self.timeouts,
+                "held": self._lock.locked(),
+            }
+
+
+def pragmas(settings: Settings) -> list[str]:
+    """Pragmas run on every new connection"""
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA foreign_keys=ON",
+    ]
+
+
+def configure_sqlite(engine: Engine, settings: Settings, writer_lock: WriterLock | None = None):
+    """
+    Tune a SQLite engine for embedded mode: WAL and the configured pragmas
+    on connect, and explicit BEGIN statements so a transaction can start
+    IMMEDIATE (see BEGIN_MODE). pysqlite would otherwise defer BEGIN to the
+    first INSERT/UPDATE/DELETE and upgrade a read lock mid-transaction,
+    which fails with SQLITE_BUSY instead of waiting.
+
+    With `writer_lock`, IMMEDIATE transactions hold it until their
+    connection is checked back in. Only pass one for a sync engine; an
+    async engine would block the event loop on it.
+    """
+    statements = pragmas(settings)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        # Let the "begin" listener below emit BEGIN itself
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def on_begin(conn):
+        mode = conn.get_execution_options().get(BEGIN_MODE, "DEFERRED")
+        if mode == "IMMEDIATE" and writer_lock is not None and not conn.info.get(_HELD):
+            if writer_lock.acquire():
+                conn.info[_HELD] = True
+            else:
+                logger.warning("Writer lock not acquired in %.1fs; falling back to busy_timeout",
+                               writer_lock.timeout)
+        conn.exec_driver_sql(f"BEGIN {mode}")
+
+    if writer_lock is None:
+        return
+
+    def release(connection_record):
+        if connection_record is not None and connection_record.info.pop(_HELD, False):
+            writer_lock.release()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        release(connection_record)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        release(connection_record)
+
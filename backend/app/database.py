@@ -1,19 +1,166 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import HTTPConnection
 from app.config import get_settings
+from app.core.db_pool import engine_options, instrument_engine
+from app.core.db_routing import READ_ONLY_METHODS, RoutingSession
+from app.core.query_stats import instrument_queries
+from app.core.sqlite import BEGIN_MODE, WriterLock, configure_sqlite, is_embedded
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _create_engine(url: str, writer_lock: WriterLock | None = None):
+    options = engine_options(settings, url)
+    if writer_lock is not None:
+        options["execution_options"] = {BEGIN_MODE: "IMMEDIATE"}
+    new_engine = create_engine(url, **options)
+    if new_engine.dialect.name == "sqlite":
+        configure_sqlite(new_engine, settings, writer_lock)
+    instrument_engine(new_engine)
+    instrument_queries(new_engine)
+    return new_engine
+
+
+def replica_urls() -> list[str]:
+    return [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+
+
+# Embedded single-node mode: a file-backed SQLite database without replicas.
+# The primary engine only writes: its transactions begin IMMEDIATE under the
+# writer lock. Reads go through a second pool on the same file and run
+# concurrently under WAL. Separate pools keep a request that holds a read
+# connection from waiting on a pool drained by other readers.
+embedded = is_embedded(settings.database_url) and not replica_urls()
+writer_lock = WriterLock(settings.sqlite_busy_timeout_ms / 1000) if embedded else None
+
+engine = _create_engine(settings.database_url, writer_lock)
+replica_engines = [_create_engine(url) for url in replica_urls()]
+reader_engine = _create_engine(settings.database_url) if embedded else None
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine,
+    **({"replicas": [reader_engine], "replica_lag": False} if embedded else {"replicas": replica_engines})
+)
 
 Base = declarative_base()
 
+# Async drivers for each sync backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _is_read_only(connection: HTTPConnection) -> bool:
+    return connection.scope.get("method") in READ_ONLY_METHODS
+
 
-def get_db():
+def dialect_insert(dialect_name: str):
+    """The dialect's insert(), which supports ON CONFLICT upserts"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Upserts are not supported on {dialect_name}")
+    return insert
+
+
+def get_db(connection: HTTPConnection):
+    """Request session; GET requests read from a replica when any are configured"""
     db = SessionLocal()
+    db.info["read_only"] = _is_read_only(connection)
     try:
         yield db
     finally:
         db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Derive the async driver URL from the sync `database_url`"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Async engines, created on first use so the sync stack never needs the async driver
+_async_engine = None
+_async_replica_engines = []
+_async_reader_engine = None
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """Get the async session factory, creating the async engine on first use"""
+    global _async_engine, _async_replica_engines, _async_reader_engine, _async_sessionmaker
+
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        def create(url: str, writes: bool = False):
+            options = engine_options(settings, url, is_async=True)
+            if writes:
+                options["execution_options"] = {BEGIN_MODE: "IMMEDIATE"}
+            new_engine = create_async_engine(url, **options)
+            if new_engine.dialect.name == "sqlite":
+                # No writer lock: waiting on it would block the event loop
+                configure_sqlite(new_engine.sync_engine, settings)
+            instrument_engine(new_engine.sync_engine)
+            instrument_queries(new_engine.sync_engine)
+            return new_engine
+
+        url = settings.async_database_url or async_database_url(settings.database_url)
+        _async_engine = create(url, writes=embedded)
+        _async_replica_engines = [create(async_database_url(url)) for url in replica_urls()]
+        if embedded:
+            _async_reader_engine = create(url)
+            routing = {"replicas": [_async_reader_engine.sync_engine], "replica_lag": False}
+        else:
+            routing = {"replicas": [e.sync_engine for e in _async_replica_engines]}
+        _async_sessionmaker = async_sessionmaker(
+            _async_engine,
+            sync_session_class=RoutingSession,
+            autoflush=False,
+            expire_on_commit=False,
+            **routing
+        )
+
+    return _async_sessionmaker
+
+
+def get_async_engine():
+    """The async engine, or None if no async session was requested yet"""
+    return _async_engine
+
+
+def get_async_replica_engines() -> list:
+    return list(_async_replica_engines)
+
+
+def get_async_reader_engine():
+    """The async embedded-mode read engine, if created"""
+    return _async_reader_engine
+
+
+async def get_async_db(connection: HTTPConnection):
+    async with get_async_sessionmaker()() as db:
+        db.info["read_only"] = _is_read_only(connection)
+        yield db
+
+
+async def dispose_async_engine():
+    """Close the async engine's connections, if it was created"""
+    global _async_engine, _async_replica_engines, _async_reader_engine, _async_sessionmaker
+
+    if _async_engine is not None:
+        for async_engine in [_async_engine, *_async_replica_engines, _async_reader_engine]:
+            if async_engine is not None:
+                await async_engine.dispose()
+        _async_engine = None
+        _async_replica_engines = []
+        _async_reader_engine = None
+        _async_sessionmaker = None
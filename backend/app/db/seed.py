@@ -1,33 +1,53 @@
+import hashlib
+import json
+from datetime import datetime
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
-from app.models import Role, User, RoleName
+from app.models import Role, User, RoleName, SeedState
 from app.core.security import get_password_hash
 
+SEED_NAME = "default"
+
+# Postgres advisory lock key so concurrent workers seed one at a time
+SEED_LOCK_KEY = 4501
+
+ADMIN_EMAIL = "admin@example.com"
+
+ROLE_PERMISSIONS = {
+    RoleName.ADMIN: [
+        "projects:create", "projects:read", "projects:update", "projects:delete",
+        "projects:assign_team",
+        "users:create", "users:read", "users:update", "users:delete",
+        "files:create", "files:read", "files:update", "files:delete",
+        "ai:use"
+    ],
+    RoleName.WRITER: [
+        "projects:read",
+        "files:create", "files:read", "files:update",
+        "ai:use"
+    ],
+    RoleName.STATISTICIAN: [
+        "projects:read",
+        "files:read",
+        "ai:use"
+    ]
+}
 
-def seed_roles(db: Session) -> dict[str, Role]:
-    """Create default roles if they don't exist"""
-    roles = {}
 
-    role_permissions = {
-        RoleName.ADMIN: [
-            "projects:create", "projects:read", "projects:update", "projects:delete",
-            "projects:assign_team",
-            "users:create", "users:read", "users:update", "users:delete",
-            "files:create", "files:read", "files:update", "files:delete",
-            "ai:use"
-        ],
-        RoleName.WRITER: [
-            "projects:read",
-            "files:create", "files:read", "files:update",
-            "ai:use"
-        ],
-        RoleName.STATISTICIAN: [
-            "projects:read",
-            "files:read",
-            "ai:use"
-        ]
+def seed_fingerprint() -> str:
+    """Hash of the seed definitions; changing them makes the next startup seed again"""
+    definition = {
+        "roles": {role_name.value: permissions for role_name, permissions in ROLE_PERMISSIONS.items()},
+        "admin": ADMIN_EMAIL,
     }
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode()).hexdigest()
+
+
+def seed_roles(db: Session) -> dict[str, Role]:
+    """Create default roles if they don't exist and sync their permissions"""
+    roles = {}
 
-    for role_name, permissions in role_permissions.items():
+    for role_name, permissions in ROLE_PERMISSIONS.items():
         existing = db.query(Role).filter(Role.name == role_name.value).first()
         if not existing:
             role = Role(name=role_name.value, permissions=permissions)
@@ -35,35 +55,69 @@ def seed_roles(db: Session) -> dict[str, Role]:
             db.flush()
             roles[role_name.value] = role
         else:
+            if existing.permissions != permissions:
+                existing.permissions = permissions
             roles[role_name.value] = existing
 
-    db.commit()
+    db.flush()
     return roles
 
 
 def seed_admin_user(db: Session, roles: dict[str, Role]) -> User:
     """Create default admin user if not exists"""
-    admin_email = "admin@example.com"
-    existing = db.query(User).filter(User.email == admin_email).first()
+    existing = db.query(User).filter(User.email == ADMIN_EMAIL).first()
 
     if not existing:
         admin = User(
-            email=admin_email,
+            email=ADMIN_EMAIL,
             hashed_password=get_password_hash("admin123"),
             full_name="System Administrator",
             role_id=roles[RoleName.ADMIN.value].id,
             is_active=True
         )
         db.add(admin)
-        db.commit()
-        db.refresh(admin)
+        db.flush()
         return admin
 
     return existing
 
 
 def run_seeds(db: Session):
-    """Run all seeders"""
+    """Run all seeders and record the seed fingerprint"""
     roles = seed_roles(db)
     seed_admin_user(db, roles)
+
+    state = db.get(SeedState, SEED_NAME)
+    if state is None:
+        state = SeedState(name=SEED_NAME)
+        db.add(state)
+    state.fingerprint = seed_fingerprint()
+    state.applied_at = datetime.utcnow()
+    db.commit()
     print("Database seeded successfully!")
+
+
+def _seeds_current(db: Session, fingerprint: str) -> bool:
+    return db.scalar(select(SeedState.fingerprint).where(SeedState.name == SEED_NAME)) == fingerprint
+
+
+def ensure_seeded(db: Session) -> bool:
+    """
+    Seed unless the stored fingerprint matches the current definitions,
+    which costs one query. Returns whether the seeders ran. Data removed
+    after seeding (e.g. the default admin) is not recreated until the
+    definitions change or the seed_state row is deleted.
+    """
+    fingerprint = seed_fingerprint()
+    if _seeds_current(db, fingerprint):
+        return False
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Another worker may be seeding; wait for it and check again
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SEED_LOCK_KEY})
+        if _seeds_current(db, fingerprint):
+            db.commit()
+            return False
+
+    run_seeds(db)
+    return True
@@ -1,7 +1,11 @@
+import asyncio
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import api_router
+from app.api.routes import API_PREFIX, api_routers
+from app.config import get_settings
+from app.core.query_stats import QueryStatsMiddleware
+from app.core import health, metrics, profiling
 
 app = FastAPI(
     title="Manuscript Workbench API",
@@ -15,25 +19,87 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(QueryStatsMiddleware)
+if get_settings().metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+if get_settings().profiling_enabled:
+    app.add_middleware(profiling.ProfilingMiddleware)
 
 # Include API routes
-app.include_router(api_router)
+for router in api_routers:
+    app.include_router(router, prefix=API_PREFIX)
+if get_settings().profiling_enabled:
+    profiling.trace_sync_endpoints(app.routes)
 
 
 @app.get("/health")
-def health_check():
+@app.get("/health/live")
+async def health_check():
+    """Liveness: the worker's event loop answers. Checks no dependencies"""
     return {"status": "healthy"}
 
 
+@app.get("/health/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness: database round trip, storage write/read/delete and free
+    space, LLM heartbeat. 503 when a required dependency fails
+    """
+    ready, report = await health.get_readiness().check()
+    if not ready:
+        response.status_code = 503
+    return report
+
+
+if get_settings().metrics_enabled:
+    # Not proxied by nginx; scrape each worker directly on the backend port
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint():
+        return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Run database seeds on startup"""
+    """Seed the database if the seed definitions changed, start background tasks"""
     from app.database import SessionLocal
-    from app.db.seed import run_seeds
+    from app.db.seed import ensure_seeded
+    from app.core.invalidation import get_invalidation_bus
+    from app.services.stats_service import reconcile_stats_periodically
+
+    get_invalidation_bus()
 
     db = SessionLocal()
     try:
-        run_seeds(db)
+        ensure_seeded(db)
     finally:
         db.close()
+
+    settings = get_settings()
+    if settings.stats_reconcile_interval > 0:
+        app.state.stats_reconciler = asyncio.create_task(
+            reconcile_stats_periodically(settings.stats_reconcile_interval)
+        )
+    if settings.metrics_enabled and settings.metrics_loop_lag_interval > 0:
+        app.state.loop_monitor = asyncio.create_task(
+            metrics.monitor_event_loop(settings.metrics_loop_lag_interval)
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared clients"""
+    from app.services.llm import close_llm
+    from app.core.invalidation import get_invalidation_bus
+    from app.core.hashing import shutdown_password_hasher
+    from app.database import dispose_async_engine
+
+    for name in ("stats_reconciler", "loop_monitor"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    await close_llm()
+    await dispose_async_engine()
+    shutdown_password_hasher()
+    get_invalidation_bus().stop()
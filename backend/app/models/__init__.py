@@ -3,6 +3,8 @@ from app.models.user import User
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.file import File
+from app.models.stats import StatCounter, ProjectStats, UserStats
+from app.models.seed_state import SeedState
 from app.models.enums import RoleName, ProjectStatus, ProjectRole
 
 __all__ = [
@@ -11,6 +13,10 @@ __all__ = [
     "Project",
     "ProjectMember",
     "File",
+    "StatCounter",
+    "ProjectStats",
+    "UserStats",
+    "SeedState",
     "RoleName",
     "ProjectStatus",
     "ProjectRole"
@@ -14,6 +14,15 @@ class ProjectStatus(str, enum.Enum):
     COMPLETED = "completed"
 
 
+# Listing priority per status, highest first: in_progress → under_review → draft → completed
+STATUS_PRIORITY = {
+    ProjectStatus.IN_PROGRESS: 4,
+    ProjectStatus.UNDER_REVIEW: 3,
+    ProjectStatus.DRAFT: 2,
+    ProjectStatus.COMPLETED: 1,
+}
+
+
 class ProjectRole(str, enum.Enum):
     """Role within a specific project"""
     WRITER = "writer"
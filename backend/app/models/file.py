@@ -8,13 +8,13 @@ class File(Base, TimestampMixin):
     __tablename__ = "files"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=False)
     storage_path = Column(String(500), nullable=False)
     content_type = Column(String(100), nullable=True)
     size = Column(BigInteger, default=0)
-    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     version = Column(Integer, default=0, nullable=False)
 
     # Relationships
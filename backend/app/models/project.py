@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship, validates
 from app.database import Base
 from app.models.base import TimestampMixin
-from app.models.enums import ProjectStatus
+from app.models.enums import ProjectStatus, STATUS_PRIORITY
 
 
 class Project(Base, TimestampMixin):
@@ -12,11 +12,30 @@ class Project(Base, TimestampMixin):
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.DRAFT, nullable=False)
+    # Persisted listing sort key, kept in step with status (see STATUS_PRIORITY)
+    status_priority = Column(
+        SmallInteger,
+        default=STATUS_PRIORITY[ProjectStatus.DRAFT],
+        server_default=str(STATUS_PRIORITY[ProjectStatus.DRAFT]),
+        nullable=False
+    )
     word_count = Column(Integer, default=0)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     base_folder_path = Column(String(500), nullable=True)
 
+    # Listings filter and sort by status, newest first; keyset pagination
+    # walks ix_projects_listing backwards (all sort keys descending)
+    __table_args__ = (
+        Index("ix_projects_status_created_at", "status", "created_at"),
+        Index("ix_projects_listing", "status_priority", "created_at", "id"),
+    )
+
     # Relationships
     creator = relationship("User", back_populates="created_projects", foreign_keys=[created_by])
     members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan")
     files = relationship("File", back_populates="project", cascade="all, delete-orphan")
+
+    @validates("status")
+    def _sync_status_priority(self, key, status):
+        self.status_priority = STATUS_PRIORITY[ProjectStatus(status)]
+        return status
@@ -0,0 +1,12 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+from app.database import Base
+
+
+class SeedState(Base):
+    """Fingerprint of the seed data last applied, so startup can skip seeding"""
+    __tablename__ = "seed_state"
+
+    name = Column(String(50), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, BigInteger, ForeignKey
+from app.database import Base
+
+
+class StatCounter(Base):
+    """Named global counter, e.g. "projects.draft" or "files.bytes" """
+    __tablename__ = "stat_counters"
+
+    name = Column(String(100), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+class ProjectStats(Base):
+    """Per-project aggregates maintained alongside files and memberships"""
+    __tablename__ = "project_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    file_count = Column(Integer, nullable=False, default=0)
+    storage_bytes = Column(BigInteger, nullable=False, default=0, index=True)
+    member_count = Column(Integer, nullable=False, default=0)
+
+
+class UserStats(Base):
+    """Per-user aggregates: project memberships and uploaded files"""
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    project_count = Column(Integer, nullable=False, default=0)
+    file_count = Column(Integer, nullable=False, default=0)
+    storage_bytes = Column(BigInteger, nullable=False, default=0)
@@ -60,3 +60,16 @@ class ProjectDetailResponse(ProjectResponse):
 class TeamAssignment(BaseModel):
     """Assign multiple team members to a project"""
     members: list[ProjectMemberCreate]
+
+
+class BulkMembershipAssignment(BaseModel):
+    """Add the same members to several projects"""
+    project_ids: list[int]
+    members: list[ProjectMemberCreate]
+
+
+class MembershipChangesResponse(BaseModel):
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
@@ -0,0 +1,6 @@
+# Async counterparts of the core services, sharing models, caches and the ACL index
+from app.services.aio.project_service import AsyncProjectService
+from app.services.aio.file_service import AsyncFileService
+from app.services.aio.user_service import AsyncUserService
+
+__all__ = ["AsyncProjectService", "AsyncFileService", "AsyncUserService"]
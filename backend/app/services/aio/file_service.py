@@ -0,0 +1,83 @@
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from starlette.concurrency import run_in_threadpool
+from app.models import File
+from app.services.storage import get_storage
+from app.services.stats_service import StatsDelta
+
+
+class AsyncFileService:
+    """
+    FileService for an AsyncSession. Storage backends are synchronous, so
+    their calls run on the threadpool.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.storage = get_storage()
+
+    async def get_by_id(self, file_id: int) -> File | None:
+        return await self.db.get(File, file_id, options=[joinedload(File.uploader)])
+
+    async def get_project_files(self, project_id: int) -> list[File]:
+        result = await self.db.execute(
+            select(File)
+            .options(joinedload(File.uploader))
+            .where(File.project_id == project_id)
+        )
+        return list(result.scalars())
+
+    async def download_file(self, file_id: int) -> tuple[bytes, File]:
+        """Download a file from storage"""
+        file_record = await self.get_by_id(file_id)
+        if not file_record:
+            raise FileNotFoundError(f"File not found: {file_id}")
+
+        content = await run_in_threadpool(self.storage.read, file_record.storage_path)
+        return content, file_record
+
+    async def get_file_content_as_text(self, file_id: int) -> tuple[str, File]:
+        """Get file content as text (for markdown files)"""
+        content, file_record = await self.download_file(file_id)
+        return content.decode('utf-8'), file_record
+
+    async def create_file(
+        self,
+        project_id: int,
+        filename: str,
+        content: str,
+        created_by: int
+    ) -> File:
+        """Create a new file with content (no upload required)"""
+        # Generate storage path
+        unique_id = str(uuid.uuid4())
+        storage_filename = f"{unique_id}_{filename}"
+        storage_path = f"projects/{project_id}/{storage_filename}"
+
+        # Save content to storage
+        content_bytes = content.encode('utf-8')
+        await run_in_threadpool(self.storage.save, content_bytes, storage_path)
+
+        # Create database record (version starts at 0)
+        file_obj = File(
+            project_id=project_id,
+            filename=storage_filename,
+            original_filename=filename,
+            storage_path=storage_path,
+            content_type="text/markdown",
+            size=len(content_bytes),
+            uploaded_by=created_by,
+            version=0
+        )
+
+        self.db.add(file_obj)
+        await self.db.flush()
+        stats = StatsDelta()
+        stats.file_added(project_id, created_by, file_obj.size)
+        await stats.apply_async(self.db)
+        await self.db.commit()
+        await self.db.refresh(file_obj, ["uploader"])
+
+        return file_obj
@@ -0,0 +1,78 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.models import Project, ProjectMember, User, File, ProjectStats
+from app.core.permissions import is_admin
+from app.core.acl import get_project_acl
+from app.services.project_service import LISTING_ORDER, after_cursor
+
+
+class AsyncProjectService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, project_id: int) -> Project | None:
+        return await self.db.get(Project, project_id, options=[joinedload(Project.creator)])
+
+    async def get_all(self, skip: int = 0, limit: int = 100, cursor: str | None = None) -> list[Project]:
+        query = select(Project).options(joinedload(Project.creator))
+        return await self._paginate(query, skip, limit, cursor)
+
+    async def get_user_projects(
+        self,
+        user: User,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None
+    ) -> list[Project]:
+        """Get projects accessible by user"""
+        if is_admin(user):
+            return await self.get_all(skip, limit, cursor)
+
+        # Get projects where user is a member
+        project_ids = list(await get_project_acl().roles_async(user.id, self.db))
+        if not project_ids:
+            return []
+
+        query = (
+            select(Project)
+            .options(joinedload(Project.creator))
+            .where(Project.id.in_(project_ids))
+        )
+        return await self._paginate(query, skip, limit, cursor)
+
+    async def _paginate(self, query, skip: int, limit: int, cursor: str | None) -> list[Project]:
+        query = query.order_by(*LISTING_ORDER)
+        if cursor:
+            query = query.where(after_cursor(cursor))
+        else:
+            query = query.offset(skip)
+        result = await self.db.execute(query.limit(limit))
+        return list(result.scalars())
+
+    async def get_project_members(self, project_id: int) -> list[dict]:
+        """Get all members of a project with user details"""
+        result = await self.db.execute(
+            select(ProjectMember)
+            .options(joinedload(ProjectMember.user))
+            .where(ProjectMember.project_id == project_id)
+        )
+
+        return [
+            {
+                "id": m.id,
+                "user_id": m.user_id,
+                "role": m.role,
+                "user_email": m.user.email,
+                "user_full_name": m.user.full_name,
+                "created_at": m.created_at
+            }
+            for m in result.scalars()
+        ]
+
+    async def get_file_count(self, project_id: int) -> int:
+        """Get the number of files in a project"""
+        count = await self.db.scalar(select(ProjectStats.file_count).where(ProjectStats.project_id == project_id))
+        if count is None:
+            count = await self.db.scalar(select(func.count(File.id)).where(File.project_id == project_id))
+        return count
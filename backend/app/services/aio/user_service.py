@@ -0,0 +1,46 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.models import User
+from app.core.principal_cache import get_principal_cache
+
+
+class AsyncUserService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        return await self.db.get(User, user_id)
+
+    async def get_principal(self, user_id: int) -> User | None:
+        """
+        Get a user with their role for authentication, sharing the principal
+        cache with UserService.get_principal. The returned instance is
+        detached and must be treated as read-only.
+        """
+        cache = get_principal_cache()
+        user = cache.get(user_id)
+        if user is not None:
+            return user
+
+        # Read from the primary so a lagging replica never ends up in the cache
+        user = await self.db.scalar(
+            select(User)
+            .options(joinedload(User.role))
+            .where(User.id == user_id)
+            .execution_options(use_primary=True)
+        )
+        if user is not None:
+            # Detach the role too, so later commits in this session never expire it
+            if user.role is not None:
+                self.db.expunge(user.role)
+            self.db.expunge(user)
+            cache.set(user)
+        return user
+
+    async def get_by_email(self, email: str) -> User | None:
+        return await self.db.scalar(select(User).where(User.email == email))
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[User]:
+        result = await self.db.execute(select(User).offset(skip).limit(limit))
+        return list(result.scalars())
@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy.orm import Session, joinedload
 from app.models import File, Project
 from app.services.storage import get_storage
+from app.services.stats_service import StatsDelta
 
 
 class FileService:
@@ -53,10 +54,14 @@ class FileService:
         )
 
         self.db.add(file_record)
+        self.db.flush()
+        file_id = file_record.id
+        stats = StatsDelta()
+        stats.file_added(project_id, uploaded_by, file_record.size)
+        stats.apply(self.db)
         self.db.commit()
-        self.db.refresh(file_record)
 
-        return file_record
+        return self.get_by_id(file_id)
 
     def download_file(self, file_id: int) -> tuple[bytes, File]:
         """Download a file from storage"""
@@ -73,15 +78,20 @@ class FileService:
         if not file_record:
             raise FileNotFoundError(f"File not found: {file_id}")
 
+        # Files stored before sizes were recorded have none
+        size_delta = len(content) - (file_record.size or 0)
+
         # Overwrite in storage
         self.storage.save(content, file_record.storage_path)
 
         # Update size
+        stats = StatsDelta()
+        stats.file_resized(file_record.project_id, file_record.uploaded_by, size_delta)
         file_record.size = len(content)
+        stats.apply(self.db)
         self.db.commit()
-        self.db.refresh(file_record)
 
-        return file_record
+        return self.get_by_id(file_id)
 
     def delete_file(self, file_id: int) -> bool:
         """Delete file from storage and database"""
@@ -93,7 +103,10 @@ class FileService:
         self.storage.delete(file_record.storage_path)
 
         # Delete from database
+        stats = StatsDelta()
+        stats.file_removed(file_record.project_id, file_record.uploaded_by, file_record.size or 0)
         self.db.delete(file_record)
+        stats.apply(self.db)
         self.db.commit()
 
         return True
@@ -133,7 +146,12 @@ class FileService:
         )
 
         self.db.add(file_obj)
+        self.db.flush()
+        file_id = file_obj.id
+        stats = StatsDelta()
+        stats.file_added(project_id, created_by, file_obj.size)
+        stats.apply(self.db)
         self.db.commit()
-        self.db.refresh(file_obj)
 
-        return file_obj
+        # Reload with the uploader in one query rather than refresh plus a lazy load
+        return self.get_by_id(file_id)
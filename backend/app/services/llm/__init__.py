@@ -1,5 +1,7 @@
 from app.services.llm.base import BaseLLM
 from app.services.llm.fake import FakeLLM
+from app.services.llm.latency import LatencyProfile
+from app.config import get_settings
 
 # LLM singleton
 _llm_instance: BaseLLM | None = None
@@ -8,19 +10,81 @@ _llm_instance: BaseLLM | None = None
 def get_llm() -> BaseLLM:
     """
     Factory function to get LLM instance.
-    Currently returns FakeLLM, but can be extended to return
-    ClaudeLLM or other implementations based on configuration.
+    Returns ClaudeLLM when `llm_provider` is "claude", FakeLLM otherwise.
     """
     global _llm_instance
 
     if _llm_instance is None:
-        # In the future, this can check config and return appropriate LLM
-        # if settings.llm_provider == "claude":
-        #     _llm_instance = ClaudeLLM(api_key=settings.claude_api_key)
-        # else:
-        _llm_instance = FakeLLM()
+        settings = get_settings()
+        if settings.llm_provider == "claude":
+            from app.services.llm.claude import ClaudeLLM
+
+            if not settings.anthropic_api_key:
+                raise ValueError("ANTHROPIC_API_KEY is required when LLM_PROVIDER is 'claude'")
+            _llm_instance = ClaudeLLM(
+                api_key=settings.anthropic_api_key,
+                base_url=settings.llm_base_url,
+                model=settings.llm_model,
+                max_tokens=settings.llm_max_tokens,
+                connect_timeout=settings.llm_connect_timeout,
+                read_timeout=settings.llm_read_timeout,
+                max_connections=settings.llm_max_connections,
+                max_retries=settings.llm_max_retries,
+                retry_base_delay=settings.llm_retry_base_delay,
+                retry_max_delay=settings.llm_retry_max_delay,
+            )
+        else:
+            _llm_instance = FakeLLM(
+                latency=_fake_latency_profile(settings),
+                response_tokens=settings.fake_llm_response_tokens,
+            )
 
     return _llm_instance
 
 
-__all__ = ["BaseLLM", "FakeLLM", "get_llm"]
+def _fake_latency_profile(settings) -> LatencyProfile:
+    """Build FakeLLM's latency profile from settings"""
+    ttft, trace = settings.fake_llm_ttft, None
+    if settings.fake_llm_latency == "trace":
+        if not settings.fake_llm_trace_path:
+            raise ValueError("FAKE_LLM_TRACE_PATH is required when FAKE_LLM_LATENCY is 'trace'")
+        recorded_ttft, trace = LatencyProfile.load_trace(settings.fake_llm_trace_path)
+        ttft = ttft or recorded_ttft
+
+    return LatencyProfile(
+        mode=settings.fake_llm_latency,
+        seed=settings.fake_llm_seed,
+        ttft=ttft,
+        token_delay=settings.fake_llm_token_delay,
+        tokens_per_second=settings.fake_llm_tokens_per_second,
+        trace=trace,
+    )
+
+
+def __getattr__(name: str):
+    # The Claude provider pulls in httpx; import it only when it is used
+    if name in ("ClaudeLLM", "LLMProviderError"):
+        from app.services.llm import claude
+
+        return getattr(claude, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def close_llm():
+    """Close the LLM singleton, if one was created"""
+    global _llm_instance
+
+    if _llm_instance is not None:
+        await _llm_instance.close()
+        _llm_instance = None
+
+
+__all__ = [
+    "BaseLLM",
+    "FakeLLM",
+    "ClaudeLLM",
+    "LLMProviderError",
+    "LatencyProfile",
+    "get_llm",
+    "close_llm"
+]
@@ -33,6 +33,10 @@ class BaseLLM(ABC):
 
         Yields:
             Response tokens one at a time
+
+        The consumer may close the iterator before it is exhausted (the
+        user cancelled, or the stream timed out). Implementations must
+        release any upstream request when that happens.
         """
         pass
 
@@ -45,3 +49,17 @@ class BaseLLM(ABC):
             Dictionary with model name, version, etc.
         """
         pass
+
+    async def heartbeat(self):
+        """
+        Check the provider is reachable and accepts our credentials, without
+        generating tokens. Raises when it is not; the default has nothing to check.
+        """
+        pass
+
+    async def close(self):
+        """
+        Release resources held by the implementation (e.g. HTTP connection pools).
+        Called once on application shutdown.
+        """
+        pass
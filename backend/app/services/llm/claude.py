@@ -0,0 +1,181 @@
+import asyncio
+import json
+import random
+from typing import AsyncIterator
+import httpx
+from app.services.llm.base import BaseLLM
+
+
+class LLMProviderError(Exception):
+    """Raised when the provider rejects a request or retries are exhausted"""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ClaudeLLM(BaseLLM):
+    """
+    Anthropic Messages API implementation.
+
+    All requests share one keep-alive HTTP/2 connection pool. Requests that
+    fail with 429/5xx or a connection error are retried with jittered
+    exponential backoff, but only before any response bytes have been
+    streamed back, so a retry never duplicates tokens.
+    """
+
+    API_VERSION = "2023-06-01"
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+    SYSTEM_PROMPT = "You are an assistant helping scientific writers improve their manuscripts."
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.anthropic.com",
+        model: str = "claude-3-5-sonnet-latest",
+        max_tokens: int = 1024,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        max_connections: int = 100,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+    ):
+        self.model_name = model
+        self.max_tokens = max_tokens
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=True,
+            headers={
+                "x-api-key": api_key,
+                "anthropic-version": self.API_VERSION,
+                "content-type": "application/json",
+            },
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def _build_body(self, prompt: str, context: str, stream: bool) -> dict:
+        """Build the Messages API request body"""
+        system = self.SYSTEM_PROMPT
+        if context:
+            system = f"{system}\n\n{context}"
+        return {
+            "model": self.model_name,
+            "max_tokens": self.max_tokens,
+            "system": system,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": stream,
+        }
+
+    def _retry_delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when sent"""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.retry_max_delay)
+                except ValueError:
+                    pass
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def _send(self, body: dict, stream: bool) -> httpx.Response:
+        """
+        Send a request, retrying retryable failures.
+        The caller owns the returned response and must close it.
+        """
+        attempt = 0
+        while True:
+            request = self.client.build_request("POST", "/v1/messages", json=body)
+            try:
+                response = await self.client.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+                if attempt >= self.max_retries:
+                    raise LLMProviderError(f"LLM provider unreachable: {e}") from e
+                await asyncio.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code < 400:
+                return response
+
+            await response.aread()
+            await response.aclose()
+            if response.status_code in self.RETRY_STATUS_CODES and attempt < self.max_retries:
+                await asyncio.sleep(self._retry_delay(attempt, response))
+                attempt += 1
+                continue
+
+            raise LLMProviderError(
+                f"LLM provider returned {response.status_code}: {response.text[:200]}",
+                status_code=response.status_code,
+            )
+
+    async def generate(self, prompt: str, context: str = "") -> str:
+        """Generate a complete response"""
+        response = await self._send(self._build_body(prompt, context, stream=False), stream=False)
+        data = response.json()
+        return "".join(
+            block.get("text", "") for block in data.get("content", []) if block.get("type") == "text"
+        )
+
+    async def stream(self, prompt: str, context: str = "") -> AsyncIterator[str]:
+        """
+        Stream text deltas from the server-sent event stream.
+
+        Only `content_block_delta` payloads are JSON-decoded; pings and
+        bookkeeping events are skipped by their event name. Closing this
+        generator closes the response, which aborts the upstream request.
+        """
+        response = await self._send(self._build_body(prompt, context, stream=True), stream=True)
+        try:
+            event = ""
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    if event == "content_block_delta":
+                        delta = json.loads(line[5:])["delta"]
+                        text = delta.get("text")
+                        if text:
+                            yield text
+                    elif event == "message_stop":
+                        break
+                    elif event == "error":
+                        error = json.loads(line[5:]).get("error", {})
+                        raise LLMProviderError(f"LLM stream error: {error.get('message', 'unknown')}")
+        finally:
+            await response.aclose()
+
+    async def heartbeat(self):
+        """List one model: reaches the API and checks the key, without retries or token cost"""
+        response = await self.client.get("/v1/models", params={"limit": 1})
+        if response.status_code >= 400:
+            raise LLMProviderError(
+                f"LLM provider returned {response.status_code}", status_code=response.status_code
+            )
+
+    async def close(self):
+        """Close the shared connection pool"""
+        await self.client.aclose()
+
+    def get_model_info(self) -> dict:
+        """Return model information"""
+        return {
+            "model": self.model_name,
+            "version": self.API_VERSION,
+            "description": "Anthropic Claude via the Messages API",
+            "capabilities": [
+                "literature_review",
+                "drafting",
+                "citation_checking",
+                "summarization"
+            ]
+        }
@@ -2,14 +2,25 @@ import asyncio
 import random
 from typing import AsyncIterator
 from app.services.llm.base import BaseLLM
+from app.services.llm.latency import LatencyProfile
 
 
 class FakeLLM(BaseLLM):
     """
     Fake LLM implementation for demo purposes.
     Returns predefined responses with simulated streaming.
+
+    Timing follows a LatencyProfile, so tests and benchmarks can stream
+    with zero, fixed, rate-based or replayed delays. When `response_tokens`
+    is set, synthetic responses of that many words replace the canned ones.
     """
 
+    SYNTHETIC_VOCABULARY = (
+        "the manuscript study results analysis data methods cohort outcome association "
+        "significant baseline model effect table figure section revision reviewer draft "
+        "evidence sample estimate variance interval hypothesis literature citation clarity"
+    ).split()
+
     # Predefined responses based on keywords
     RESPONSES = {
         "introduction": """I'd be happy to help you improve your introduction section!
@@ -76,12 +87,25 @@ Please share more details about what you'd like me to help with, and I'll provid
 *Note: This is a demo environment. In the full version, I would analyze your actual document content and provide tailored suggestions.*"""
     }
 
-    def __init__(self):
+    def __init__(self, latency: LatencyProfile | None = None, response_tokens: int = 0):
         self.model_name = "fake-claude-demo"
         self.version = "1.0.0"
-
-    def _select_response(self, prompt: str) -> str:
+        self.latency = latency or LatencyProfile()
+        self.response_tokens = response_tokens
+
+    def _synthetic_response(self, rng: random.Random) -> str:
+        """Build a response of `response_tokens` words, with a paragraph break every 60 words"""
+        words = []
+        for i in range(self.response_tokens):
+            word = rng.choice(self.SYNTHETIC_VOCABULARY)
+            words.append(f"\n\n{word}" if i and i % 60 == 0 else word)
+        return " ".join(words)
+
+    def _select_response(self, prompt: str, rng: random.Random | None = None) -> str:
         """Select appropriate response based on prompt keywords"""
+        if self.response_tokens:
+            return self._synthetic_response(rng or self.latency.rng(prompt))
+
         prompt_lower = prompt.lower()
 
         if any(word in prompt_lower for word in ["introduction", "intro", "opening"]):
@@ -95,23 +119,36 @@ Please share more details about what you'd like me to help with, and I'll provid
 
     async def generate(self, prompt: str, context: str = "") -> str:
         """Generate a complete response"""
-        # Simulate some processing time
-        await asyncio.sleep(0.5)
-        return self._select_response(prompt)
+        rng = self.latency.rng(prompt)
+        response = self._select_response(prompt, rng)
+
+        # Simulate some processing time: a flat 0.5 s for the demo profile,
+        # otherwise the time the response would take to stream
+        if self.latency.mode == "random":
+            delay = 0.5
+        else:
+            delay = self.latency.total(len(response.split(" ")), rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
 
     async def stream(self, prompt: str, context: str = "") -> AsyncIterator[str]:
-        """Stream response word by word with realistic delays"""
-        response = self._select_response(prompt)
+        """Stream response word by word with the profile's delays"""
+        rng = self.latency.rng(prompt)
+        response = self._select_response(prompt, rng)
         words = response.split(" ")
 
-        for i, word in enumerate(words):
+        if self.latency.ttft > 0:
+            await asyncio.sleep(self.latency.ttft)
+
+        for i, (word, delay) in enumerate(zip(words, self.latency.delays(len(words), rng))):
             # Add space before word (except first word)
             if i > 0:
                 yield " "
             yield word
 
-            # Random delay between words (50-150ms) for realistic effect
-            await asyncio.sleep(random.uniform(0.03, 0.08))
+            if delay > 0:
+                await asyncio.sleep(delay)
 
     def get_model_info(self) -> dict:
         """Return model information"""
@@ -0,0 +1,82 @@
+import json
+import random
+from itertools import cycle, islice
+from typing import Iterator
+
+
+class LatencyProfile:
+    """
+    Simulated model timing for FakeLLM.
+
+    Modes:
+        random: 30-80 ms per word, drawn from a seeded generator (demo default)
+        zero:   no delay at all
+        fixed:  `token_delay` seconds per word
+        rate:   `tokens_per_second` words per second
+        trace:  per-word delays replayed (and cycled) from a recorded trace
+
+    `ttft` seconds are added before the first word in every mode. Delays are
+    drawn from a generator seeded with the profile seed and the prompt, so
+    each response replays identically however streams interleave.
+    """
+
+    MODES = ("random", "zero", "fixed", "rate", "trace")
+
+    def __init__(
+        self,
+        mode: str = "random",
+        seed: int | None = None,
+        ttft: float = 0.0,
+        token_delay: float = 0.0,
+        tokens_per_second: float = 0.0,
+        trace: list[float] | None = None,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown latency mode '{mode}', expected one of {', '.join(self.MODES)}")
+        if mode == "rate" and tokens_per_second <= 0:
+            raise ValueError("tokens_per_second must be positive in 'rate' mode")
+        if mode == "trace" and not trace:
+            raise ValueError("A non-empty trace is required in 'trace' mode")
+
+        self.mode = mode
+        self.seed = seed
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.tokens_per_second = tokens_per_second
+        self.trace = trace or []
+
+    @classmethod
+    def load_trace(cls, path: str) -> tuple[float, list[float]]:
+        """
+        Load a recorded trace file.
+
+        The file is JSON, either a list of per-word delays in seconds or an
+        object {"ttft": 0.4, "token_delays": [...]}.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return 0.0, [float(d) for d in data]
+        return float(data.get("ttft", 0.0)), [float(d) for d in data["token_delays"]]
+
+    def rng(self, prompt: str) -> random.Random:
+        """Generator for one response, deterministic when a seed is set"""
+        if self.seed is None:
+            return random.Random()
+        return random.Random(f"{self.seed}:{prompt}")
+
+    def delays(self, count: int, rng: random.Random) -> Iterator[float]:
+        """Delays to sleep after each of `count` words"""
+        if self.mode == "zero":
+            return iter([0.0] * count)
+        if self.mode == "fixed":
+            return iter([self.token_delay] * count)
+        if self.mode == "rate":
+            return iter([1 / self.tokens_per_second] * count)
+        if self.mode == "trace":
+            return islice(cycle(self.trace), count)
+        return (rng.uniform(0.03, 0.08) for _ in range(count))
+
+    def total(self, count: int, rng: random.Random) -> float:
+        """Total simulated time for a `count`-word response"""
+        return self.ttft + sum(self.delays(count, rng))
@@ -1,7 +1,11 @@
+import base64
+import binascii
+import json
+from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, case
-from app.models import Project, ProjectMember, User, File
-from app.models.enums import ProjectStatus
+from sqlalchemy import delete, func, tuple_
+from app.models import Project, ProjectMember, User, File, ProjectStats
+from app.models.enums import ProjectRole, ProjectStatus
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
@@ -9,6 +13,67 @@ from app.schemas.project import (
     ProjectMemberResponse
 )
 from app.core.permissions import is_admin
+from app.core.acl import get_project_acl
+from app.database import dialect_insert
+from app.services.stats_service import StatsDelta, StatsService
+
+# Rows per multi-row INSERT/DELETE, well under SQLite's bound-parameter limit
+MEMBERSHIP_BATCH = 500
+
+# Listing order: status priority (in_progress → under_review → draft →
+# completed), newest first, id as tie-breaker. Served by ix_projects_listing.
+LISTING_ORDER = (Project.status_priority.desc(), Project.created_at.desc(), Project.id.desc())
+
+
+def encode_cursor(project: Project) -> str:
+    """Opaque keyset cursor pointing just past `project` in LISTING_ORDER"""
+    raw = json.dumps([project.status_priority, project.created_at.isoformat(), project.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def after_cursor(cursor: str):
+    """Filter selecting the projects that follow `cursor`; raises ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        priority, created_at, project_id = json.loads(raw)
+        key = (int(priority), datetime.fromisoformat(created_at), int(project_id))
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    return tuple_(Project.status_priority, Project.created_at, Project.id) < key
+
+
+def _member_to_dict(member: ProjectMember) -> dict:
+    return {
+        "id": member.id,
+        "user_id": member.user_id,
+        "role": member.role,
+        "user_email": member.user.email,
+        "user_full_name": member.user.full_name,
+        "created_at": member.created_at
+    }
+
+
+def _batches(rows: list, size: int = MEMBERSHIP_BATCH):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class MembershipChanges:
+    """Rows written by a bulk membership operation"""
+
+    def __init__(self):
+        self.added: list = []
+        self.updated: list = []
+        self.removed: list[tuple[int, int]] = []
+        self.unchanged = 0
+
+    def summary(self) -> dict:
+        return {
+            "added": len(self.added),
+            "updated": len(self.updated),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+        }
 
 
 class ProjectService:
@@ -23,50 +88,45 @@ class ProjectService:
             .first()
         )
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> list[Project]:
-        # Define status priority order: in_progress → under_review → draft → completed
-        status_order = case(
-            (Project.status == ProjectStatus.IN_PROGRESS, 1),
-            (Project.status == ProjectStatus.UNDER_REVIEW, 2),
-            (Project.status == ProjectStatus.DRAFT, 3),
-            (Project.status == ProjectStatus.COMPLETED, 4),
-            else_=5
-        )
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: str | None = None) -> list[Project]:
+        """
+        List projects in LISTING_ORDER. With a `cursor` (from encode_cursor)
+        the page starts after it and `skip` is ignored, so deep pages cost
+        the same as the first.
+        """
+        query = self.db.query(Project).options(joinedload(Project.creator))
+        return self._paginate(query, skip, limit, cursor)
 
-        return (
-            self.db.query(Project)
-            .options(joinedload(Project.creator))
-            .order_by(status_order, Project.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-
-    def get_user_projects(self, user: User, skip: int = 0, limit: int = 100) -> list[Project]:
+    def get_user_projects(
+        self,
+        user: User,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None
+    ) -> list[Project]:
         """Get projects accessible by user"""
         if is_admin(user):
-            return self.get_all(skip, limit)
-
-        # Define status priority order: in_progress → under_review → draft → completed
-        status_order = case(
-            (Project.status == ProjectStatus.IN_PROGRESS, 1),
-            (Project.status == ProjectStatus.UNDER_REVIEW, 2),
-            (Project.status == ProjectStatus.DRAFT, 3),
-            (Project.status == ProjectStatus.COMPLETED, 4),
-            else_=5
-        )
+            return self.get_all(skip, limit, cursor)
 
         # Get projects where user is a member
-        return (
+        project_ids = list(get_project_acl().roles(user.id, self.db))
+        if not project_ids:
+            return []
+
+        query = (
             self.db.query(Project)
-            .join(ProjectMember)
             .options(joinedload(Project.creator))
-            .filter(ProjectMember.user_id == user.id)
-            .order_by(status_order, Project.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+            .filter(Project.id.in_(project_ids))
         )
+        return self._paginate(query, skip, limit, cursor)
+
+    def _paginate(self, query, skip: int, limit: int, cursor: str | None) -> list[Project]:
+        query = query.order_by(*LISTING_ORDER)
+        if cursor:
+            query = query.filter(after_cursor(cursor))
+        else:
+            query = query.offset(skip)
+        return query.limit(limit).all()
 
     def create(self, project_data: ProjectCreate, created_by: int) -> Project:
         project = Project(
@@ -76,6 +136,10 @@ class ProjectService:
             created_by=created_by
         )
         self.db.add(project)
+        self.db.flush()
+        stats = StatsDelta()
+        stats.project_created(project.id, project.status)
+        stats.apply(self.db)
         self.db.commit()
         self.db.refresh(project)
         return project
@@ -85,50 +149,52 @@ class ProjectService:
         if not project:
             return None
 
+        old_status = project.status
         update_data = project_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(project, field, value)
 
+        stats = StatsDelta()
+        stats.project_status_changed(old_status, project.status)
+        stats.apply(self.db)
         self.db.commit()
-        self.db.refresh(project)
-        return project
+        # Reload with the creator in one query rather than refresh plus a lazy load
+        return (
+            self.db.query(Project)
+            .options(joinedload(Project.creator))
+            .filter(Project.id == project_id)
+            .first()
+        )
 
     def delete(self, project_id: int) -> bool:
         project = self.db.query(Project).filter(Project.id == project_id).first()
         if not project:
             return False
+        member_ids = [
+            user_id for (user_id,) in
+            self.db.query(ProjectMember.user_id).filter(ProjectMember.project_id == project_id)
+        ]
+        uploads = {
+            user_id: (count, size) for user_id, count, size in
+            self.db.query(File.uploaded_by, func.count(File.id), func.coalesce(func.sum(File.size), 0))
+            .filter(File.project_id == project_id)
+            .group_by(File.uploaded_by)
+        }
+        stats = StatsDelta()
+        stats.project_deleted(project_id, project.status, member_ids, uploads)
         self.db.delete(project)
+        stats.apply(self.db)
         self.db.commit()
+
+        acl = get_project_acl()
+        for user_id in member_ids:
+            acl.remove(user_id, project_id)
         return True
 
-    def add_member(self, project_id: int, member_data: ProjectMemberCreate) -> ProjectMember | None:
-        """Add a team member to a project"""
-        # Check if user is already a member
-        existing = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == member_data.user_id
-            )
-            .first()
-        )
-
-        if existing:
-            # Update role if already exists
-            existing.role = member_data.role
-            self.db.commit()
-            self.db.refresh(existing)
-            return existing
-
-        member = ProjectMember(
-            project_id=project_id,
-            user_id=member_data.user_id,
-            role=member_data.role
-        )
-        self.db.add(member)
-        self.db.commit()
-        self.db.refresh(member)
-        return member
+    def add_member(self, project_id: int, member_data: ProjectMemberCreate) -> dict | None:
+        """Add a team member to a project, or update their role (one upsert)"""
+        self.write_memberships({(project_id, member_data.user_id): member_data.role})
+        return self.get_project_member(project_id, member_data.user_id)
 
     def remove_member(self, project_id: int, user_id: int) -> bool:
         """Remove a team member from a project"""
@@ -144,8 +210,12 @@ class ProjectService:
         if not member:
             return False
 
+        stats = StatsDelta()
+        stats.member_removed(project_id, user_id)
         self.db.delete(member)
+        stats.apply(self.db)
         self.db.commit()
+        get_project_acl().remove(user_id, project_id)
         return True
 
     def get_project_members(self, project_id: int) -> list[dict]:
@@ -156,66 +226,120 @@ class ProjectService:
             .filter(ProjectMember.project_id == project_id)
             .all()
         )
+        return [_member_to_dict(m) for m in members]
 
-        return [
-            {
-                "id": m.id,
-                "user_id": m.user_id,
-                "role": m.role,
-                "user_email": m.user.email,
-                "user_full_name": m.user.full_name,
-                "created_at": m.created_at
-            }
-            for m in members
-        ]
+    def get_project_member(self, project_id: int, user_id: int) -> dict | None:
+        """Get one member of a project with user details"""
+        member = (
+            self.db.query(ProjectMember)
+            .options(joinedload(ProjectMember.user))
+            .filter(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+            .first()
+        )
+        return _member_to_dict(member) if member else None
 
-    def assign_team(self, project_id: int, members: list[ProjectMemberCreate]) -> list[ProjectMember]:
-        """Assign a team to a project (replaces existing members)"""
-        # Remove existing members
-        self.db.query(ProjectMember).filter(
-            ProjectMember.project_id == project_id
-        ).delete()
-
-        # Add new members
-        new_members = []
-        for member_data in members:
-            member = ProjectMember(
-                project_id=project_id,
-                user_id=member_data.user_id,
-                role=member_data.role
-            )
-            self.db.add(member)
-            new_members.append(member)
+    def assign_team(self, project_id: int, members: list[ProjectMemberCreate]) -> MembershipChanges:
+        """Assign a team to a project (replaces existing members, touching only changed rows)"""
+        desired = {(project_id, m.user_id): m.role for m in members}
+        return self.write_memberships(desired, replace_projects=[project_id])
 
-        self.db.commit()
+    def assign_members(self, project_ids: list[int], members: list[ProjectMemberCreate]) -> MembershipChanges:
+        """Add the same members to many projects at once, updating existing roles"""
+        desired = {(project_id, m.user_id): m.role for project_id in project_ids for m in members}
+        return self.write_memberships(desired)
 
-        for m in new_members:
-            self.db.refresh(m)
+    def missing_references(self, project_ids: list[int], user_ids: list[int]) -> dict[str, list[int]]:
+        """Project and user ids that do not exist"""
+        found_projects = {
+            project_id for (project_id,) in
+            self.db.query(Project.id).filter(Project.id.in_(list(set(project_ids))))
+        }
+        found_users = {
+            user_id for (user_id,) in
+            self.db.query(User.id).filter(User.id.in_(list(set(user_ids))))
+        }
+        return {
+            "projects": sorted(set(project_ids) - found_projects),
+            "users": sorted(set(user_ids) - found_users),
+        }
 
-        return new_members
+    def write_memberships(
+        self,
+        desired: dict[tuple[int, int], ProjectRole],
+        replace_projects: list[int] | None = None
+    ) -> MembershipChanges:
+        """
+        Make memberships match `desired` ((project id, user id) -> role) with
+        set-based statements: one query for the current rows, a multi-row
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING for new and changed
+        rows, and one DELETE. With `replace_projects`, members of those
+        projects missing from `desired` are removed. Commits.
+        """
+        changes = MembershipChanges()
+        query = self.db.query(ProjectMember.project_id, ProjectMember.user_id, ProjectMember.role)
+        if replace_projects:
+            query = query.filter(ProjectMember.project_id.in_(replace_projects))
+        elif desired:
+            query = query.filter(
+                ProjectMember.project_id.in_(list({project_id for project_id, _ in desired})),
+                ProjectMember.user_id.in_(list({user_id for _, user_id in desired}))
+            )
+        else:
+            return changes
+        current = {(project_id, user_id): role for project_id, user_id, role in query}
 
-    def get_file_count(self, project_id: int) -> int:
-        """Get the number of files in a project"""
-        return self.db.query(func.count(File.id)).filter(File.project_id == project_id).scalar()
+        now = datetime.utcnow()
+        writes = []
+        for (project_id, user_id), role in desired.items():
+            if current.get((project_id, user_id)) == role:
+                changes.unchanged += 1
+            else:
+                writes.append({"project_id": project_id, "user_id": user_id, "role": role,
+                               "created_at": now, "updated_at": now})
 
-    def get_statistics(self) -> dict:
-        """Get project statistics for dashboard"""
-        total = self.db.query(func.count(Project.id)).scalar()
+        insert = dialect_insert(self.db.get_bind().dialect.name)
+        for batch in _batches(writes):
+            stmt = insert(ProjectMember).values(batch)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ProjectMember.project_id, ProjectMember.user_id],
+                set_={"role": stmt.excluded.role, "updated_at": stmt.excluded.updated_at}
+            ).returning(ProjectMember.id, ProjectMember.project_id, ProjectMember.user_id, ProjectMember.role)
+            for row in self.db.execute(stmt):
+                if (row.project_id, row.user_id) in current:
+                    changes.updated.append(row)
+                else:
+                    changes.added.append(row)
 
-        by_status = (
-            self.db.query(Project.status, func.count(Project.id))
-            .group_by(Project.status)
-            .all()
+        if replace_projects:
+            changes.removed = [key for key in current if key not in desired]
+        for batch in _batches(changes.removed):
+            self.db.execute(
+                delete(ProjectMember)
+                .where(tuple_(ProjectMember.project_id, ProjectMember.user_id).in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+
+        stats = StatsDelta()
+        for row in changes.added:
+            stats.member_added(row.project_id, row.user_id)
+        for project_id, user_id in changes.removed:
+            stats.member_removed(project_id, user_id)
+        stats.apply(self.db)
+        self.db.commit()
+
+        get_project_acl().apply_changes(
+            [(row.user_id, row.project_id, row.role) for row in changes.added + changes.updated]
+            + [(user_id, project_id, None) for project_id, user_id in changes.removed]
         )
+        return changes
 
-        status_counts = {status.value: 0 for status in ProjectStatus}
-        for status, count in by_status:
-            status_counts[status.value] = count
+    def get_file_count(self, project_id: int) -> int:
+        """Get the number of files in a project"""
+        count = self.db.query(ProjectStats.file_count).filter(ProjectStats.project_id == project_id).scalar()
+        if count is None:
+            count = self.db.query(func.count(File.id)).filter(File.project_id == project_id).scalar()
+        return count
 
-        return {
-            "total": total,
-            "draft": status_counts.get("draft", 0),
-            "in_progress": status_counts.get("in_progress", 0),
-            "under_review": status_counts.get("under_review", 0),
-            "completed": status_counts.get("completed", 0)
-        }
+    def get_statistics(self) -> dict:
+        """Get project statistics for dashboard from the maintained counters"""
+        return StatsService(self.db).get_dashboard()
@@ -0,0 +1,337 @@
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from sqlalchemy import select, func, delete, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.db_routing import replica_reads
+from app.database import SessionLocal, dialect_insert
+from app.models import Project, ProjectMember, File, User, StatCounter, ProjectStats, UserStats
+from app.models.enums import ProjectStatus
+
+logger = logging.getLogger(__name__)
+
+PROJECT_FIELDS = ("file_count", "storage_bytes", "member_count")
+USER_FIELDS = ("project_count", "file_count", "storage_bytes")
+
+FILES_COUNT = "files.count"
+FILES_BYTES = "files.bytes"
+MEMBERS_COUNT = "members.count"
+
+# Rows per multi-row upsert
+STATS_BATCH = 500
+
+# Postgres advisory lock key so only one worker reconciles at a time
+RECONCILE_LOCK_KEY = 4207
+
+
+def status_counter(status: ProjectStatus | str) -> str:
+    return f"projects.{ProjectStatus(status).value}"
+
+
+class StatsDelta:
+    """
+    Changes to the summary tables made by one transaction.
+
+    Write paths record what they changed and apply the delta before
+    committing, so counters commit or roll back together with the data.
+    Rows are updated with relative upserts (value = value + delta), which
+    keep concurrent writers from overwriting each other.
+    """
+
+    def __init__(self):
+        self.counters: Counter[str] = Counter()
+        self.projects: dict[int, Counter] = defaultdict(Counter)
+        self.users: dict[int, Counter] = defaultdict(Counter)
+        self.dropped_projects: set[int] = set()
+
+    def project_created(self, project_id: int, status: ProjectStatus):
+        self.counters[status_counter(status)] += 1
+        self.projects[project_id]  # creates the project's row
+
+    def project_status_changed(self, old: ProjectStatus, new: ProjectStatus):
+        if ProjectStatus(old) != ProjectStatus(new):
+            self.counters[status_counter(old)] -= 1
+            self.counters[status_counter(new)] += 1
+
+    def project_deleted(
+        self,
+        project_id: int,
+        status: ProjectStatus,
+        member_ids: list[int],
+        uploads: dict[int, tuple[int, int]]
+    ):
+        """`uploads` maps uploader id to (file count, bytes) of the deleted project's files"""
+        self.counters[status_counter(status)] -= 1
+        for user_id in member_ids:
+            self.member_removed(project_id, user_id)
+        for user_id, (count, size) in uploads.items():
+            self.counters[FILES_COUNT] -= count
+            self.counters[FILES_BYTES] -= size
+            self.users[user_id]["file_count"] -= count
+            self.users[user_id]["storage_bytes"] -= size
+        self.dropped_projects.add(project_id)
+
+    def file_added(self, project_id: int, user_id: int, size: int):
+        self._file(project_id, user_id, 1, size)
+
+    def file_resized(self, project_id: int, user_id: int, size_delta: int):
+        self._file(project_id, user_id, 0, size_delta)
+
+    def file_removed(self, project_id: int, user_id: int, size: int):
+        self._file(project_id, user_id, -1, -size)
+
+    def _file(self, project_id: int, user_id: int, count: int, size: int):
+        self.counters[FILES_COUNT] += count
+        self.counters[FILES_BYTES] += size
+        self.projects[project_id]["file_count"] += count
+        self.projects[project_id]["storage_bytes"] += size
+        self.users[user_id]["file_count"] += count
+        self.users[user_id]["storage_bytes"] += size
+
+    def member_added(self, project_id: int, user_id: int):
+        self._member(project_id, user_id, 1)
+
+    def member_removed(self, project_id: int, user_id: int):
+        self._member(project_id, user_id, -1)
+
+    def user_deleted(self, user_id: int, project_ids: list[int]):
+        """The user's own row goes with the user (ON DELETE CASCADE)"""
+        for project_id in project_ids:
+            self.counters[MEMBERS_COUNT] -= 1
+            self.projects[project_id]["member_count"] -= 1
+        self.users.pop(user_id, None)
+
+    def _member(self, project_id: int, user_id: int, delta: int):
+        self.counters[MEMBERS_COUNT] += delta
+        self.projects[project_id]["member_count"] += delta
+        self.users[user_id]["project_count"] += delta
+
+    def statements(self, dialect_name: str) -> list:
+        """One multi-row upsert per table (per STATS_BATCH rows), in primary key order"""
+        insert = dialect_insert(dialect_name)
+        statements = []
+
+        counters = [{"name": name, "value": delta} for name, delta in sorted(self.counters.items()) if delta]
+        for start in range(0, len(counters), STATS_BATCH):
+            stmt = insert(StatCounter).values(counters[start:start + STATS_BATCH])
+            statements.append(stmt.on_conflict_do_update(
+                index_elements=[StatCounter.name],
+                set_={"value": StatCounter.value + stmt.excluded.value}
+            ))
+
+        for model, key, fields, deltas in (
+            (ProjectStats, ProjectStats.project_id, PROJECT_FIELDS, self.projects),
+            (UserStats, UserStats.user_id, USER_FIELDS, self.users),
+        ):
+            rows = [
+                {key.key: row_id, **{f: row[f] for f in fields}}
+                for row_id, row in sorted(deltas.items())
+                if not (model is ProjectStats and row_id in self.dropped_projects)
+            ]
+            for start in range(0, len(rows), STATS_BATCH):
+                stmt = insert(model).values(rows[start:start + STATS_BATCH])
+                statements.append(stmt.on_conflict_do_update(
+                    index_elements=[key],
+                    set_={f: getattr(model, f) + stmt.excluded[f] for f in fields}
+                ))
+
+        if self.dropped_projects:
+            statements.append(
+                delete(ProjectStats).where(ProjectStats.project_id.in_(self.dropped_projects))
+            )
+        return statements
+
+    def apply(self, db: Session):
+        """Apply within the caller's transaction; the caller commits"""
+        for statement in self.statements(db.get_bind().dialect.name):
+            db.execute(statement)
+
+    async def apply_async(self, db):
+        """apply() for an AsyncSession"""
+        for statement in self.statements(db.get_bind().dialect.name):
+            await db.execute(statement)
+
+
+class StatsService:
+    """Reads and reconciles the dashboard summary tables"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @replica_reads
+    def get_counters(self) -> dict[str, int]:
+        return self._counters()
+
+    def _counters(self) -> dict[str, int]:
+        return dict(self.db.execute(select(StatCounter.name, StatCounter.value)).all())
+
+    def get_dashboard(self) -> dict:
+        """Project counts per status and global file, storage and membership totals"""
+        counters = self.get_counters()
+        by_status = {status.value: counters.get(status_counter(status), 0) for status in ProjectStatus}
+        return {
+            "total": sum(by_status.values()),
+            **by_status,
+            "files": counters.get(FILES_COUNT, 0),
+            "storage_bytes": counters.get(FILES_BYTES, 0),
+            "memberships": counters.get(MEMBERS_COUNT, 0),
+        }
+
+    @replica_reads
+    def get_project_stats(self, project_id: int) -> ProjectStats | None:
+        return self.db.get(ProjectStats, project_id)
+
+    @replica_reads
+    def get_storage_by_project(self, limit: int = 20) -> list[dict]:
+        """Projects using the most storage"""
+        rows = self.db.execute(
+            select(ProjectStats, Project.name)
+            .join(Project, Project.id == ProjectStats.project_id)
+            .order_by(ProjectStats.storage_bytes.desc())
+            .limit(limit)
+        ).all()
+        return [
+            {
+                "project_id": stats.project_id,
+                "project_name": name,
+                "file_count": stats.file_count,
+                "storage_bytes": stats.storage_bytes,
+                "member_count": stats.member_count,
+            }
+            for stats, name in rows
+        ]
+
+    @replica_reads
+    def get_member_totals(self, skip: int = 0, limit: int = 100) -> list[dict]:
+        """Per-user project memberships and uploads"""
+        rows = self.db.execute(
+            select(UserStats, User.email, User.full_name)
+            .join(User, User.id == UserStats.user_id)
+            .order_by(UserStats.user_id)
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        return [
+            {
+                "user_id": stats.user_id,
+                "user_email": email,
+                "user_full_name": full_name,
+                "project_count": stats.project_count,
+                "file_count": stats.file_count,
+                "storage_bytes": stats.storage_bytes,
+            }
+            for stats, email, full_name in rows
+        ]
+
+    def reconcile(self) -> dict[str, int] | None:
+        """
+        Recompute every summary row from the base tables and fix the ones
+        that drifted. Returns the number of corrected rows per table, or
+        None if another worker holds the reconciliation lock. Writes that
+        race with a run are corrected by the next one.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            locked = self.db.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+            )
+            if not locked:
+                return None
+
+        # Expected values
+        counters = {status_counter(status): 0 for status in ProjectStatus}
+        for status, count in self.db.execute(select(Project.status, func.count()).group_by(Project.status)):
+            counters[status_counter(status)] = count
+        file_count, file_bytes = self.db.execute(
+            select(func.count(File.id), func.coalesce(func.sum(File.size), 0))
+        ).one()
+        counters[FILES_COUNT] = file_count
+        counters[FILES_BYTES] = file_bytes
+        counters[MEMBERS_COUNT] = self.db.scalar(select(func.count(ProjectMember.id)))
+
+        projects = {project_id: dict.fromkeys(PROJECT_FIELDS, 0) for (project_id,) in self.db.execute(select(Project.id))}
+        users: dict[int, dict] = defaultdict(lambda: dict.fromkeys(USER_FIELDS, 0))
+        for project_id, count, size in self.db.execute(
+            select(File.project_id, func.count(), func.coalesce(func.sum(File.size), 0)).group_by(File.project_id)
+        ):
+            projects[project_id].update(file_count=count, storage_bytes=size)
+        for project_id, count in self.db.execute(
+            select(ProjectMember.project_id, func.count()).group_by(ProjectMember.project_id)
+        ):
+            projects[project_id]["member_count"] = count
+        for user_id, count, size in self.db.execute(
+            select(File.uploaded_by, func.count(), func.coalesce(func.sum(File.size), 0)).group_by(File.uploaded_by)
+        ):
+            users[user_id].update(file_count=count, storage_bytes=size)
+        for user_id, count in self.db.execute(
+            select(ProjectMember.user_id, func.count()).group_by(ProjectMember.user_id)
+        ):
+            users[user_id]["project_count"] = count
+
+        # Diff against the stored rows and write only what changed
+        insert = dialect_insert(dialect)
+        drift = {"counters": 0, "projects": 0, "users": 0}
+
+        stored = self._counters()
+        changed = [{"name": k, "value": v} for k, v in counters.items() if stored.get(k, 0) != v]
+        if changed:
+            stmt = insert(StatCounter)
+            self.db.execute(
+                stmt.on_conflict_do_update(index_elements=[StatCounter.name], set_={"value": stmt.excluded.value}),
+                changed
+            )
+        drift["counters"] = len(changed)
+
+        for label, model, key, fields, expected in (
+            ("projects", ProjectStats, ProjectStats.project_id, PROJECT_FIELDS, projects),
+            ("users", UserStats, UserStats.user_id, USER_FIELDS, users),
+        ):
+            current = {
+                row[0]: dict(zip(fields, row[1:]))
+                for row in self.db.execute(select(key, *(getattr(model, f) for f in fields)))
+            }
+            zero = dict.fromkeys(fields, 0)
+            changed = [
+                {key.key: row_id, **values}
+                for row_id, values in expected.items()
+                if current.get(row_id, zero) != values
+            ]
+            # Rows of deleted projects go away; users with no activity left are zeroed
+            stale = [row_id for row_id in current if row_id not in expected]
+            if model is UserStats:
+                changed.extend({key.key: row_id, **zero} for row_id in stale if current[row_id] != zero)
+                stale = []
+            if changed:
+                stmt = insert(model)
+                self.db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[key],
+                        set_={f: stmt.excluded[f] for f in fields}
+                    ),
+                    changed
+                )
+            if stale:
+                self.db.execute(delete(model).where(key.in_(stale)))
+            drift[label] = len(changed) + len(stale)
+
+        self.db.commit()
+        return drift
+
+
+def _reconcile_once() -> dict[str, int] | None:
+    with SessionLocal() as db:
+        return StatsService(db).reconcile()
+
+
+async def reconcile_stats_periodically(interval: float):
+    """Background task: reconcile the summary tables every `interval` seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            drift = await run_in_threadpool(_reconcile_once)
+        except Exception:
+            logger.exception("Statistics reconciliation failed")
+            continue
+        if drift and any(drift.values()):
+            logger.warning("Statistics drift corrected: %s", drift)
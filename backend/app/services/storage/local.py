@@ -4,6 +4,13 @@ from pathlib import Path
 from typing import List
 from app.services.storage.base import BaseStorage
 from app.config import get_settings
+from app.core.metrics import STORAGE_BYTES, STORAGE_OPERATION_SECONDS
+
+_SAVE_SECONDS = STORAGE_OPERATION_SECONDS.labels("save")
+_READ_SECONDS = STORAGE_OPERATION_SECONDS.labels("read")
+_DELETE_SECONDS = STORAGE_OPERATION_SECONDS.labels("delete")
+_BYTES_WRITTEN = STORAGE_BYTES.labels("write")
+_BYTES_READ = STORAGE_BYTES.labels("read")
 
 
 class LocalStorage(BaseStorage):
@@ -25,33 +32,40 @@ class LocalStorage(BaseStorage):
         """Save file to local filesystem"""
         full_path = self._full_path(path)
 
-        # Create parent directories if needed
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        with _SAVE_SECONDS.time():
+            # Create parent directories if needed
+            full_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(full_path, 'wb') as f:
-            f.write(file_data)
+            with open(full_path, 'wb') as f:
+                f.write(file_data)
 
+        _BYTES_WRITTEN.inc(len(file_data))
         return path
 
     def read(self, path: str) -> bytes:
         """Read file from local filesystem"""
         full_path = self._full_path(path)
 
-        if not full_path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
+        with _READ_SECONDS.time():
+            if not full_path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+
+            with open(full_path, 'rb') as f:
+                data = f.read()
 
-        with open(full_path, 'rb') as f:
-            return f.read()
+        _BYTES_READ.inc(len(data))
+        return data
 
     def delete(self, path: str) -> bool:
         """Delete file from local filesystem"""
         full_path = self._full_path(path)
 
-        if not full_path.exists():
-            return False
+        with _DELETE_SECONDS.time():
+            if not full_path.exists():
+                return False
 
-        full_path.unlink()
-        return True
+            full_path.unlink()
+            return True
 
     def exists(self, path: str) -> bool:
         """Check if file exists in local filesystem"""
@@ -1,7 +1,12 @@
-from sqlalchemy.orm import Session
-from app.models import User, Role, RoleName
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from starlette.concurrency import run_in_threadpool
+from app.models import User, Role, RoleName, ProjectMember
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_and_update_password
+from app.core.hashing import get_password_hasher
+from app.core.acl import invalidate_user_acl
+from app.core.principal_cache import get_principal_cache, invalidate_principal
+from app.services.stats_service import StatsDelta
 
 
 class UserService:
@@ -9,37 +14,79 @@ class UserService:
         self.db = db
 
     def get_by_id(self, user_id: int) -> User | None:
-        return self.db.query(User).filter(User.id == user_id).first()
+        return (
+            self.db.query(User)
+            .options(joinedload(User.role))
+            .filter(User.id == user_id)
+            .first()
+        )
+
+    def get_principal(self, user_id: int) -> User | None:
+        """
+        Get a user with their role for authentication, served from the
+        principal cache when possible. The returned instance is detached
+        from the session and must be treated as read-only.
+        """
+        cache = get_principal_cache()
+        user = cache.get(user_id)
+        if user is not None:
+            return user
+
+        # Read from the primary so a lagging replica never ends up in the cache
+        user = (
+            self.db.query(User)
+            .options(joinedload(User.role))
+            .filter(User.id == user_id)
+            .execution_options(use_primary=True)
+            .first()
+        )
+        if user is not None:
+            # Detach the role too, so later commits in this session never expire it
+            if user.role is not None:
+                self.db.expunge(user.role)
+            self.db.expunge(user)
+            cache.set(user)
+        return user
 
     def get_by_email(self, email: str) -> User | None:
         return self.db.query(User).filter(User.email == email).first()
 
     def get_all(self, skip: int = 0, limit: int = 100) -> list[User]:
-        return self.db.query(User).offset(skip).limit(limit).all()
+        return (
+            self.db.query(User)
+            .options(joinedload(User.role))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
     def get_by_role(self, role_name: RoleName) -> list[User]:
         return (
             self.db.query(User)
             .join(Role)
+            .options(contains_eager(User.role))
             .filter(Role.name == role_name.value)
             .all()
         )
 
-    def create(self, user_data: UserCreate) -> User:
+    def create(self, user_data: UserCreate, hashed_password: str | None = None) -> User:
+        """Create a user; pass `hashed_password` when it was already hashed off-thread"""
         role = self.db.query(Role).filter(Role.name == user_data.role_name.value).first()
         if not role:
             raise ValueError(f"Role {user_data.role_name} not found")
 
         user = User(
             email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
+            hashed_password=hashed_password or get_password_hash(user_data.password),
             full_name=user_data.full_name,
             role_id=role.id
         )
         self.db.add(user)
+        self.db.flush()
+        user_id = user.id
         self.db.commit()
-        self.db.refresh(user)
-        return user
+        # Reload with the role in one query rather than refresh plus a lazy load
+        return self.get_by_id(user_id)
 
     def update(self, user_id: int, user_data: UserUpdate) -> User | None:
         user = self.get_by_id(user_id)
@@ -58,21 +105,71 @@ class UserService:
             setattr(user, field, value)
 
         self.db.commit()
-        self.db.refresh(user)
-        return user
+        invalidate_principal(user_id)
+        return self.get_by_id(user_id)
 
     def delete(self, user_id: int) -> bool:
         user = self.get_by_id(user_id)
         if not user:
             return False
+        project_ids = [
+            project_id for (project_id,) in
+            self.db.query(ProjectMember.project_id).filter(ProjectMember.user_id == user_id)
+        ]
+        stats = StatsDelta()
+        stats.user_deleted(user_id, project_ids)
+        stats.apply(self.db)
         self.db.delete(user)
         self.db.commit()
+        invalidate_principal(user_id)
+        invalidate_user_acl(user_id)
         return True
 
     def authenticate(self, email: str, password: str) -> User | None:
         user = self.get_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not valid:
             return None
+        if new_hash:
+            self._update_password_hash(user, new_hash)
+        return user
+
+    async def authenticate_async(self, email: str, password: str) -> User | None:
+        """
+        Authenticate without blocking the event loop: queries run on the
+        threadpool and bcrypt runs on the dedicated password hasher. No
+        pooled connection is held while the hash is computed.
+        Raises HashingOverloaded when the hasher queue is full.
+        """
+        user = await run_in_threadpool(self._get_detached_by_email, email)
+        if not user:
+            return None
+        valid, new_hash = await get_password_hasher().verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            await run_in_threadpool(self._store_password_hash, user.id, new_hash)
+        return user
+
+    def _get_detached_by_email(self, email: str) -> User | None:
+        """Load a user, detach it and return the connection to the pool"""
+        user = self.get_by_email(email)
+        if user is not None:
+            self.db.expunge(user)
+        self.db.rollback()
         return user
+
+    def _store_password_hash(self, user_id: int, new_hash: str):
+        """Store a re-hashed password for a detached user"""
+        self.db.query(User).filter(User.id == user_id).update({User.hashed_password: new_hash})
+        self.db.commit()
+        invalidate_principal(user_id)
+
+    def _update_password_hash(self, user: User, new_hash: str):
+        """Store a re-hashed password, e.g. after the bcrypt cost changed"""
+        user.hashed_password = new_hash
+        self.db.commit()
+        self.db.refresh(user)
+        invalidate_principal(user.id)
@@ -0,0 +1,40 @@
+"""
+Pytest plugin enforcing per-endpoint SQL query budgets.
+
+Enable it from a conftest.py:
+
+    pytest_plugins = ["app.testing.query_budget"]
+
+and wrap the request under test:
+
+    def test_list_files_budget(client, auth_headers, query_budget):
+        with query_budget(2):
+            client.get("/api/projects/1/files", headers=auth_headers)
+
+The block fails when it issues more queries than budgeted, listing each
+statement with its repeat count so N+1 patterns stand out. Queries are
+counted process-wide, so this works with TestClient, whose app runs on
+another thread.
+"""
+from contextlib import contextmanager
+import pytest
+from app.core.query_stats import count_queries
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block runs more queries than its budget"""
+
+
+@contextmanager
+def assert_max_queries(budget: int):
+    """Fail if the block runs more than `budget` SQL queries"""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > budget:
+        raise QueryBudgetExceeded(f"Query budget of {budget} exceeded: {stats.summary()}")
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager factory: `with query_budget(n): ...`"""
+    return assert_max_queries
@@ -0,0 +1,186 @@
+"""
+Query plan audit: EXPLAIN every SELECT the service layer's read paths
+issue and flag full scans of application tables (Postgres "Seq Scan",
+SQLite "SCAN <table>" without an index). Used by
+scripts/query_plan_audit.py and the test suite.
+"""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import event, func, insert, select, text
+from app.database import Base, engine, reader_engine, replica_engines
+from app.db.seed import run_seeds
+from app.models import File, Project, ProjectMember, Role, RoleName, User
+from app.models.enums import ProjectRole, ProjectStatus, STATUS_PRIORITY
+from app.core.permissions import ProjectAccessResolver
+from app.core.principal_cache import get_principal_cache
+from app.core.acl import get_project_acl
+from app.services.project_service import ProjectService
+from app.services.file_service import FileService
+from app.services.user_service import UserService
+
+BATCH = 5000
+
+# Lookup tables of a handful of rows, read whole by design
+SMALL_TABLES = ("roles", "stat_counters")
+
+
+def seed(db, users: int, projects: int, files: int, members_per_project: int):
+    """Bulk-insert synthetic rows; passwords are placeholders, not valid hashes"""
+    run_seeds(db)
+    writer_role = db.scalar(select(Role.id).where(Role.name == RoleName.WRITER.value))
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    first_user = (db.scalar(select(func.max(User.id))) or 0) + 1
+    first_project = (db.scalar(select(func.max(Project.id))) or 0) + 1
+
+    def chunks(rows):
+        for start in range(0, len(rows), BATCH):
+            yield rows[start:start + BATCH]
+
+    user_rows = [
+        {"id": first_user + i, "email": f"audit{first_user + i}@example.com", "hashed_password": "x",
+         "full_name": f"Audit User {i}", "role_id": writer_role, "is_active": True,
+         "created_at": now, "updated_at": now}
+        for i in range(users)
+    ]
+    for chunk in chunks(user_rows):
+        db.execute(insert(User), chunk)
+    user_ids = [row["id"] for row in user_rows]
+
+    statuses = list(ProjectStatus)
+    project_rows = []
+    for i in range(projects):
+        created = now - timedelta(minutes=rng.randrange(525600))
+        status = rng.choice(statuses)
+        project_rows.append({
+            "id": first_project + i, "name": f"Audit Project {i}", "description": None,
+            "status": status, "status_priority": STATUS_PRIORITY[status], "word_count": 0,
+            "created_by": rng.choice(user_ids), "created_at": created, "updated_at": created,
+        })
+    for chunk in chunks(project_rows):
+        db.execute(insert(Project), chunk)
+    project_ids = [row["id"] for row in project_rows]
+
+    member_rows = []
+    for project_id in project_ids:
+        for user_id in rng.sample(user_ids, min(members_per_project, len(user_ids))):
+            member_rows.append({"project_id": project_id, "user_id": user_id,
+                                "role": rng.choice(list(ProjectRole)), "created_at": now, "updated_at": now})
+    for chunk in chunks(member_rows):
+        db.execute(insert(ProjectMember), chunk)
+
+    file_rows = []
+    for i in range(files):
+        project_id = rng.choice(project_ids)
+        file_rows.append({
+            "project_id": project_id, "filename": f"f{i}.md", "original_filename": f"f{i}.md",
+            "storage_path": f"projects/{project_id}/f{i}.md", "content_type": "text/markdown",
+            "size": rng.randrange(100, 100_000), "uploaded_by": rng.choice(user_ids), "version": 0,
+            "created_at": now, "updated_at": now,
+        })
+    for chunk in chunks(file_rows):
+        db.execute(insert(File), chunk)
+
+    db.commit()
+    # Refresh planner statistics for the new rows
+    db.execute(text("ANALYZE"))
+    db.commit()
+
+
+def exercise_services(db):
+    """Call the read paths of the service layer with representative arguments"""
+    admin = db.scalar(select(User).where(User.email == "admin@example.com"))
+    member = db.execute(
+        select(ProjectMember.user_id, ProjectMember.project_id).limit(1)
+    ).first()
+    project_id = member.project_id if member else db.scalar(select(func.min(Project.id)))
+    file_id = db.scalar(select(func.min(File.id)).where(File.project_id == project_id))
+
+    # Start cold so cached lookups hit the database
+    get_principal_cache().invalidate(None)
+    get_project_acl().invalidate(None)
+
+    users = UserService(db)
+    projects = ProjectService(db)
+    files = FileService(db)
+
+    users.get_by_email("admin@example.com")
+    users.get_by_role(RoleName.WRITER)
+    projects.get_user_projects(admin)
+    projects.get_by_id(project_id)
+    projects.get_project_members(project_id)
+    projects.get_file_count(project_id)
+    projects.get_statistics()
+    files.get_project_files(project_id)
+    if file_id:
+        files.get_by_id(file_id)
+
+    if member:
+        writer = users.get_principal(member.user_id)
+        projects.get_user_projects(writer)
+        ProjectAccessResolver(writer, db).resolve(project_id)
+        db.execute(select(File.id).where(File.uploaded_by == member.user_id).limit(1))
+        db.execute(select(Project.id).where(Project.created_by == member.user_id).limit(1))
+
+
+def explain(connection, statement: str, parameters) -> list[str]:
+    cursor = connection.connection.cursor()
+    try:
+        if engine.dialect.name == "postgresql":
+            cursor.execute("EXPLAIN " + statement, parameters)
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def full_scans(plan: list[str], ignored: set[str]) -> list[str]:
+    """Plan lines that scan a whole application table (subqueries are skipped)"""
+    flagged = []
+    for line in plan:
+        detail = line.strip().lstrip("-> ").strip()
+        if engine.dialect.name == "postgresql":
+            if not detail.startswith("Seq Scan on "):
+                continue
+            table = detail.split()[3]
+        else:
+            if not detail.startswith("SCAN ") or "USING" in detail:
+                continue
+            table = detail.split()[1]
+        if table in Base.metadata.tables and table not in ignored:
+            flagged.append(detail)
+    return flagged
+
+
+def audit(db, ignored: set[str]) -> list[dict]:
+    """Run the read paths, then EXPLAIN each distinct SELECT they issued"""
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    # Reads may go to replicas or, in embedded SQLite mode, the reader engine
+    engines = [engine, *replica_engines] + ([reader_engine] if reader_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", capture)
+    try:
+        exercise_services(db)
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", capture)
+
+    report, seen = [], set()
+    with engine.connect() as connection:
+        for statement, parameters in captured:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            plan = explain(connection, statement, parameters)
+            report.append({
+                "statement": " ".join(statement.split()),
+                "full_scans": full_scans(plan, ignored),
+                "plan": plan,
+            })
+    return report
@@ -0,0 +1,15 @@
+"""
+Benchmark suite
+
+Seeds a synthetic dataset at production-like volumes and measures the
+service layer and the HTTP API against it, fully offline (FakeLLM and
+local storage). Run from the backend directory against DATABASE_URL:
+
+    python -m benchmarks.dataset --scale 0.01          # 100 users, 500 projects, 10k files
+    python -m benchmarks.dataset                        # 10k users, 50k projects, 1M files
+    python -m benchmarks.run --output benchmarks/results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json
+
+Results are JSON: throughput and p50/p95/p99 latency per scenario, with
+the commit, database backend and dataset size they were measured on.
+"""
@@ -0,0 +1,56 @@
+import os
+import subprocess
+from pathlib import Path
+
+BACKEND = Path(__file__).parent.parent
+
+# Every generated user has an email on this domain and the same password
+BENCH_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "bench-password"
+
+# Offline, unthrottled defaults; anything already set in the environment wins
+OFFLINE_ENV = {
+    "SECRET_KEY": "benchmark-secret-key",
+    "LLM_PROVIDER": "fake",
+    "FAKE_LLM_LATENCY": "zero",
+    "RATE_LIMIT_ENABLED": "false",
+    "BCRYPT_ROUNDS": "4",
+    "STATS_RECONCILE_INTERVAL": "0",
+}
+
+
+def configure_environment():
+    """Apply OFFLINE_ENV; call before anything imports app.config"""
+    for name, value in OFFLINE_ENV.items():
+        os.environ.setdefault(name, value)
+
+
+def percentiles(values: list[float]) -> dict:
+    """p50/p95/p99/max in milliseconds"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return round(ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)] * 1000, 3)
+
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99), "max_ms": round(ordered[-1] * 1000, 3)}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def git_dirty() -> bool | None:
+    try:
+        return bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None
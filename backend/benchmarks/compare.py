@@ -0,0 +1,77 @@
+"""
+Compare two benchmark reports
+
+Prints, per mode and scenario, the change in throughput and p50/p95/p99
+latency from BASE to HEAD in percent, and exits 1 when any scenario lost
+more than --threshold percent of its throughput or gained that much p95
+latency, or started failing:
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --threshold 10
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+LATENCIES = ["p50_ms", "p95_ms", "p99_ms"]
+
+
+def _change(base: float | None, head: float | None) -> float | None:
+    if not base or head is None:
+        return None
+    return round((head - base) / base * 100, 1)
+
+
+def compare(base: dict, head: dict, threshold: float) -> dict:
+    scenarios = {}
+    regressions = []
+    for mode, results in head["results"].items():
+        for name, now in results.items():
+            before = base["results"].get(mode, {}).get(name)
+            key = f"{mode}.{name}"
+            if before is None:
+                scenarios[key] = {"new": True}
+                continue
+            delta = {"ops_per_s": _change(before["ops_per_s"], now["ops_per_s"])}
+            delta.update({latency: _change(before.get(latency), now.get(latency)) for latency in LATENCIES})
+            delta["errors"] = sum(now["errors"].values())
+            scenarios[key] = delta
+
+            if delta["ops_per_s"] is not None and delta["ops_per_s"] < -threshold:
+                regressions.append(f"{key}: throughput {delta['ops_per_s']}%")
+            if delta["p95_ms"] is not None and delta["p95_ms"] > threshold:
+                regressions.append(f"{key}: p95 latency +{delta['p95_ms']}%")
+            if delta["errors"] and not sum(before["errors"].values()):
+                regressions.append(f"{key}: {delta['errors']} errors")
+
+    warnings = []
+    if base["meta"].get("dataset") != head["meta"].get("dataset"):
+        warnings.append("Reports were measured on different datasets")
+    if base["meta"]["config"] != head["meta"]["config"]:
+        warnings.append("Reports were measured with different settings")
+
+    return {
+        "base": base["meta"].get("commit"),
+        "head": head["meta"].get("commit"),
+        "threshold_pct": threshold,
+        "scenarios": scenarios,
+        "regressions": regressions,
+        "warnings": warnings,
+    }
+
+
+def main(args) -> int:
+    base = json.loads(Path(args.base).read_text())
+    head = json.loads(Path(args.head).read_text())
+    result = compare(base, head, args.threshold)
+    print(json.dumps(result, indent=2))
+    return 1 if result["regressions"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="Report of the baseline commit")
+    parser.add_argument("head", help="Report of the commit under test")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change counted as a regression")
+    sys.exit(main(parser.parse_args()))
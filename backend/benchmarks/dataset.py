@@ -0,0 +1,268 @@
+"""
+Synthetic dataset generator
+
+Seeds DATABASE_URL and the configured storage with a production-shaped
+dataset: at --scale 1.0, 10k users, 50k projects and 1M markdown files.
+Project ownership and membership follow a Zipf distribution (a few very
+active writers, a long tail) and file counts per project a lognormal one.
+The same --seed gives the same dataset. Runs once per database; a second
+run exits early if benchmark users exist.
+
+    python -m benchmarks.dataset --scale 0.01
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import BENCH_DOMAIN, BENCH_PASSWORD, configure_environment
+
+USERS = 10_000
+PROJECTS = 50_000
+FILES = 1_000_000
+
+# Share of users per global role; the rest are writers
+STATISTICIAN_SHARE = 0.15
+ADMIN_SHARE = 0.02
+
+STATUS_MIX = {"in_progress": 0.40, "draft": 0.30, "under_review": 0.15, "completed": 0.15}
+
+WORDS = (
+    "the manuscript chapter draft scene character plot narrative editor revision "
+    "dialogue setting theme voice pacing structure outline conflict resolution "
+    "reader page paragraph sentence notes research source figure table analysis "
+    "data sample result method discussion introduction conclusion appendix"
+).split()
+
+
+def zipf_weights(n: int, exponent: float = 1.1) -> list[float]:
+    """Cumulative Zipf weights for random.choices(cum_weights=...)"""
+    total, cumulative = 0.0, []
+    for rank in range(1, n + 1):
+        total += 1 / rank ** exponent
+        cumulative.append(total)
+    return cumulative
+
+
+def markdown_pool(rng: random.Random, size: int) -> list[bytes]:
+    """Markdown bodies from a few hundred bytes to ~40 KB, a few KB on average"""
+    bodies = []
+    for i in range(size):
+        words = max(50, min(6000, int(rng.lognormvariate(5.8, 0.9))))
+        lines = [f"# Chapter {i + 1}", ""]
+        written = 0
+        while written < words:
+            length = rng.randint(40, 120)
+            lines.append(" ".join(rng.choices(WORDS, k=length)).capitalize() + ".")
+            lines.append("")
+            written += length
+            if rng.random() < 0.1:
+                lines += [f"## Section {len(lines)}", ""]
+        bodies.append("\n".join(lines).encode())
+    return bodies
+
+
+def _batched(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _insert(engine, table, rows: list[dict], batch: int):
+    for chunk in _batched(rows, batch):
+        with engine.begin() as conn:
+            conn.execute(table.insert(), chunk)
+
+
+def _max_id(engine, table) -> int:
+    from sqlalchemy import func, select
+
+    with engine.connect() as conn:
+        return conn.scalar(select(func.coalesce(func.max(table.c.id), 0)))
+
+
+def _ids_after(engine, table, floor: int) -> list[int]:
+    from sqlalchemy import select
+
+    with engine.connect() as conn:
+        return list(conn.scalars(select(table.c.id).where(table.c.id > floor).order_by(table.c.id)))
+
+
+def _timestamp(rng: random.Random, now: datetime, days: int = 730) -> datetime:
+    return now - timedelta(seconds=rng.uniform(0, days * 86400))
+
+
+def generate(args) -> dict:
+    from sqlalchemy import func, select
+    from app.core.security import get_password_hash
+    from app.database import Base, SessionLocal, engine
+    from app.db.seed import ensure_seeded
+    from app.models import File, Project, ProjectMember, Role, User
+    from app.models.enums import STATUS_PRIORITY, ProjectRole, ProjectStatus, RoleName
+    from app.services.stats_service import StatsService
+    from app.services.storage import get_storage
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    timings: dict[str, float] = {}
+
+    def phase(name: str, started: float):
+        timings[name] = round(time.perf_counter() - started, 2)
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        ensure_seeded(db)
+        existing = db.scalar(select(func.count(User.id)).where(User.email.like(f"%@{BENCH_DOMAIN}")))
+        if existing:
+            return {"skipped": True, "reason": f"{existing} benchmark users already exist"}
+        roles = {name: role_id for role_id, name in db.execute(select(Role.id, Role.name))}
+
+    n_users = max(10, int(USERS * args.scale))
+    n_projects = max(10, int(PROJECTS * args.scale))
+    n_files = max(10, int(FILES * args.scale))
+
+    # Users: one shared password hash, so seeding does not pay for bcrypt per row
+    started = time.perf_counter()
+    password = get_password_hash(BENCH_PASSWORD)
+    kinds = []
+    rows = []
+    for i in range(n_users):
+        draw = rng.random()
+        kind = RoleName.ADMIN if draw < ADMIN_SHARE else (
+            RoleName.STATISTICIAN if draw < ADMIN_SHARE + STATISTICIAN_SHARE else RoleName.WRITER
+        )
+        kinds.append(kind)
+        created = _timestamp(rng, now)
+        rows.append({
+            "email": f"{kind.value}{i}@{BENCH_DOMAIN}", "hashed_password": password,
+            "full_name": f"Bench {kind.value.title()} {i}", "role_id": roles[kind.value],
+            "is_active": True, "created_at": created, "updated_at": created,
+        })
+    floor = _max_id(engine, User.__table__)
+    _insert(engine, User.__table__, rows, args.batch)
+    user_ids = _ids_after(engine, User.__table__, floor)
+    writers = [uid for uid, kind in zip(user_ids, kinds) if kind == RoleName.WRITER]
+    statisticians = {uid for uid, kind in zip(user_ids, kinds) if kind == RoleName.STATISTICIAN}
+    collaborators = [uid for uid, kind in zip(user_ids, kinds) if kind != RoleName.ADMIN]
+    phase("users", started)
+
+    # Projects: creators by Zipf rank, so a few writers own hundreds
+    started = time.perf_counter()
+    statuses = [ProjectStatus(s) for s in STATUS_MIX]
+    status_weights = list(STATUS_MIX.values())
+    creators = rng.choices(writers, cum_weights=zipf_weights(len(writers)), k=n_projects)
+    rows = []
+    for i, creator in enumerate(creators):
+        project_status = rng.choices(statuses, status_weights)[0]
+        created = _timestamp(rng, now)
+        rows.append({
+            "name": f"Bench project {i}", "description": f"Synthetic project {i}",
+            "status": project_status, "status_priority": STATUS_PRIORITY[project_status],
+            "word_count": 0, "created_by": creator, "created_at": created, "updated_at": created,
+        })
+    floor = _max_id(engine, Project.__table__)
+    _insert(engine, Project.__table__, rows, args.batch)
+    project_ids = _ids_after(engine, Project.__table__, floor)
+    phase("projects", started)
+
+    # Members: the creator plus a geometric number of collaborators, also by Zipf rank
+    started = time.perf_counter()
+    collaborator_weights = zipf_weights(len(collaborators))
+    project_writers: list[list[int]] = []
+    rows = []
+    for project_id, creator in zip(project_ids, creators):
+        members = {creator}
+        while rng.random() < args.member_continue:
+            members.add(rng.choices(collaborators, cum_weights=collaborator_weights)[0])
+        writers_here = []
+        for user_id in members:
+            role = ProjectRole.STATISTICIAN if user_id in statisticians else ProjectRole.WRITER
+            if role == ProjectRole.WRITER:
+                writers_here.append(user_id)
+            rows.append({"project_id": project_id, "user_id": user_id, "role": role,
+                         "created_at": now, "updated_at": now})
+        project_writers.append(writers_here)
+    _insert(engine, ProjectMember.__table__, rows, args.batch)
+    members_total = len(rows)
+    phase("members", started)
+
+    # Files: lognormal weight per project, uploaded by one of its writers
+    started = time.perf_counter()
+    storage = get_storage()
+    bodies = markdown_pool(rng, args.body_pool)
+    project_weights, total = [], 0.0
+    for _ in project_ids:
+        total += rng.lognormvariate(0, 1.2)
+        project_weights.append(total)
+    chapters = [0] * len(project_ids)
+    bytes_written = 0
+    remaining = n_files
+    while remaining:
+        count = min(args.batch, remaining)
+        remaining -= count
+        rows = []
+        for index in rng.choices(range(len(project_ids)), cum_weights=project_weights, k=count):
+            project_id = project_ids[index]
+            chapters[index] += 1
+            filename = f"chapter-{chapters[index]}.md"
+            storage_name = f"{uuid.UUID(int=rng.getrandbits(128)).hex}_{filename}"
+            storage_path = f"projects/{project_id}/{storage_name}"
+            body = rng.choice(bodies)
+            storage.save(body, storage_path)
+            bytes_written += len(body)
+            created = _timestamp(rng, now)
+            rows.append({
+                "project_id": project_id, "filename": storage_name, "original_filename": filename,
+                "storage_path": storage_path, "content_type": "text/markdown", "size": len(body),
+                "uploaded_by": rng.choice(project_writers[index]), "version": 0,
+                "created_at": created, "updated_at": created,
+            })
+        _insert(engine, File.__table__, rows, args.batch)
+        if args.progress:
+            print(f"files: {n_files - remaining}/{n_files}", file=sys.stderr)
+    phase("files", started)
+
+    # The summary tables are maintained by the services; bulk inserts bypass them
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        StatsService(db).reconcile()
+        db.commit()
+    phase("stats", started)
+
+    return {
+        "backend": engine.dialect.name,
+        "seed": args.seed,
+        "scale": args.scale,
+        "users": len(user_ids),
+        "writers": len(writers),
+        "statisticians": len(statisticians),
+        "projects": len(project_ids),
+        "members": members_total,
+        "files": n_files,
+        "storage_bytes": bytes_written,
+        "max_files_per_project": max(chapters),
+        "seconds": timings,
+    }
+
+
+def main(args) -> int:
+    result = generate(args)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    configure_environment()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Fraction of 10k users / 50k projects / 1M files")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=5000, help="Rows per INSERT transaction")
+    parser.add_argument("--member-continue", type=float, default=0.55,
+                        help="Chance to add one more member to a project (geometric)")
+    parser.add_argument("--body-pool", type=int, default=256, help="Distinct markdown bodies")
+    parser.add_argument("--progress", action="store_true", help="Report file batches on stderr")
+    sys.exit(main(parser.parse_args()))
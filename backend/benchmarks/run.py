@@ -0,0 +1,379 @@
+"""
+Benchmark runner
+
+Drives each scenario for --duration seconds from --concurrency threads,
+after --warmup seconds that are not measured, through the service layer
+("service": in process, one session per operation as a request would
+use) and the HTTP API ("http": a uvicorn server started on a free port
+with the same environment, or --base-url). Each thread acts as its own
+benchmark writer in its own project, so updates never conflict.
+
+    python -m benchmarks.run --mode both --duration 20 --output benchmarks/results/head.json
+
+Scenarios: list_projects, list_files, content, upload, update, chat.
+Uploads add files to the dataset; reseed before comparing absolute sizes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.common import BACKEND, BENCH_DOMAIN, BENCH_PASSWORD, configure_environment, git_commit, \
+    git_dirty, percentiles
+
+SCENARIOS = ["list_projects", "list_files", "content", "upload", "update", "chat"]
+READ_ONLY = {"list_projects", "list_files", "content", "chat"}
+
+UPLOAD_BODY = ("# Uploaded chapter\n\n" + "Benchmark upload text. " * 200).encode()
+UPDATE_BODY = ("# Revised chapter\n\n" + "Benchmark revision text. " * 200).encode()
+CHAT_MESSAGE = "Summarise this chapter and suggest one improvement."
+
+
+class Actor:
+    """A benchmark writer, one of its projects and that project's files"""
+
+    def __init__(self, user_id: int, email: str, project_id: int, files: dict[int, int]):
+        self.user_id = user_id
+        self.email = email
+        self.project_id = project_id
+        # file id -> version last written
+        self.files = files
+        self.file_ids = list(files)
+
+
+class Worker:
+    """Per-thread state: its actor, random source, event loop or HTTP client"""
+
+    def __init__(self, actor: Actor, seed: int):
+        self.actor = actor
+        self.rng = random.Random(seed)
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.client = None
+
+    def file_id(self) -> int:
+        return self.rng.choice(self.actor.file_ids)
+
+
+class HTTPError(Exception):
+    """An HTTP scenario got an error status"""
+
+
+def load_actors(count: int, seed: int) -> list[Actor]:
+    """`count` writers with files, each in a project no other actor uses"""
+    from sqlalchemy import select
+    from app.database import SessionLocal
+    from app.models import File, ProjectMember, User
+    from app.models.enums import ProjectRole
+
+    with SessionLocal() as db:
+        db.info["read_only"] = True
+        rows = db.execute(
+            select(ProjectMember.user_id, User.email, ProjectMember.project_id)
+            .join(User, User.id == ProjectMember.user_id)
+            .where(ProjectMember.role == ProjectRole.WRITER, User.email.like(f"%@{BENCH_DOMAIN}"))
+            .where(select(File.id).where(File.project_id == ProjectMember.project_id).exists())
+            .order_by(ProjectMember.id)
+        ).all()
+        random.Random(seed).shuffle(rows)
+
+        actors, users, projects = [], set(), set()
+        for user_id, email, project_id in rows:
+            if user_id in users or project_id in projects:
+                continue
+            users.add(user_id)
+            projects.add(project_id)
+            files = dict(db.execute(select(File.id, File.version).where(File.project_id == project_id)).all())
+            actors.append(Actor(user_id, email, project_id, files))
+            if len(actors) == count:
+                break
+    if len(actors) < count:
+        raise SystemExit(f"Only {len(actors)} benchmark writers with distinct projects; "
+                         f"seed a larger dataset (python -m benchmarks.dataset) or lower --concurrency")
+    return actors
+
+
+def dataset_counts() -> dict:
+    from sqlalchemy import func, select
+    from app.database import SessionLocal, engine
+    from app.models import File, Project, ProjectMember, User
+
+    with SessionLocal() as db:
+        db.info["read_only"] = True
+        counts = {model.__tablename__: db.scalar(select(func.count()).select_from(model))
+                  for model in (User, Project, ProjectMember, File)}
+    return {"backend": engine.dialect.name, **counts}
+
+
+def service_scenarios() -> dict:
+    """Name -> fn(db, worker), each what the matching endpoint does through the services"""
+    from app.models import User
+    from app.services.file_service import FileService
+    from app.services.llm import get_llm
+    from app.services.project_service import ProjectService
+
+    def list_projects(db, worker: Worker):
+        ProjectService(db).get_user_projects(db.get(User, worker.actor.user_id), limit=50)
+
+    def list_files(db, worker: Worker):
+        FileService(db).get_project_files(worker.actor.project_id)
+
+    def content(db, worker: Worker):
+        FileService(db).get_file_content_as_text(worker.file_id())
+
+    def upload(db, worker: Worker):
+        FileService(db).upload_file(worker.actor.project_id, "bench-upload.md", UPLOAD_BODY,
+                                    "text/markdown", worker.actor.user_id)
+
+    def update(db, worker: Worker):
+        FileService(db).update_file_content(worker.file_id(), UPDATE_BODY)
+
+    def chat(db, worker: Worker):
+        text, file_record = FileService(db).get_file_content_as_text(worker.file_id())
+        worker.loop.run_until_complete(get_llm().generate(CHAT_MESSAGE, f"File: {file_record.filename}\n\n{text}"))
+
+    return {"list_projects": list_projects, "list_files": list_files, "content": content,
+            "upload": upload, "update": update, "chat": chat}
+
+
+def http_scenarios() -> dict:
+    """Name -> fn(worker) returning the response status"""
+
+    def files_url(worker: Worker) -> str:
+        return f"/api/projects/{worker.actor.project_id}/files"
+
+    def list_projects(worker: Worker) -> int:
+        return worker.client.get("/api/projects", params={"limit": 50}).status_code
+
+    def list_files(worker: Worker) -> int:
+        return worker.client.get(files_url(worker)).status_code
+
+    def content(worker: Worker) -> int:
+        return worker.client.get(f"{files_url(worker)}/{worker.file_id()}/content").status_code
+
+    def upload(worker: Worker) -> int:
+        return worker.client.post(
+            files_url(worker), files={"file": ("bench-upload.md", UPLOAD_BODY, "text/markdown")}
+        ).status_code
+
+    def update(worker: Worker) -> int:
+        file_id = worker.file_id()
+        version = worker.actor.files[file_id] + 1
+        response = worker.client.put(
+            f"{files_url(worker)}/{file_id}",
+            files={"file": ("chapter.md", UPDATE_BODY, "text/markdown")},
+            data={"version": str(version)},
+        )
+        if response.status_code < 400:
+            worker.actor.files[file_id] = version
+        return response.status_code
+
+    def chat(worker: Worker) -> int:
+        return worker.client.post("/api/chat", json={
+            "message": CHAT_MESSAGE, "project_id": worker.actor.project_id, "file_id": worker.file_id()
+        }).status_code
+
+    return {"list_projects": list_projects, "list_files": list_files, "content": content,
+            "upload": upload, "update": update, "chat": chat}
+
+
+def measure(operation, workers: list[Worker], warmup: float, duration: float) -> dict:
+    """Run `operation(worker)` in a loop on one thread per worker; time the calls after warmup"""
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+
+    def run(worker: Worker):
+        mine, failed = [], {}
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                break
+            try:
+                operation(worker)
+            except Exception as e:
+                if start >= measure_from:
+                    key = f"{type(e).__name__}: {str(e).splitlines()[0][:80] if str(e) else ''}"
+                    failed[key] = failed.get(key, 0) + 1
+                continue
+            if start >= measure_from:
+                mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+            for key, count in failed.items():
+                errors[key] = errors.get(key, 0) + count
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "ops": len(latencies),
+        "ops_per_s": round(len(latencies) / duration, 1),
+        **percentiles(latencies),
+        "errors": errors,
+    }
+
+
+def run_service(args, actors: list[Actor]) -> dict:
+    from app.database import SessionLocal
+
+    scenarios = service_scenarios()
+    workers = [Worker(actor, args.seed + i) for i, actor in enumerate(actors)]
+    for worker in workers:
+        worker.loop = asyncio.new_event_loop()
+
+    results = {}
+    try:
+        for name in args.scenarios:
+            fn = scenarios[name]
+            read_only = name in READ_ONLY
+
+            def operation(worker: Worker, fn=fn, read_only=read_only):
+                with SessionLocal() as db:
+                    db.info["read_only"] = read_only
+                    fn(db, worker)
+                    db.commit()
+
+            results[name] = measure(operation, workers, args.warmup, args.duration)
+            print(f"service {name}: {results[name]['ops_per_s']} ops/s", file=sys.stderr)
+    finally:
+        for worker in workers:
+            worker.loop.close()
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int) -> tuple[subprocess.Popen, str]:
+    """Start uvicorn with this process's environment; returns it and its base URL"""
+    import httpx
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND, env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return server, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("Server did not become healthy within 60 seconds")
+
+
+def run_http(args, actors: list[Actor]) -> dict:
+    import httpx
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server, base_url = start_server(args.server_workers)
+
+    scenarios = http_scenarios()
+    workers = [Worker(actor, args.seed + i) for i, actor in enumerate(actors)]
+    results = {}
+    try:
+        for worker in workers:
+            worker.client = httpx.Client(base_url=base_url, timeout=args.timeout)
+            response = worker.client.post("/api/auth/login",
+                                          json={"email": worker.actor.email, "password": BENCH_PASSWORD})
+            response.raise_for_status()
+            worker.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        for name in args.scenarios:
+            fn = scenarios[name]
+
+            def operation(worker: Worker, fn=fn):
+                status = fn(worker)
+                if status >= 400:
+                    raise HTTPError(f"HTTP {status}")
+
+            results[name] = measure(operation, workers, args.warmup, args.duration)
+            print(f"http {name}: {results[name]['ops_per_s']} ops/s", file=sys.stderr)
+    finally:
+        for worker in workers:
+            if worker.client is not None:
+                worker.client.close()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+    return results
+
+
+def main(args) -> int:
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    actors = load_actors(args.concurrency, args.seed)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "dirty": git_dirty(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "dataset": dataset_counts(),
+            "config": {
+                "mode": args.mode, "scenarios": args.scenarios, "concurrency": args.concurrency,
+                "duration_s": args.duration, "warmup_s": args.warmup, "seed": args.seed,
+                "server_workers": args.server_workers if args.mode != "service" and not args.base_url else None,
+                "llm_provider": os.environ.get("LLM_PROVIDER"),
+            },
+        },
+        "results": {},
+    }
+    if args.mode in ("service", "both"):
+        report["results"]["service"] = run_service(args, actors)
+    if args.mode in ("http", "both"):
+        report["results"]["http"] = run_http(args, actors)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output + "\n")
+    print(output)
+    failed = any(result["errors"] for mode in report["results"].values() for result in mode.values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    configure_environment()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["service", "http", "both"], default="both")
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=SCENARIOS,
+                        help="Comma-separated subset of: " + ",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads, one actor each")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds per scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn workers for --mode http")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of starting one")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP request timeout in seconds")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    sys.exit(main(parser.parse_args()))
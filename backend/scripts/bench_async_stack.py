@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Sync vs async stack benchmark
+
+Drives the same read endpoint on the sync stack (/api/...) and its async
+variant (/api/aio/...) with many concurrent clients and reports requests
+per second and latency percentiles for each. Sync routes are capped by
+Starlette's threadpool (40 threads by default); async routes are capped by
+the async engine's connection pool.
+
+Usage:
+    python scripts/bench_async_stack.py --base-url http://localhost:8000 \\
+        --concurrency 200 --duration 15 --path /projects
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return round(ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)] * 1000, 2)
+
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99)}
+
+
+async def run_stack(client: httpx.AsyncClient, url: str, token: str, concurrency: int, duration: float) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.get(url, headers=headers)
+                code = response.status_code
+            except httpx.HTTPError:
+                code = 0
+            statuses[code] = statuses.get(code, 0) + 1
+            if code == 200:
+                latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "url": url,
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "latency": percentiles(latencies),
+    }
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        response = await client.post("/api/auth/login", json={"email": args.email, "password": args.password})
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        results = {}
+        for name, prefix in (("sync", "/api"), ("async", "/api/aio")):
+            # Warm up connections and caches before measuring
+            await run_stack(client, prefix + args.path, token, args.concurrency, args.warmup)
+            results[name] = await run_stack(client, prefix + args.path, token, args.concurrency, args.duration)
+
+    print(json.dumps({
+        "config": {"concurrency": args.concurrency, "duration_s": args.duration, "path": args.path},
+        **results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--path", default="/projects", help="Endpoint path below /api and /api/aio")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--warmup", type=float, default=2)
+    asyncio.run(main(parser.parse_args()))
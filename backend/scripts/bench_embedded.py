@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Embedded SQLite vs Postgres benchmark
+
+Runs a mixed read/write workload through the service layer from many
+threads against DATABASE_URL and reports operations per second, latency
+percentiles per operation and errors (a "database is locked" shows up
+there). Run it once per backend with the same arguments and compare:
+
+    DATABASE_URL=sqlite:///./bench.db python scripts/bench_embedded.py --threads 16
+    DATABASE_URL=postgresql://... python scripts/bench_embedded.py --threads 16
+
+The schema is created when missing (SQLite) and a benchmark user with
+--projects projects of --files files each is set up on the first run.
+Reads run as GET requests do (read-only sessions); writes as POST/PUT.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+BENCH_EMAIL = "bench-embedded@example.com"
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return round(ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)] * 1000, 2)
+
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99)}
+
+
+def setup(args) -> tuple[int, list[int], list[int]]:
+    """Benchmark user id, its project ids and file ids"""
+    from app.core.security import get_password_hash
+    from app.database import Base, SessionLocal, engine
+    from app.db.seed import ensure_seeded
+    from app.models import File, Project, Role, User
+    from app.models.enums import ProjectRole, RoleName
+    from app.schemas.project import ProjectCreate, ProjectMemberCreate
+    from app.services.file_service import FileService
+    from app.services.project_service import ProjectService
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+
+    with SessionLocal() as db:
+        ensure_seeded(db)
+        user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+        if user is None:
+            role = db.query(Role).filter(Role.name == RoleName.WRITER).one()
+            user = User(email=BENCH_EMAIL, full_name="Bench", role_id=role.id,
+                        hashed_password=get_password_hash("bench"))
+            db.add(user)
+            db.commit()
+        project_ids = [pid for pid, in db.query(Project.id).filter(Project.created_by == user.id)]
+        for i in range(len(project_ids), args.projects):
+            project = ProjectService(db).create(ProjectCreate(name=f"Bench {i}"), user.id)
+            for j in range(args.files):
+                FileService(db).create_file(project.id, f"chapter-{j}.md", "# Chapter\n\n" + "text " * 200, user.id)
+            project_ids.append(project.id)
+        ProjectService(db).assign_members(
+            project_ids, [ProjectMemberCreate(user_id=user.id, role=ProjectRole.WRITER)]
+        )
+        file_ids = [fid for fid, in db.query(File.id).filter(File.project_id.in_(project_ids))]
+        return user.id, project_ids, file_ids
+
+
+def operations(user_id: int, project_ids: list[int], file_ids: list[int]) -> dict:
+    """Name -> (read_only, fn(db))"""
+    from app.models import User
+    from app.schemas.project import ProjectCreate, ProjectUpdate
+    from app.services.file_service import FileService
+    from app.services.project_service import ProjectService
+
+    def list_projects(db):
+        ProjectService(db).get_user_projects(db.get(User, user_id), limit=50)
+
+    def list_files(db):
+        FileService(db).get_project_files(random.choice(project_ids))
+
+    def read_file(db):
+        FileService(db).get_file_content_as_text(random.choice(file_ids))
+
+    def update_file(db):
+        FileService(db).update_file_content(random.choice(file_ids), ("# Edited\n\n" + "text " * 200).encode())
+
+    def create_project(db):
+        ProjectService(db).create(ProjectCreate(name="Bench extra"), user_id)
+
+    def update_project(db):
+        ProjectService(db).update(random.choice(project_ids), ProjectUpdate(description=str(time.time())))
+
+    return {
+        "list_projects": (True, list_projects),
+        "list_files": (True, list_files),
+        "read_file": (True, read_file),
+        "update_file": (False, update_file),
+        "create_project": (False, create_project),
+        "update_project": (False, update_project),
+    }
+
+
+def run(args, ops: dict) -> dict:
+    from app.database import SessionLocal
+
+    names = list(ops)
+    weights = [args.write_ratio / 3 if not ops[n][0] else (1 - args.write_ratio) / 3 for n in names]
+    latencies: dict[str, list[float]] = {n: [] for n in names}
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def worker():
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            read_only, fn = ops[name]
+            start = time.perf_counter()
+            try:
+                with SessionLocal() as db:
+                    db.info["read_only"] = read_only
+                    fn(db)
+                    db.commit()
+            except Exception as e:
+                with lock:
+                    key = f"{type(e).__name__}: {str(e).splitlines()[0][:80]}"
+                    errors[key] = errors.get(key, 0) + 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[name].append(elapsed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    everything = [v for values in latencies.values() for v in values]
+    return {
+        "ops_per_s": round(len(everything) / wall, 1),
+        "latency": percentiles(everything),
+        "operations": {
+            n: {"count": len(v), **percentiles(v)} for n, v in latencies.items()
+        },
+        "errors": errors,
+    }
+
+
+def main(args) -> int:
+    from app.database import engine, writer_lock
+
+    user_id, project_ids, file_ids = setup(args)
+    ops = operations(user_id, project_ids, file_ids)
+    result = run(args, ops)
+
+    print(json.dumps({
+        "backend": engine.dialect.name,
+        "embedded": writer_lock is not None,
+        "config": {"threads": args.threads, "duration_s": args.duration, "write_ratio": args.write_ratio,
+                   "projects": len(project_ids), "files": len(file_ids)},
+        **result,
+        "writer_lock": writer_lock.stats() if writer_lock is not None else None,
+    }, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2,
+                        help="Share of operations that write")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--files", type=int, default=5, help="Files per project")
+    sys.exit(main(parser.parse_args()))
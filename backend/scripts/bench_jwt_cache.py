@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+JWT verification microbenchmark
+
+Compares per-request auth CPU for decode_token with the verified-token
+cache disabled (full parse and HMAC check every time) and enabled.
+
+Usage:
+    DATABASE_URL=sqlite:// SECRET_KEY=bench python scripts/bench_jwt_cache.py
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import security
+
+
+def per_call_us(tokens: list[str], iterations: int) -> float:
+    """Mean CPU microseconds per decode_token call"""
+    start = time.process_time()
+    for i in range(iterations):
+        security.decode_token(tokens[i % len(tokens)])
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def main(args):
+    tokens = [
+        security.create_access_token({"sub": str(i), "email": f"user{i}@example.com"})
+        for i in range(args.tokens)
+    ]
+
+    security.token_cache.max_size = 0
+    security.token_cache.clear()
+    uncached = per_call_us(tokens, args.iterations)
+
+    security.token_cache.max_size = max(args.tokens, 1)
+    security.token_cache.clear()
+    per_call_us(tokens, len(tokens))  # warm the cache
+    cached = per_call_us(tokens, args.iterations)
+
+    print(json.dumps({
+        "iterations": args.iterations,
+        "distinct_tokens": args.tokens,
+        "uncached_us_per_call": round(uncached, 2),
+        "cached_us_per_call": round(cached, 2),
+        "speedup": round(uncached / cached, 1) if cached else None,
+        "cache": security.token_cache.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--tokens", type=int, default=100, help="Distinct tokens cycled through")
+    main(parser.parse_args())
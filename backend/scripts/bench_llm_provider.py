@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+LLM provider throughput benchmark
+
+Streams concurrent responses through ClaudeLLM, usually against
+scripts/llm_stub_server.py, and reports time-to-first-token and
+token throughput.
+
+Usage:
+    python scripts/llm_stub_server.py --port 9100 &
+    python scripts/bench_llm_provider.py --base-url http://127.0.0.1:9100 \\
+        --concurrency 50 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.llm.claude import ClaudeLLM
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)]
+
+
+async def main(args):
+    llm = ClaudeLLM(
+        api_key=args.api_key,
+        base_url=args.base_url,
+        max_tokens=args.max_tokens,
+        max_connections=args.concurrency,
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+    ttfts, tokens, errors = [], [], 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            count = 0
+            try:
+                async for _ in llm.stream("benchmark prompt"):
+                    if count == 0:
+                        ttfts.append((time.perf_counter() - start) * 1000)
+                    count += 1
+            except Exception:
+                errors += 1
+            tokens.append(count)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    await llm.close()
+
+    print(json.dumps({
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(args.requests / elapsed, 1),
+        "tokens_per_s": round(sum(tokens) / elapsed, 1),
+        "ttft_p50_ms": round(percentile(ttfts, 50), 2) if ttfts else None,
+        "ttft_p95_ms": round(percentile(ttfts, 95), 2) if ttfts else None,
+        "ttft_p99_ms": round(percentile(ttfts, 99), 2) if ttfts else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:9100")
+    parser.add_argument("--api-key", default="stub")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--max-tokens", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark
+
+Runs a burst of concurrent logins while timing an unrelated endpoint, and
+compares that endpoint's latency against an idle baseline. With bcrypt on
+its own executor, the unrelated endpoint should stay fast during the burst.
+Results are printed as JSON.
+
+Usage:
+    python scripts/bench_login.py --base-url http://localhost:8000 \\
+        --login-concurrency 32 --duration 10
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def post_json(url: str, body: dict) -> tuple[int, dict]:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, {}
+
+
+def timed_get(url: str, token: str) -> float:
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return round(ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)] * 1000, 2)
+
+    return {"count": len(ordered), "p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99)}
+
+
+def probe(url: str, token: str, stop: threading.Event) -> list[float]:
+    """Time the unrelated endpoint sequentially until stopped"""
+    latencies = []
+    while not stop.is_set():
+        latencies.append(timed_get(url, token))
+    return latencies
+
+
+def main(args):
+    login_url = f"{args.base_url}/api/auth/login"
+    probe_url = f"{args.base_url}{args.probe_path}"
+    credentials = {"email": args.email, "password": args.password}
+    status, body = post_json(login_url, credentials)
+    if status != 200:
+        raise SystemExit(f"Login failed with status {status}")
+    token = body["access_token"]
+
+    # Baseline: unrelated endpoint with no login load
+    stop = threading.Event()
+    timer = threading.Timer(args.baseline_duration, stop.set)
+    timer.start()
+    baseline = probe(probe_url, token, stop)
+
+    # Burst: concurrent logins while the probe keeps running
+    stop = threading.Event()
+    login_latencies, statuses = [], {}
+    lock = threading.Lock()
+
+    def login_worker():
+        while not stop.is_set():
+            start = time.perf_counter()
+            code, _ = post_json(login_url, credentials)
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[code] = statuses.get(code, 0) + 1
+                if code == 200:
+                    login_latencies.append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=args.login_concurrency + 1) as pool:
+        probe_future = pool.submit(probe, probe_url, token, stop)
+        for _ in range(args.login_concurrency):
+            pool.submit(login_worker)
+        time.sleep(args.duration)
+        stop.set()
+        loaded = probe_future.result()
+
+    print(json.dumps({
+        "config": {
+            "login_concurrency": args.login_concurrency,
+            "duration_s": args.duration,
+            "probe_path": args.probe_path,
+        },
+        "logins_per_s": round(len(login_latencies) / args.duration, 1),
+        "login_status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "login_latency": percentiles(login_latencies),
+        "probe_baseline": percentiles(baseline),
+        "probe_during_logins": percentiles(loaded),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--probe-path", default="/api/projects", help="Unrelated endpoint to time")
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--baseline-duration", type=float, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Concurrent WebSocket chat load test
+
+Logs in, opens N chat WebSockets to /api/chat/ws and sends scripted prompts
+with file context from each one. Reports time-to-first-token, inter-token
+latency percentiles, frames per second and, when --server-pid is given,
+the worker's CPU and RSS. Results are printed as JSON.
+
+Start the server with FakeLLM and the latency profile under test, e.g. with
+no simulated model time, and with rate limiting off: every socket logs in
+as the same user, so the per-user chat limit would throttle the run. A run
+that gets rate_limited frames anyway exits 1, as its timings cover only
+the messages that got through.
+
+    RATE_LIMIT_ENABLED=false FAKE_LLM_LATENCY=zero uvicorn app.main:app --port 8000
+
+Usage:
+    python scripts/chat_load_test.py --connections 100 --messages 5 \\
+        --server-pid $(pgrep -f "uvicorn app.main:app") --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import urllib.request
+
+import websockets
+
+PROMPTS = [
+    "Can you improve the introduction of this draft?",
+    "Please check the citations and references.",
+    "Write a short summary of this document.",
+    "What would you change in this section?",
+]
+
+FILE_CONTENT = "# Methods\n\n" + "We enrolled participants and measured outcomes at baseline. " * 200
+
+
+def api_request(base_url: str, method: str, path: str, token: str | None = None, body: dict | None = None) -> dict:
+    """Send a JSON request to the API and return the decoded response"""
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    request = urllib.request.Request(
+        f"{base_url}{path}",
+        data=json.dumps(body).encode() if body is not None else None,
+        headers=headers,
+        method=method
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def prepare_context(args, token: str) -> tuple[int, int]:
+    """Return (project_id, file_id), creating a project and file when none are given"""
+    if args.project_id and args.file_id:
+        return args.project_id, args.file_id
+
+    project = api_request(args.base_url, "POST", "/api/projects", token, {"name": "Chat load test"})
+    file = api_request(
+        args.base_url, "POST", f"/api/projects/{project['id']}/files/create", token,
+        {"filename": "load-test.md", "content": FILE_CONTENT}
+    )
+    return project["id"], file["id"]
+
+
+def percentiles(values: list[float]) -> dict:
+    """p50/p90/p95/p99/max in milliseconds"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return round(ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)] * 1000, 3)
+
+    return {
+        "p50_ms": pick(50),
+        "p90_ms": pick(90),
+        "p95_ms": pick(95),
+        "p99_ms": pick(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class ProcessSampler:
+    """Samples CPU and RSS of server worker processes from /proc"""
+
+    def __init__(self, pids: list[int], interval: float = 0.5):
+        self.pids = pids
+        self.interval = interval
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.cpu_percent: list[float] = []
+        self.rss_bytes: list[int] = []
+
+    def _cpu_seconds(self) -> float:
+        total = 0
+        for pid in self.pids:
+            with open(f"/proc/{pid}/stat") as f:
+                # Fields after the command name; utime and stime are 14 and 15
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += int(fields[11]) + int(fields[12])
+        return total / self.clock_ticks
+
+    def _rss(self) -> int:
+        total = 0
+        for pid in self.pids:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        return total
+
+    async def run(self):
+        last_cpu, last_time = self._cpu_seconds(), time.perf_counter()
+        while True:
+            await asyncio.sleep(self.interval)
+            cpu, now = self._cpu_seconds(), time.perf_counter()
+            self.cpu_percent.append((cpu - last_cpu) / (now - last_time) * 100)
+            self.rss_bytes.append(self._rss())
+            last_cpu, last_time = cpu, now
+
+    def summary(self) -> dict:
+        if not self.cpu_percent:
+            return {}
+        return {
+            "pids": self.pids,
+            "cpu_percent_mean": round(sum(self.cpu_percent) / len(self.cpu_percent), 1),
+            "cpu_percent_max": round(max(self.cpu_percent), 1),
+            "rss_mb_max": round(max(self.rss_bytes) / 1024 / 1024, 1),
+        }
+
+
+async def run_connection(ws_url: str, index: int, args, project_id: int, file_id: int, stats: dict):
+    """Send scripted prompts over one socket, recording per-token timings"""
+    async with websockets.connect(ws_url, open_timeout=60, max_size=None) as ws:
+        for n in range(args.messages):
+            prompt = PROMPTS[(index + n) % len(PROMPTS)]
+            sent = time.perf_counter()
+            await ws.send(json.dumps({"message": prompt, "project_id": project_id, "file_id": file_id}))
+
+            last = None
+            while True:
+                frame = json.loads(await ws.recv())
+                now = time.perf_counter()
+                stats["frames"] += 1
+                if frame["type"] == "token":
+                    if last is None:
+                        stats["ttft"].append(now - sent)
+                    else:
+                        stats["inter_token"].append(now - last)
+                    stats["tokens"] += 1
+                    last = now
+                elif frame["type"] == "end":
+                    stats["responses"] += 1
+                    stats["response_time"].append(now - sent)
+                    break
+                elif frame["type"] == "cancelled":
+                    stats["cancelled"] += 1
+                    break
+                elif frame["type"] == "error":
+                    stats["rate_limited" if frame.get("code") == "rate_limited" else "errors"] += 1
+                    break
+
+
+async def main(args):
+    token = await asyncio.to_thread(
+        api_request, args.base_url, "POST", "/api/auth/login", None,
+        {"email": args.email, "password": args.password}
+    )
+    token = token["access_token"]
+    project_id, file_id = await asyncio.to_thread(prepare_context, args, token)
+    ws_url = args.base_url.replace("http", "ws", 1) + f"/api/chat/ws?token={token}"
+
+    stats = {
+        "frames": 0, "tokens": 0, "responses": 0, "errors": 0, "rate_limited": 0, "cancelled": 0,
+        "ttft": [], "inter_token": [], "response_time": [],
+    }
+    sampler = ProcessSampler(args.server_pid) if args.server_pid else None
+    sampler_task = asyncio.create_task(sampler.run()) if sampler else None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_connection(ws_url, i, args, project_id, file_id, stats) for i in range(args.connections)),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+
+    if sampler_task:
+        sampler_task.cancel()
+
+    report = {
+        "config": {
+            "connections": args.connections,
+            "messages_per_connection": args.messages,
+            "base_url": args.base_url,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "responses": stats["responses"],
+        "errors": stats["errors"],
+        "rate_limited": stats["rate_limited"],
+        "cancelled": stats["cancelled"],
+        "connection_failures": sum(1 for r in results if isinstance(r, Exception)),
+        "frames_per_s": round(stats["frames"] / elapsed, 1),
+        "tokens_per_s": round(stats["tokens"] / elapsed, 1),
+        "time_to_first_token": percentiles(stats["ttft"]),
+        "inter_token_latency": percentiles(stats["inter_token"]),
+        "response_time": percentiles(stats["response_time"]),
+        "worker": sampler.summary() if sampler else None,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    if stats["rate_limited"]:
+        print(f"{stats['rate_limited']} messages were rate limited; start the server with "
+              "RATE_LIMIT_ENABLED=false for meaningful timings", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=3, help="Prompts sent per connection")
+    parser.add_argument("--project-id", type=int, help="Existing project for file context")
+    parser.add_argument("--file-id", type=int, help="Existing file for file context")
+    parser.add_argument("--server-pid", type=int, action="append", help="Worker PID to sample (repeatable)")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    sys.exit(asyncio.run(main(parser.parse_args())))
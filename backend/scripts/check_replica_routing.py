@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Read-replica routing check
+
+Runs a short request sequence in-process against DATABASE_URL and
+DATABASE_REPLICA_URLS and reports which engine served the queries of each
+request: reads go to the replica, writes to the primary, and a user who
+just wrote reads from the primary until REPLICA_READ_AFTER_WRITE_SECONDS
+have passed. Exits with status 1 on a routing mismatch.
+
+Locally, two SQLite files or two Postgres databases will do; the replica
+only needs the same schema and seed data as the primary (for SQLite, copy
+the primary file). Writes made here are not replicated, which does not
+matter for the routing check.
+
+Usage:
+    cp primary.db replica.db
+    DATABASE_URL=sqlite:///./primary.db DATABASE_REPLICA_URLS=sqlite:///./replica.db \\
+        python scripts/check_replica_routing.py --email admin@example.com --password admin123
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main(args) -> int:
+    os.environ["REPLICA_READ_AFTER_WRITE_SECONDS"] = str(args.after_write_seconds)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.database import engine, replica_engines
+    from app.main import app
+
+    if not replica_engines:
+        print("DATABASE_REPLICA_URLS is not set", file=sys.stderr)
+        return 2
+
+    served: set[str] = set()
+    for name, target in [("primary", engine)] + [(f"replica_{i}", e) for i, e in enumerate(replica_engines)]:
+        event.listen(target, "before_cursor_execute",
+                     lambda *a, name=name: served.add(name))
+
+    results = []
+
+    def step(label: str, expected: str, method: str, path: str, **kwargs):
+        served.clear()
+        response = client.request(method, path, **kwargs)
+        engines = sorted(served)
+        ok = response.status_code < 400 and all(
+            e.startswith(expected) for e in engines
+        )
+        results.append({"step": label, "status": response.status_code, "engines": engines,
+                        "expected": expected, "ok": ok})
+        return response
+
+    with TestClient(app) as client:
+        response = step("login", "primary", "POST", "/api/auth/login",
+                        json={"email": args.email, "password": args.password})
+        if response.status_code != 200:
+            print(response.text, file=sys.stderr)
+            return 2
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        # Principal lookups always read the primary; this also warms the cache
+        step("current user", "primary", "GET", "/api/auth/me", headers=headers)
+        step("list projects", "replica", "GET", "/api/projects", headers=headers)
+        step("statistics", "replica", "GET", "/api/projects/statistics", headers=headers)
+        step("create project", "primary", "POST", "/api/projects",
+             json={"name": "Replica routing check"}, headers=headers)
+        step("list after write", "primary", "GET", "/api/projects", headers=headers)
+        time.sleep(args.after_write_seconds + 0.1)
+        step("list after window", "replica", "GET", "/api/projects", headers=headers)
+
+    failed = [r for r in results if not r["ok"]]
+    print(json.dumps({"results": results, "failed": len(failed)}, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--after-write-seconds", type=float, default=1.0,
+                        help="Read-your-writes window used for the check")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Local LLM provider stub
+
+Serves POST /v1/messages using the Anthropic Messages API wire format,
+including the server-sent event stream, so ClaudeLLM can be exercised
+offline. Latency, response length and failure rate are configurable.
+
+Usage:
+    python scripts/llm_stub_server.py --port 9100 --tokens 200 \\
+        --ttft-ms 300 --tokens-per-second 80 --fail-rate 0.05
+
+    LLM_PROVIDER=claude ANTHROPIC_API_KEY=stub LLM_BASE_URL=http://127.0.0.1:9100 \\
+        uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "the manuscript results suggest a significant association between exposure and outcome "
+    "which remains robust after adjustment for baseline covariates in the sensitivity analysis"
+).split()
+
+
+def sse(event: str, data: dict) -> bytes:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="LLM stub")
+
+    def tokens(count: int) -> list[str]:
+        return [(" " if i else "") + WORDS[i % len(WORDS)] for i in range(count)]
+
+    async def stream_events(model: str, count: int):
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+        yield sse("message_start", {
+            "type": "message_start",
+            "message": {"id": message_id, "type": "message", "role": "assistant", "model": model,
+                        "content": [], "stop_reason": None, "usage": {"input_tokens": 10, "output_tokens": 0}},
+        })
+        yield sse("content_block_start", {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+        })
+        yield sse("ping", {"type": "ping"})
+        await asyncio.sleep(args.ttft_ms / 1000)
+
+        interval = 1 / args.tokens_per_second if args.tokens_per_second > 0 else 0
+        for i, text in enumerate(tokens(count)):
+            if i and interval:
+                await asyncio.sleep(interval)
+            yield sse("content_block_delta", {
+                "type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text},
+            })
+
+        yield sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield sse("message_delta", {
+            "type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": count},
+        })
+        yield sse("message_stop", {"type": "message_stop"})
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        model = body.get("model", "stub-model")
+        count = min(args.tokens, body.get("max_tokens", args.tokens))
+
+        if random.random() < args.fail_rate:
+            return JSONResponse(
+                status_code=args.fail_status,
+                content={"type": "error", "error": {"type": "overloaded_error", "message": "Stub failure"}},
+                headers={"retry-after": "0"},
+            )
+
+        if body.get("stream"):
+            return StreamingResponse(stream_events(model, count), media_type="text/event-stream")
+
+        await asyncio.sleep(args.ttft_ms / 1000)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": "".join(tokens(count))}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 10, "output_tokens": count},
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--tokens", type=int, default=200, help="Tokens per response")
+    parser.add_argument("--ttft-ms", type=float, default=0, help="Delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="0 streams as fast as possible")
+    parser.add_argument("--fail-rate", type=float, default=0, help="Fraction of requests that fail")
+    parser.add_argument("--fail-status", type=int, default=529)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Startup profile
+
+Measures what a fresh uvicorn worker pays before serving: importing
+app.main (from `python -X importtime`) and running the startup event.
+Reports the slowest imports and fails (exit status 1) when the total goes
+over budget or when a module that should load lazily (passlib, jose,
+httpx, redis) is imported eagerly. Each measurement runs in a fresh
+interpreter so nothing is cached in-process.
+
+Importing FastAPI, pydantic and SQLAlchemy alone takes most of a second on
+a small VM; the report shows that floor (framework_import_ms) next to the
+total so the application's own share stays visible.
+
+Usage:
+    python scripts/profile_startup.py --budget-ms 1500 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).parent.parent
+
+# Imported on first use by the code paths that need them
+LAZY_MODULES = ["passlib", "jose", "httpx", "redis", "anthropic"]
+
+STARTUP_SNIPPET = """
+import asyncio, time
+start = time.perf_counter()
+from app.main import startup_event, shutdown_event
+imported = time.perf_counter()
+
+async def main():
+    await startup_event()
+    await shutdown_event()
+
+asyncio.run(main())
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+FRAMEWORK_SNIPPET = """
+import time
+start = time.perf_counter()
+import fastapi, fastapi.routing, pydantic, pydantic_settings, sqlalchemy.orm, starlette.middleware.cors
+print(time.perf_counter() - start)
+"""
+
+
+def run_python(args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND, env=os.environ.copy(),
+        capture_output=True, text=True, check=True
+    )
+
+
+def import_profile() -> list[dict]:
+    """Parse `-X importtime` output into (module, self, cumulative, depth) rows"""
+    result = run_python(["-X", "importtime", "-c", "import app.main"])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return rows
+
+
+def main(args) -> int:
+    rows = import_profile()
+    total = next(row["cumulative_ms"] for row in rows if row["module"] == "app.main")
+    imported = {row["module"] for row in rows}
+    eager = [m for m in LAZY_MODULES + (args.lazy or []) if m in imported]
+
+    # Runs the startup event against DATABASE_URL, seeding it if needed
+    import_s, startup_s = map(float, run_python(["-c", STARTUP_SNIPPET]).stdout.split()[-2:])
+    framework_s = float(run_python(["-c", FRAMEWORK_SNIPPET]).stdout.split()[-1])
+
+    top = sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)
+    report = {
+        "import_ms": round(total, 1),
+        "import_wall_ms": round(import_s * 1000, 1),
+        "framework_import_ms": round(framework_s * 1000, 1),
+        "startup_event_ms": round(startup_s * 1000, 1),
+        "budget_ms": args.budget_ms,
+        "eager_lazy_modules": eager,
+        "slowest_imports": [
+            {k: round(v, 1) if isinstance(v, float) else v for k, v in row.items()}
+            for row in top[:args.top]
+        ],
+        "slowest_app_modules": [
+            {"module": row["module"], "cumulative_ms": round(row["cumulative_ms"], 1)}
+            for row in top if row["module"].startswith("app.")
+        ][:args.top],
+    }
+    report["ok"] = not eager and import_s * 1000 + startup_s * 1000 <= args.budget_ms
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="Maximum import plus startup event time")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--lazy", action="append", default=None,
+                        help="Another module that must not be imported by app.main (repeatable)")
+    sys.exit(main(parser.parse_args()))
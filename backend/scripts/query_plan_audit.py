@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Query plan audit
+
+Runs the read paths of the service layer against DATABASE_URL, captures
+every SELECT they issue, EXPLAINs each one and flags full table scans
+(Postgres "Seq Scan", SQLite "SCAN <table>" without an index). Exits with
+status 1 when a scan is flagged. tests/test_query_plans.py runs the same
+audit on a small seeded dataset as part of the test suite.
+
+Plans only mean something on realistically sized tables: with --seed the
+script first bulk-inserts synthetic users, projects, members and files.
+Only seed a throwaway database.
+
+Usage:
+    python scripts/query_plan_audit.py --seed --users 2000 --projects 10000 --files 100000
+    python scripts/query_plan_audit.py --ignore-table roles
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal, engine
+from app.testing.query_plans import SMALL_TABLES, audit, seed
+
+
+def main(args):
+    db = SessionLocal()
+    if args.seed:
+        seed(db, args.users, args.projects, args.files, args.members_per_project)
+    report = audit(db, set(args.ignore_table))
+    db.close()
+
+    flagged = [entry for entry in report if entry["full_scans"]]
+    print(json.dumps({
+        "dialect": engine.dialect.name,
+        "queries": len(report),
+        "flagged": len(flagged),
+        "results": report if args.verbose else flagged,
+    }, indent=2))
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Bulk-insert synthetic rows first")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--members-per-project", type=int, default=3)
+    parser.add_argument("--ignore-table", action="append", default=list(SMALL_TABLES),
+                        help="Small lookup tables where a full scan is fine (repeatable)")
+    parser.add_argument("--verbose", action="store_true", help="Include plans of unflagged queries")
+    sys.exit(main(parser.parse_args()))
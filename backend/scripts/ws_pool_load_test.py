@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+WebSocket connection-pool load test
+
+Measures REST latency with no sockets open, then opens many idle chat
+WebSockets and measures it again. Idle sockets must not hold database
+connections, so the two measurements should stay flat.
+
+Usage:
+    python scripts/ws_pool_load_test.py --base-url http://localhost:8000 \\
+        --email admin@example.com --password admin123 --sockets 500
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import urllib.request
+
+import websockets
+
+
+def login(base_url: str, email: str, password: str) -> str:
+    """Log in and return an access token"""
+    request = urllib.request.Request(
+        f"{base_url}/api/auth/login",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())["access_token"]
+
+
+def timed_get(url: str, token: str) -> float:
+    """Issue one authenticated GET and return its latency in milliseconds"""
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+async def measure_rest(url: str, token: str, requests: int, concurrency: int) -> dict:
+    """Measure REST latency percentiles with the given concurrency"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with semaphore:
+            return await asyncio.to_thread(timed_get, url, token)
+
+    latencies = sorted(await asyncio.gather(*(one() for _ in range(requests))))
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "max_ms": round(latencies[-1], 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+    }
+
+
+async def open_sockets(ws_url: str, count: int) -> list:
+    """Open idle chat WebSockets, a few at a time"""
+    sockets = []
+    semaphore = asyncio.Semaphore(50)
+
+    async def connect():
+        async with semaphore:
+            sockets.append(await websockets.connect(ws_url, open_timeout=30))
+
+    await asyncio.gather(*(connect() for _ in range(count)))
+    return sockets
+
+
+async def main(args):
+    token = await asyncio.to_thread(login, args.base_url, args.email, args.password)
+    rest_url = f"{args.base_url}{args.path}"
+    ws_url = args.base_url.replace("http", "ws", 1) + f"/api/chat/ws?token={token}"
+
+    baseline = await measure_rest(rest_url, token, args.requests, args.concurrency)
+    print(f"baseline (0 sockets):      {baseline}")
+
+    sockets = await open_sockets(ws_url, args.sockets)
+    try:
+        # Give the server time to settle after the connect burst
+        await asyncio.sleep(1)
+        loaded = await measure_rest(rest_url, token, args.requests, args.concurrency)
+        print(f"loaded ({len(sockets)} sockets):  {loaded}")
+    finally:
+        await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+
+    ratio = loaded["p95_ms"] / baseline["p95_ms"] if baseline["p95_ms"] else 0
+    print(f"p95 ratio loaded/baseline: {ratio:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--path", default="/api/projects", help="REST endpoint to time")
+    parser.add_argument("--sockets", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,93 @@
+import os
+import tempfile
+
+# Settings are read on first use; point them at a throwaway database and storage first
+_workdir = tempfile.mkdtemp(prefix="manuscript-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("STORAGE_PATH", f"{_workdir}/storage")
+os.environ.setdefault("PROFILE_DIR", f"{_workdir}/profiles")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "zero")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("STATS_RECONCILE_INTERVAL", "0")
+os.environ.setdefault("METRICS_LOOP_LAG_INTERVAL", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest_plugins = ["app.testing.query_budget"]
+
+WRITER_EMAIL = "writer@example.com"
+STATISTICIAN_EMAIL = "statistician@example.com"
+PASSWORD = "password123"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.database import Base, engine
+    from app.main import app
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def dataset(client) -> dict:
+    """A writer and a statistician sharing three projects of four files each, and an admin project"""
+    from app.core.security import get_password_hash
+    from app.database import SessionLocal
+    from app.models.enums import ProjectRole, RoleName
+    from app.schemas.project import ProjectCreate, ProjectMemberCreate
+    from app.schemas.user import UserCreate
+    from app.services.file_service import FileService
+    from app.services.project_service import ProjectService
+    from app.services.user_service import UserService
+
+    with SessionLocal() as db:
+        users = UserService(db)
+        writer = users.create(
+            UserCreate(email=WRITER_EMAIL, full_name="Writer", password=PASSWORD, role_name=RoleName.WRITER),
+            get_password_hash(PASSWORD),
+        )
+        statistician = users.create(
+            UserCreate(email=STATISTICIAN_EMAIL, full_name="Statistician", password=PASSWORD,
+                       role_name=RoleName.STATISTICIAN),
+            get_password_hash(PASSWORD),
+        )
+        projects = ProjectService(db)
+        project_ids = []
+        for i in range(3):
+            project = projects.create(ProjectCreate(name=f"Project {i}"), writer.id)
+            for j in range(4):
+                FileService(db).create_file(project.id, f"chapter-{j}.md", f"# Chapter {j}\n", writer.id)
+            project_ids.append(project.id)
+        projects.assign_members(project_ids, [
+            ProjectMemberCreate(user_id=writer.id, role=ProjectRole.WRITER),
+            ProjectMemberCreate(user_id=statistician.id, role=ProjectRole.STATISTICIAN),
+        ])
+        # Created by the admin; the writer is not a member
+        extra = projects.create(ProjectCreate(name="Admin project"), users.get_by_email("admin@example.com").id)
+        db.commit()
+        file_ids = [f.id for f in FileService(db).get_project_files(project_ids[0])]
+        return {"writer_id": writer.id, "project_ids": project_ids, "file_ids": file_ids,
+                "extra_project_id": extra.id}
+
+
+def _login(client, email: str, password: str) -> dict:
+    response = client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client) -> dict:
+    return _login(client, "admin@example.com", "admin123")
+
+
+@pytest.fixture(scope="session")
+def writer_headers(client, dataset) -> dict:
+    return _login(client, WRITER_EMAIL, PASSWORD)
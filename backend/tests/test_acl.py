@@ -0,0 +1,54 @@
+import time
+from sqlalchemy import delete
+from app.core.acl import ProjectACL
+from app.models import ProjectMember
+from app.models.enums import ProjectRole
+
+
+def test_memberships_reload_after_ttl(client, dataset):
+    """A change this worker never hears about is picked up once the entry expires"""
+    from app.database import SessionLocal
+
+    acl = ProjectACL(ttl=0.2, max_size=100)
+    user_id, project_id = dataset["writer_id"], dataset["extra_project_id"]
+    with SessionLocal() as db:
+        assert project_id not in acl.roles(user_id, db)
+
+        # Another worker adds the membership; its invalidation is lost
+        db.add(ProjectMember(project_id=project_id, user_id=user_id, role=ProjectRole.WRITER))
+        db.commit()
+        try:
+            assert project_id not in acl.roles(user_id, db)
+            time.sleep(0.25)
+            assert acl.roles(user_id, db)[project_id] == ProjectRole.WRITER
+        finally:
+            db.execute(delete(ProjectMember).where(
+                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
+            ))
+            db.commit()
+
+
+def test_zero_ttl_disables_caching(client, dataset):
+    from app.database import SessionLocal
+
+    acl = ProjectACL(ttl=0, max_size=100)
+    with SessionLocal() as db:
+        acl.roles(dataset["writer_id"], db)
+    assert not acl._by_user
+
+
+def test_size_cap_evicts_oldest_and_bounds_versions(client, dataset):
+    from app.database import SessionLocal
+
+    acl = ProjectACL(ttl=60, max_size=3)
+    with SessionLocal() as db:
+        for user_id in (1, 2, 3):
+            acl.roles(user_id, db)
+        acl.roles(1, db)
+        acl.roles(4, db)
+    assert list(acl._by_user) == [2, 3, 4]
+
+    # Changes to users never loaded here still leave at most max_size versions
+    for user_id in range(100, 110):
+        acl.invalidate(str(user_id))
+    assert len(acl._versions) <= 3
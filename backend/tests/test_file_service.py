@@ -0,0 +1,28 @@
+from sqlalchemy import update
+from app.models import File, ProjectStats
+from app.services.file_service import FileService
+
+
+def _storage_bytes(db, project_id: int) -> int:
+    return db.get(ProjectStats, project_id, populate_existing=True).storage_bytes
+
+
+def test_files_without_a_recorded_size_can_be_updated_and_deleted(client, dataset):
+    """Files stored before sizes were recorded count as empty"""
+    from app.database import SessionLocal
+
+    project_id = dataset["extra_project_id"]
+    with SessionLocal() as db:
+        files = FileService(db)
+        file_id = files.create_file(project_id, "legacy.md", "# Legacy\n", 1).id
+        db.execute(update(File).where(File.id == file_id).values(size=None))
+        db.commit()
+        before = _storage_bytes(db, project_id)
+
+        assert files.update_file_content(file_id, b"# Legacy, edited\n").size == 17
+        assert _storage_bytes(db, project_id) == before + 17
+
+        db.execute(update(File).where(File.id == file_id).values(size=None))
+        db.commit()
+        assert files.delete_file(file_id)
+        assert _storage_bytes(db, project_id) == before + 17
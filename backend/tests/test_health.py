@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from app.core import health
+
+
+def test_database_probe_does_not_wait_for_writers(client):
+    """In embedded mode the probe reads beside a write transaction instead of queueing behind it"""
+    from app.database import engine, writer_lock
+
+    assert writer_lock is not None
+    with ThreadPoolExecutor(1) as pool, engine.connect() as conn:
+        conn.execute(text("UPDATE stat_counters SET value = value"))
+        assert writer_lock.stats()["held"]
+        acquisitions = writer_lock.stats()["acquisitions"]
+
+        pool.submit(health._database).result(timeout=1)
+        assert writer_lock.stats()["acquisitions"] == acquisitions
+        conn.rollback()
+
+
+def test_readiness_reports_ok(client):
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["database"]["status"] == "ok"
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from app.config import get_settings
+from app.core import profiling
+
+
+def _profile_token(client, admin_headers) -> str:
+    response = client.post("/api/diagnostics/profiles/token", headers=admin_headers)
+    assert response.status_code == 200
+    return response.json()["token"]
+
+
+def _stored(client, admin_headers) -> set[str]:
+    return {profile["id"] for profile in client.get("/api/diagnostics/profiles", headers=admin_headers).json()}
+
+
+def test_stop_keeps_the_event_loop_running(client):
+    """The sampler thread is joined off the loop, so other tasks keep running meanwhile"""
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        session = profiling.ProfileSession("test", requested_by=1, interval=0.001)
+        session.start()
+        await asyncio.sleep(0.01)
+        background = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        before = ticks
+        await session.stop()
+        background.cancel()
+        return session, ticks - before
+
+    session, ticks_during_stop = asyncio.run(scenario())
+    assert not session._sampler.is_alive()
+    assert session.duration > 0
+    assert ticks_during_stop > 0
+
+
+def test_profiled_request_is_stored(client, admin_headers):
+    token = _profile_token(client, admin_headers)
+    response = client.get("/api/projects", headers={**admin_headers, "X-Profile-Token": token})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert profile_id in _stored(client, admin_headers)
+
+
+def test_websocket_profiling_respects_setting(client, admin_headers, monkeypatch):
+    """A profiling token on the chat socket is ignored while profiling is disabled"""
+    profile_token = _profile_token(client, admin_headers)
+    access_token = admin_headers["Authorization"].split()[1]
+    url = f"/api/chat/ws?token={access_token}&{profiling.PROFILE_QUERY}={profile_token}"
+
+    def chat_once():
+        with client.websocket_connect(url) as websocket:
+            websocket.send_json({"message": "hello"})
+            while websocket.receive_json()["type"] not in ("end", "error"):
+                pass
+        # The profile is stored after the reply went out
+        time.sleep(0.2)
+
+    monkeypatch.setattr(get_settings(), "profiling_enabled", False)
+    before = _stored(client, admin_headers)
+    chat_once()
+    assert _stored(client, admin_headers) == before
+
+    monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+    chat_once()
+    assert len(_stored(client, admin_headers) - before) == 1
+
+
+def test_tokens_stop_working_when_the_admin_loses_access(client, admin_headers):
+    """A token is honoured only while its user is an active admin"""
+    from app.core.security import get_password_hash
+    from app.database import SessionLocal
+    from app.models.enums import RoleName
+    from app.schemas.user import UserCreate, UserUpdate
+    from app.services.user_service import UserService
+
+    with SessionLocal() as db:
+        admin_id = UserService(db).create(
+            UserCreate(email="second-admin@example.com", full_name="Second admin", password="password123",
+                       role_name=RoleName.ADMIN),
+            get_password_hash("password123"),
+        ).id
+    token, _ = profiling.issue_token(admin_id, 900)
+
+    def profiled() -> bool:
+        response = client.get("/api/projects", headers={**admin_headers, "X-Profile-Token": token})
+        assert response.status_code == 200
+        return "X-Profile-Id" in response.headers
+
+    assert profiled()
+    for change in (UserUpdate(role_name=RoleName.WRITER), UserUpdate(role_name=RoleName.ADMIN, is_active=False)):
+        with SessionLocal() as db:
+            UserService(db).update(admin_id, change)
+        assert not profiled()
@@ -0,0 +1,46 @@
+"""
+SQL query budgets of the hot endpoints. Each request is made once to warm
+the per-worker caches, then measured; a budget failure lists the
+statements, so an N+1 shows up as one statement repeated per row.
+"""
+import pytest
+
+
+def measure(client, query_budget, budget: int, url: str, headers: dict):
+    assert client.get(url, headers=headers).status_code == 200
+    with query_budget(budget):
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize("budget, path", [
+    (2, "/api/projects"),
+    (4, "/api/projects/{project}"),
+    (3, "/api/projects/{project}/files"),
+    (3, "/api/projects/{project}/members"),
+])
+def test_writer_endpoints(client, dataset, writer_headers, query_budget, budget, path):
+    url = path.format(project=dataset["project_ids"][0])
+    measure(client, query_budget, budget, url, writer_headers)
+
+
+@pytest.mark.parametrize("budget, path", [
+    (2, "/api/projects"),
+    (4, "/api/projects/{project}"),
+    (2, "/api/projects/statistics"),
+    (2, "/api/projects/statistics/storage"),
+    (2, "/api/projects/statistics/members"),
+])
+def test_admin_endpoints(client, dataset, admin_headers, query_budget, budget, path):
+    url = path.format(project=dataset["project_ids"][0])
+    measure(client, query_budget, budget, url, admin_headers)
+
+
+def test_budget_failure_lists_statements(client, dataset, writer_headers, query_budget):
+    from app.testing.query_budget import QueryBudgetExceeded
+
+    url = f"/api/projects/{dataset['project_ids'][0]}/files"
+    with pytest.raises(QueryBudgetExceeded, match="queries"):
+        with query_budget(0):
+            client.get(url, headers=writer_headers)
@@ -0,0 +1,30 @@
+"""
+No listing or lookup query of the service layer scans a whole table.
+Plans depend on table sizes, so the audit runs on a seeded dataset large
+enough for the planner to prefer indexes where they exist.
+"""
+from app.testing.query_plans import SMALL_TABLES, audit, seed
+
+# Scans that are the right plan: listing the users of a role reads a large
+# share of the table, where an index on the three-valued role_id would not help
+EXPECTED_SCANS = {("users", "WHERE roles.name = ")}
+
+
+def _expected(statement: str, scan: str) -> bool:
+    return any(scan.split()[-1] == table and fragment in statement for table, fragment in EXPECTED_SCANS)
+
+
+def test_read_paths_use_indexes(client):
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        seed(db, users=300, projects=1500, files=6000, members_per_project=3)
+        report = audit(db, ignored=set(SMALL_TABLES))
+
+    assert report
+    flagged = [
+        (entry["statement"], scan)
+        for entry in report for scan in entry["full_scans"]
+        if not _expected(entry["statement"], scan)
+    ]
+    assert not flagged, flagged
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+import pytest
+from app.core import rate_limit
+from app.core.rate_limit import BucketRule, MemoryBucketStore, RateLimiter, RateLimitExceeded, client_ip
+
+
+def auth_limiter() -> RateLimiter:
+    """The default auth rules: 20 per minute per IP, 50 per second overall"""
+    return RateLimiter(MemoryBucketStore(), {
+        "auth": {"ip": BucketRule.parse("20/60"), "global": BucketRule.parse("50/1")},
+    })
+
+
+def test_refused_requests_do_not_drain_the_global_bucket():
+    limiter = auth_limiter()
+    refused = 0
+    for _ in range(60):
+        try:
+            limiter.check("auth", "203.0.113.1")
+        except RateLimitExceeded:
+            refused += 1
+    assert refused == 40
+
+    # 20 of 50 global tokens were taken; an innocent IP still gets in
+    for _ in range(20):
+        limiter.check("auth", "198.51.100.7")
+
+
+def test_global_bucket_still_limits_many_ips():
+    limiter = auth_limiter()
+    for i in range(50):
+        limiter.check("auth", f"198.51.100.{i}")
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("auth", "198.51.100.200")
+
+
+def test_user_bucket_refusal_keeps_ip_tokens():
+    limiter = RateLimiter(MemoryBucketStore(), {
+        "chat": {"ip": BucketRule.parse("3/60"), "user": BucketRule.parse("1/60")},
+    })
+    limiter.check("chat", "203.0.113.1", user_id=1)
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("chat", "203.0.113.1", user_id=1)
+    limiter.check("chat", "203.0.113.1", user_id=2)
+    limiter.check("chat", "203.0.113.1", user_id=3)
+
+
+@pytest.fixture
+def trusted_proxies(monkeypatch):
+    def configure(spec: str):
+        monkeypatch.setattr(rate_limit, "get_settings", lambda: SimpleNamespace(rate_limit_trusted_proxies=spec))
+    return configure
+
+
+def peer(host: str):
+    return SimpleNamespace(host=host)
+
+
+def test_forwarded_headers_ignored_without_trusted_proxies(trusted_proxies):
+    trusted_proxies("")
+    assert client_ip(peer("172.18.0.1"), {"x-forwarded-for": "1.2.3.4"}) == "172.18.0.1"
+
+
+def test_forwarded_headers_ignored_from_untrusted_peer(trusted_proxies):
+    trusted_proxies("172.16.0.0/12")
+    assert client_ip(peer("203.0.113.9"), {"x-forwarded-for": "1.2.3.4"}) == "203.0.113.9"
+
+
+def test_rightmost_untrusted_forwarded_address_is_the_client(trusted_proxies):
+    trusted_proxies("127.0.0.1, 172.16.0.0/12")
+    # The client sent "1.2.3.4" itself; nginx appended the address it saw
+    headers = {"x-forwarded-for": "1.2.3.4, 203.0.113.5"}
+    assert client_ip(peer("172.18.0.1"), headers) == "203.0.113.5"
+    headers = {"x-forwarded-for": "1.2.3.4, 203.0.113.5, 172.18.0.1"}
+    assert client_ip(peer("172.18.0.1"), headers) == "203.0.113.5"
+
+
+def test_real_ip_used_without_forwarded_for(trusted_proxies):
+    trusted_proxies("172.16.0.0/12")
+    assert client_ip(peer("172.18.0.1"), {"x-real-ip": "203.0.113.5"}) == "203.0.113.5"
@@ -1,5 +1,5 @@
 import { useState, useRef, useEffect } from 'react';
-import { Send, Bot } from 'lucide-react';
+import { Send, Bot, Square } from 'lucide-react';
 import { Button } from '@/components/ui';
 import { ChatMessage } from './ChatMessage';
 import { api } from '@/services/api';
@@ -29,6 +29,7 @@ What would you like help with?`,
   const [streamingContent, setStreamingContent] = useState('');
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const wsRef = useRef<WebSocket | null>(null);
+  const streamingContentRef = useRef('');
 
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -59,10 +60,21 @@ What would you like help with?`,
       const data = JSON.parse(event.data);
 
       if (data.type === 'start') {
+        streamingContentRef.current = '';
         setStreamingContent('');
         setIsStreaming(true);
       } else if (data.type === 'token') {
+        streamingContentRef.current += data.content;
         setStreamingContent((prev) => prev + data.content);
+      } else if (data.type === 'cancelled') {
+        // Keep whatever was generated before the user stopped the response
+        const partial = streamingContentRef.current;
+        if (partial) {
+          setMessages((prev) => [...prev, { role: 'assistant', content: partial }]);
+        }
+        streamingContentRef.current = '';
+        setStreamingContent('');
+        setIsStreaming(false);
       } else if (data.type === 'end') {
         setMessages((prev) => [
           ...prev,
@@ -151,6 +163,12 @@ What would you like help with?`,
     }));
   };
 
+  const handleStop = () => {
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      wsRef.current.send(JSON.stringify({ type: 'cancel' }));
+    }
+  };
+
   return (
     <div className="flex flex-col h-full bg-dark-900">
       {/* Header */}
@@ -181,9 +199,15 @@ What would you like help with?`,
             disabled={isStreaming}
             className="flex-1 px-4 py-3 bg-dark-700 border border-dark-600 rounded-lg text-gray-100 placeholder-gray-500 focus:outline-none focus:ring-2 focus:ring-accent-purple focus:border-transparent disabled:opacity-50"
           />
-          <Button type="submit" disabled={!input.trim() || isStreaming}>
-            <Send className="w-4 h-4" />
-          </Button>
+          {isStreaming ? (
+            <Button type="button" variant="secondary" onClick={handleStop}>
+              <Square className="w-4 h-4" />
+            </Button>
+          ) : (
+            <Button type="submit" disabled={!input.trim()}>
+              <Send className="w-4 h-4" />
+            </Button>
+          )}
         </div>
       </form>
     </div>
@@ -35,12 +35,20 @@ check_http() {
 
 log "Starting health check..."
 
-# Check 1: Backend health endpoint
-log "Checking backend health endpoint..."
-if check_http "https://$DOMAIN/health" "200"; then
-    log "✓ Backend health check passed"
+# Check 1: Backend readiness (database, storage and LLM probes)
+log "Checking backend readiness endpoint..."
+READY_RESPONSE=$(curl -s -w "\n%{http_code}" "https://$DOMAIN/health/ready" 2>&1)
+READY_STATUS=$(echo "$READY_RESPONSE" | tail -1)
+READY_BODY=$(echo "$READY_RESPONSE" | sed '$d')
+
+if [ "$READY_STATUS" = "200" ]; then
+    if echo "$READY_BODY" | grep -q '"status":"degraded"'; then
+        log "WARNING: Backend ready but degraded: $READY_BODY"
+    else
+        log "✓ Backend readiness check passed"
+    fi
 else
-    log "✗ Backend health check failed"
+    log "✗ Backend readiness check failed ($READY_STATUS): $READY_BODY"
     exit $EXIT_ERROR
 fi
 